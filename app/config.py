@@ -0,0 +1,71 @@
+"""Configuration of the debugging hints service, read from environment variables."""
+import os
+
+# Maximum number of hint results kept in the in-process cache, 0 disables the cache
+HINT_CACHE_MAX_SIZE = int(os.environ.get("HINT_CACHE_MAX_SIZE", "1024"))
+# Seconds a cached hint result stays valid
+HINT_CACHE_TTL = float(os.environ.get("HINT_CACHE_TTL", "3600"))
+# Path of the SQLite database that persists the hint cache across restarts and shares it between the server processes,
+# empty keeps the cache in memory only
+HINT_CACHE_PATH = os.environ.get("HINT_CACHE_PATH", "")
+# Maximum number of hint results kept in the persistent cache
+HINT_CACHE_PERSISTENT_MAX_SIZE = int(os.environ.get("HINT_CACHE_PERSISTENT_MAX_SIZE", "100000"))
+# JSONL file or directory of hint requests whose hints are cached at startup, empty disables warming the cache
+HINT_CACHE_WARMUP_PATH = os.environ.get("HINT_CACHE_WARMUP_PATH", "")
+# Token the admin endpoints expect in the X-Admin-Token header, empty disables the admin endpoints
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+# Maximum number of hint requests in a single batch request
+HINT_BATCH_MAX_SIZE = int(os.environ.get("HINT_BATCH_MAX_SIZE", "500"))
+# Number of worker processes used for CPU heavy analysis, 0 runs the analysis in the request thread
+HINT_WORKER_PROCESSES = int(os.environ.get("HINT_WORKER_PROCESSES", str(os.cpu_count() or 1)))
+# Number of async hint requests that may wait for a worker process on top of the ones being analysed
+HINT_WORKER_QUEUE_SIZE = int(os.environ.get("HINT_WORKER_QUEUE_SIZE", "64"))
+# Number of characters at the end of an error message that are parsed, longer (runaway) output is truncated
+ERROR_TAIL_MAX_LENGTH = int(os.environ.get("ERROR_TAIL_MAX_LENGTH", "65536"))
+# Workspaces with at least this many characters are checked for silent errors while streaming, 0 disables streaming
+STREAMING_DETECTION_MIN_LENGTH = int(os.environ.get("STREAMING_DETECTION_MIN_LENGTH", "0"))
+# Maximum number of analysis sessions of editors that resubmit their workspace after every edit, 0 disables sessions
+HINT_SESSION_MAX_COUNT = int(os.environ.get("HINT_SESSION_MAX_COUNT", "256"))
+# Maximum total number of characters of the workspaces kept by analysis sessions, beyond it the least recently used
+# sessions are dropped, 0 disables the limit
+HINT_SESSION_MAX_LENGTH = int(os.environ.get("HINT_SESSION_MAX_LENGTH", "50000000"))
+# Seconds after which an idle analysis session is dropped
+HINT_SESSION_IDLE_TTL = float(os.environ.get("HINT_SESSION_IDLE_TTL", "1800"))
+# Seconds the live analysis channel waits for a newer workspace snapshot before it analyses the latest one
+LIVE_ANALYSIS_DEBOUNCE = float(os.environ.get("LIVE_ANALYSIS_DEBOUNCE", "0.3"))
+# Time the stages of hint requests and expose them on /metrics, 0 disables the timings
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+# Add the stage timings of hint requests to their responses as a Server-Timing header
+METRICS_SERVER_TIMING = os.environ.get("METRICS_SERVER_TIMING", "0") == "1"
+# Allow the analysis of hint requests to be profiled, on request with a header or by sampling
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+# Profile the analysis of 1 in this many hint requests that miss the cache, 0 only profiles on request
+PROFILING_SAMPLE_RATE = int(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+# Sampled analyses are only written when they took at least this many seconds, requested profiles are always written
+PROFILING_MIN_DURATION = float(os.environ.get("PROFILING_MIN_DURATION", "0.1"))
+# Directory the profiles are written to, together with the hint requests they belong to
+PROFILING_DIRECTORY = os.environ.get("PROFILING_DIRECTORY", "profiles")
+# Maximum number of profiles kept in the directory, the oldest ones are removed first
+PROFILING_MAX_PROFILES = int(os.environ.get("PROFILING_MAX_PROFILES", "100"))
+# Hint requests with a real error that may be analysed at once, 0 disables the limit
+ADMISSION_CHEAP_MAX_CONCURRENCY = int(os.environ.get("ADMISSION_CHEAP_MAX_CONCURRENCY", "32"))
+# Hint requests with a real error that may wait to be analysed, the ones above it are rejected right away
+ADMISSION_CHEAP_MAX_QUEUE = int(os.environ.get("ADMISSION_CHEAP_MAX_QUEUE", "64"))
+# Hint requests that need the silent error analysis of their workspace that may be analysed at once, 0 disables the limit
+ADMISSION_EXPENSIVE_MAX_CONCURRENCY = int(os.environ.get("ADMISSION_EXPENSIVE_MAX_CONCURRENCY", "8"))
+# Hint requests that need the silent error analysis of their workspace that may wait to be analysed
+ADMISSION_EXPENSIVE_MAX_QUEUE = int(os.environ.get("ADMISSION_EXPENSIVE_MAX_QUEUE", "16"))
+# Seconds a hint request may wait to be analysed before it is rejected
+ADMISSION_MAX_QUEUE_WAIT = float(os.environ.get("ADMISSION_MAX_QUEUE_WAIT", "0.5"))
+# Seconds a rejected client is asked to wait before it retries, sent as the Retry-After header
+ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", "1"))
+# The limits on workspaces only apply when a request needs the workspace, e.g. not for most real errors.
+# Workspaces with more characters are rejected as too complex before they are parsed, 0 disables the limit
+WORKSPACE_MAX_LENGTH = int(os.environ.get("WORKSPACE_MAX_LENGTH", "5000000"))
+# Workspaces with more blocks are rejected as too complex before they are parsed, 0 disables the limit
+WORKSPACE_MAX_BLOCKS = int(os.environ.get("WORKSPACE_MAX_BLOCKS", "50000"))
+# Workspaces whose XML elements are nested deeper are rejected as too complex while they are parsed, 0 disables the
+# limit. Every statement in a stack nests the next one, so a stack of n statements is about 2n elements deep.
+WORKSPACE_MAX_DEPTH = int(os.environ.get("WORKSPACE_MAX_DEPTH", "10000"))
+# Seconds the analysis of a single hint request may take before it is stopped as too complex, 0 disables the limit
+ANALYSIS_TIME_BUDGET = float(os.environ.get("ANALYSIS_TIME_BUDGET", "5"))
@@ -0,0 +1,63 @@
+"""Warms the hint cache with the hints of common submissions, e.g. the starter workspace of an exercise."""
+import json
+import logging
+import time
+from pathlib import Path
+
+from app.handlers.hint_batch import generate_hints_batch
+from app.handlers.utils.hint_cache import hint_cache, raw_request_cache_key
+from app.schemas.hint_request import HintRequest
+
+logger = logging.getLogger(__name__)
+
+
+def warm_hint_cache(path: str) -> dict:
+    """Generate the hints of the hint requests in a JSONL file or a directory, so later requests hit the cache.
+
+    The requests are analysed in parallel on the worker processes. Returns a report of the number of requests, the
+    number of warmed requests whose hint is now served from the cache, the failures and the duration. Raises OSError
+    or UnicodeDecodeError if the samples cannot be read.
+    """
+    started_at = time.perf_counter()
+    hint_requests, invalid = load_hint_requests(path)
+    generate_hints_batch(hint_requests)
+    # Counted per request instead of from the size of the cache, which also changes through evictions and other
+    # requests, and does not grow for samples that share a cache entry
+    warmed = sum(1 for hint_request in hint_requests if hint_cache.contains(
+        raw_request_cache_key(code=hint_request.code, error=hint_request.error, status=hint_request.status,
+                              code_language=hint_request.code_language)))
+    report = {
+        "requests": len(hint_requests),
+        "invalid": invalid,
+        "warmed": warmed,
+        "failed": len(hint_requests) - warmed,
+        "duration_seconds": round(time.perf_counter() - started_at, 3),
+    }
+    logger.info("Warmed the hint cache from %s: %s", path, report)
+    return report
+
+
+def load_hint_requests(path: str) -> tuple[list[HintRequest], int]:
+    """Returns the hint requests in a JSONL file or a directory, and the number of invalid ones that were skipped.
+
+    A directory can hold JSONL files with a hint request per line and JSON files with a single hint request.
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(file for file in path.iterdir() if file.suffix in (".jsonl", ".json"))
+    else:
+        files = [path]
+    hint_requests = []
+    invalid = 0
+    for file in files:
+        with file.open(encoding="utf-8") as samples:
+            lines = samples if file.suffix == ".jsonl" else [samples.read()]
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    hint_requests.append(HintRequest(**json.loads(line)))
+                except (TypeError, ValueError):
+                    logger.warning("Skipping an invalid hint request in %s.", file)
+                    invalid += 1
+    return hint_requests, invalid
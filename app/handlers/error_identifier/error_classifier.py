@@ -0,0 +1,72 @@
+"""Classifies error messages by matching them against a registry of known error patterns."""
+import re
+import threading
+from typing import Union
+
+
+class ErrorPatternRegistry:
+    """Registry of error message patterns, compiled into a matcher that classifies a message.
+
+    Patterns are plain substrings unless registered as regular expressions. Patterns registered first have the
+    highest priority. Substrings are matched with the built-in substring search, which scans compiler output of many
+    kilobytes far faster than a combined regular expression can (see benchmarks/bench_error_classifier.py).
+    """
+
+    def __init__(self):
+        """Initialize the registry."""
+        self._patterns = []
+        self._matcher = None
+        self._lock = threading.Lock()
+
+    def register(self, pattern: str, error_name: str, is_regex: bool = False) -> None:
+        """Register a pattern that identifies an error, with a lower priority than the patterns registered before."""
+        with self._lock:
+            self._patterns.append((pattern, error_name, is_regex))
+            self._matcher = None
+
+    def classify(self, error_message: str) -> Union[str, None]:
+        """Returns the name of the highest priority error found in the message, or None if nothing matches."""
+        for error_name, matches in self._get_matcher():
+            if matches(error_message):
+                return error_name
+        return None
+
+    def classify_all(self, error_message: str) -> list:
+        """Returns the names of all errors found in the message, in priority order and without duplicates."""
+        error_names = []
+        for error_name, matches in self._get_matcher():
+            if error_name not in error_names and matches(error_message):
+                error_names.append(error_name)
+        return error_names
+
+    def _get_matcher(self) -> tuple:
+        """Returns the compiled (error_name, match function) pairs in priority order."""
+        matcher = self._matcher
+        if matcher is None:
+            with self._lock:
+                matcher = self._matcher = tuple((error_name, self._compile(pattern, is_regex))
+                                                for pattern, error_name, is_regex in self._patterns)
+        return matcher
+
+    @staticmethod
+    def _compile(pattern: str, is_regex: bool):
+        """Returns a function that tells whether a message contains the pattern."""
+        if is_regex:
+            search = re.compile(pattern).search
+            return lambda error_message: search(error_message) is not None
+        return lambda error_message: pattern in error_message
+
+
+PYTHON_ERROR_PATTERNS = ErrorPatternRegistry()
+PYTHON_ERROR_PATTERNS.register("ZeroDivisionError", "zero_division_error")
+PYTHON_ERROR_PATTERNS.register("IndexError", "out_of_bounds_error")
+PYTHON_ERROR_PATTERNS.register("TypeError", "type_error")
+PYTHON_ERROR_PATTERNS.register("SyntaxError: duplicate argument 'x' in function definition", "ambiguous_parameter_name")
+PYTHON_ERROR_PATTERNS.register("AttributeError: 'NoneType' object has no attribute", "none_type_error")
+
+ARDUINO_ERROR_PATTERNS = ErrorPatternRegistry()
+ARDUINO_ERROR_PATTERNS.register("warning: division by zero", "zero_division_error")
+ARDUINO_ERROR_PATTERNS.register("error: index out of bounds for", "out_of_bounds_error")
+ARDUINO_ERROR_PATTERNS.register("error: no match for", "type_error")
+ARDUINO_ERROR_PATTERNS.register("error: redefinition of", "ambiguous_parameter_name")
+ARDUINO_ERROR_PATTERNS.register("was not declared in this scope", "none_type_error")
@@ -0,0 +1,18 @@
+"""Structured result of the error identification."""
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Union
+
+
+@dataclass
+class Finding:
+    """An identified error together with the evidence the identifier found for it.
+
+    `block` is the offending block and `details` holds rule specific evidence, such as the operands of a comparison.
+    Both are empty when the error was identified from the error message. The block of a finding of the streaming
+    detector is detached from the workspace, so its details also hold what the generator would look up around it.
+    """
+
+    error_name: str
+    block: Union[ET.Element, None] = None
+    details: dict = field(default_factory=dict)
@@ -1,26 +1,37 @@
 """This module contains functions to identify comparing literals."""
 import xml.etree.ElementTree as ET
 
+from app.handlers.error_identifier.silent_error_engine import detect_silent_error
+from app.handlers.error_identifier.silent_error_rule import SilentErrorRule
+from app.handlers.utils.workspace import Workspace
 
-def check_comparing_literals_error(code: str) -> bool:
-    """Returns True if there is a possible error related to comparing literals."""
-    root = ET.fromstring(code)
-    ns = {'ns': 'http://www.w3.org/1999/xhtml'}
-    # Find all the blocks that compare 2 objects
-    logic_compare_blocks = root.findall('.//ns:block[@type="logic_compare"]', ns)
-    for block in logic_compare_blocks:
+# Block types of literal values that are comparable with each other
+LITERAL_BLOCK_TYPES = ("text", "math_number", "logic_boolean")
+
+
+class ComparingLiteralsRule(SilentErrorRule):
+    """Rule that confirms a comparison between two literals of the same type."""
+
+    error_name = "comparing_literals_error"
+    block_types = ("logic_compare",)
+    is_local = True
+
+    def visit(self, block: ET.Element) -> bool:
+        """Returns True if the block compares 2 literal values."""
         # Comparison values
-        value_a_block = block.find('.//ns:value[@name="A"]/ns:block', ns)
-        value_b_block = block.find('.//ns:value[@name="B"]/ns:block', ns)
-
-        # Comparing 2 string values
-        if value_a_block.get("type") == "text" and value_b_block.get("type") == "text":
-            return True
-        # Comparing 2 number values
-        elif value_a_block.get("type") == "math_number" and value_b_block.get("type") == "math_number":
-            return True
-        # Comparing 2 boolean values
-        elif value_a_block.get("type") == "logic_boolean" and value_b_block.get("type") == "logic_boolean":
-            return True
-
-    return False
+        value_a_block = block.find('.//ns:value[@name="A"]/ns:block', self.ns)
+        value_b_block = block.find('.//ns:value[@name="B"]/ns:block', self.ns)
+        # A comparison with an empty side does not compare literals
+        if value_a_block is None or value_b_block is None:
+            return False
+
+        # Comparing 2 string, number or boolean values
+        value_a_type = value_a_block.get("type")
+        if value_a_type in LITERAL_BLOCK_TYPES and value_a_type == value_b_block.get("type"):
+            return self.confirm(block, operand_a=value_a_block, operand_b=value_b_block)
+        return False
+
+
+def check_comparing_literals_error(workspace: Workspace) -> bool:
+    """Returns True if there is a possible error related to comparing literals."""
+    return detect_silent_error(workspace, [ComparingLiteralsRule]) is not None
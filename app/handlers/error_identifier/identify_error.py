@@ -1,19 +1,35 @@
 """Identifies an error based on either the error message or the code."""
-from app.handlers.error_identifier.identify_comparing_literals import check_comparing_literals_error
-from app.handlers.error_identifier.identify_incomplete_block_sequences import check_incomplete_block_sequences_error
-from app.handlers.error_identifier.identify_parameter_out_of_scope import check_parameter_out_of_scope_error
+import xml.etree.ElementTree as ET
+
+from app.handlers.error_identifier.error_classifier import ARDUINO_ERROR_PATTERNS, PYTHON_ERROR_PATTERNS
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.error_identifier.identify_comparing_literals import ComparingLiteralsRule
+from app.handlers.error_identifier.identify_incomplete_block_sequences import IncompleteBlockSequencesRule
+from app.handlers.error_identifier.identify_parameter_out_of_scope import ParameterOutOfScopeRule
+from app.handlers.error_identifier.silent_error_engine import detect_all_silent_errors, detect_silent_error
+from app.handlers.error_identifier.streaming_detector import detect_silent_error_streaming
+from app.handlers.utils.analysis_session import AnalysisSession
+from app.handlers.utils.workspace import Workspace
 from typing import Union
 
+# Silent error rules in priority order, the first confirmed rule determines the error
+SILENT_ERROR_RULES = [
+    ComparingLiteralsRule,
+    IncompleteBlockSequencesRule,
+    ParameterOutOfScopeRule,
+]
 
-def identify_error_handler(error_message: str, code: str, output: str, status: str, code_language: str) -> str:
-    """Function to identify which error and return a unique error name."""
+
+def identify_error_handler(error_message: str, workspace: Workspace, output: str, status: str, code_language: str,
+                           session: Union[AnalysisSession, None] = None) -> Finding:
+    """Function to identify which error and return a finding with its unique error name."""
     if code_language == "Python":
         # If the status is 1, it means the program run unsuccessfully, and we have a real error.
         if status == "1":
-            return identify_real_python_error_handler(error_message=error_message)
+            return Finding(error_name=identify_real_python_error_handler(error_message=error_message))
         # If the status is 0, it means the program run successfully, there might be an error that is silently skipped.
         elif status == "0":
-            return identify_silent_error_handler(code=code)
+            return identify_silent_error_handler(workspace=workspace, session=session)
         # Other status codes should not appear and are not supported.
         else:
             raise NotImplementedError(f"This error status is not supported: {status}")
@@ -22,53 +38,81 @@ def identify_error_handler(error_message: str, code: str, output: str, status: s
         if status == "0":
             real_error = identify_real_arduino_error_handler(error_message=error_message)
             if real_error:
-                return real_error
+                return Finding(error_name=real_error)
             else:
-                return identify_silent_error_handler(code=code)
+                return identify_silent_error_handler(workspace=workspace, session=session)
         # Other status codes should not appear and are not supported.
         else:
             raise NotImplementedError(f"This error status is not supported: {status}")
 
 
+def identify_all_errors_handler(error_message: str, workspace: Workspace, output: str, status: str,
+                                code_language: str, session: Union[AnalysisSession, None] = None) -> list:
+    """Function to identify every error in a single pass and return their findings in priority order.
+
+    Real errors come first, followed by every offending block of the silent errors.
+    """
+    if code_language == "Python":
+        if status == "1":
+            real_errors = PYTHON_ERROR_PATTERNS.classify_all(error_message)
+        elif status == "0":
+            real_errors = []
+        else:
+            raise NotImplementedError(f"This error status is not supported: {status}")
+    elif code_language == "Arduino":
+        if status == "0":
+            real_errors = ARDUINO_ERROR_PATTERNS.classify_all(error_message)
+        else:
+            raise NotImplementedError(f"This error status is not supported: {status}")
+    else:
+        return []
+    findings = [Finding(error_name=error_name) for error_name in real_errors]
+    try:
+        findings.extend(detect_all_silent_errors(workspace, SILENT_ERROR_RULES, session))
+    except ET.ParseError:
+        # The real errors can still be reported when the code is not a valid workspace
+        if not findings:
+            raise
+    return findings
+
+
+def needs_silent_error_analysis(error_message: str, status: str, code_language: str,
+                                all_findings: bool = False) -> bool:
+    """Returns True if identifying the errors of a request may need the silent error analysis of its workspace.
+
+    Only looks at the error message, so it is cheap enough to decide how to admit a request.
+    """
+    if all_findings:
+        # Every silent error is looked for, next to the real errors
+        return True
+    if code_language == "Python":
+        return status == "0"
+    if code_language == "Arduino":
+        return status == "0" and identify_real_arduino_error_handler(error_message=error_message) is None
+    return False
+
+
 def identify_real_python_error_handler(error_message: str) -> str:
     """Function to identify which error and return a unique error name."""
-    if "ZeroDivisionError" in error_message:
-        return "zero_division_error"
-    elif "IndexError" in error_message:
-        return "out_of_bounds_error"
-    elif "TypeError" in error_message:
-        return "type_error"
-    elif "SyntaxError: duplicate argument 'x' in function definition" in error_message:
-        return "ambiguous_parameter_name"
-    elif "AttributeError: 'NoneType' object has no attribute" in error_message:
-        return "none_type_error"
-    else:
+    error_name = PYTHON_ERROR_PATTERNS.classify(error_message)
+    if error_name is None:
         raise NotImplementedError(f"An unhandled error found! Error message: {error_message}")
+    return error_name
 
 
 def identify_real_arduino_error_handler(error_message: str) -> Union[str, None]:
     """Function to identify which error and return a unique error name."""
-    if "warning: division by zero" in error_message:
-        return "zero_division_error"
-    elif "error: index out of bounds for" in error_message:
-        return "out_of_bounds_error"
-    elif "error: no match for" in error_message:
-        return "type_error"
-    elif "error: redefinition of" in error_message:
-        return "ambiguous_parameter_name"
-    elif "was not declared in this scope" in error_message:
-        return "none_type_error"
-    else:
-        return None
+    return ARDUINO_ERROR_PATTERNS.classify(error_message)
 
 
-def identify_silent_error_handler(code: str) -> str:
-    """Function to identify which error and return a unique error name."""
-    if check_comparing_literals_error(code):
-        return "comparing_literals_error"
-    elif check_incomplete_block_sequences_error(code):
-        return "incomplete_block_sequences_error"
-    elif check_parameter_out_of_scope_error(code):
-        return "parameter_out_of_scope_error"
+def identify_silent_error_handler(workspace: Workspace, session: Union[AnalysisSession, None] = None) -> Finding:
+    """Function to identify which error and return a finding with the offending block."""
+    if workspace.is_huge and not workspace.is_parsed:
+        # Huge workspaces are checked while parsing, so they can stop early and are never kept in memory as a whole.
+        # The finding carries the evidence of the hint, so the hint generator does not parse the workspace either.
+        finding = detect_silent_error_streaming(workspace.code, workspace.cancellation)
     else:
+        finding = detect_silent_error(workspace, SILENT_ERROR_RULES, session)
+    if finding is None:
         raise NotImplementedError("No handled silent error could be found!")
+    return finding
@@ -1,34 +1,27 @@
 """This module contains functions to identify incomplete block sequences."""
 import xml.etree.ElementTree as ET
 
+from app.handlers.error_identifier.silent_error_engine import detect_silent_error
+from app.handlers.error_identifier.silent_error_rule import SilentErrorRule
+from app.handlers.utils.workspace import Workspace
 
-def check_incomplete_block_sequences_error(code: str) -> bool:
-    """Returns True if there is a possible error related to incomplete block sequences."""
-    root = ET.fromstring(code)
-    ns = {'ns': 'http://www.w3.org/1999/xhtml'}
-    # IF DO BLOCKS
-    if_do_blocks = root.findall('.//ns:block[@type="controls_if"]', ns)
-    for block in if_do_blocks:
-        # Find all the blocks inside the if else block
-        values = block.findall('.//ns:value', ns)
-        # The first value should be the if else conditional. If it is not, it means the block is incomplete.
-        if len(values) == 0:
-            return True
-        if values[0].get("name") == "IF0":
-            pass
-        else:
-            return True
-    # IF DO ELSE DO BLOCKS
-    if_do_else_do_blocks = root.findall('.//ns:block[@type="controls_ifelse"]', ns)
-    for block in if_do_else_do_blocks:
-        # Find all the blocks inside the if else block
-        values = block.findall('.//ns/value', ns)
+
+class IncompleteBlockSequencesRule(SilentErrorRule):
+    """Rule that confirms an if do or if do else do block without a condition."""
+
+    error_name = "incomplete_block_sequences_error"
+    block_types = ("controls_if", "controls_ifelse")
+    is_local = True
+
+    def visit(self, block: ET.Element) -> bool:
+        """Returns True if the block is missing its if condition."""
         # The first value should be the if else conditional. If it is not, it means the block is incomplete.
-        if len(values) == 0:
-            return True
-        if values[0].get("name") == "IF0":
-            pass
-        else:
-            return True
+        first_value = block.find('.//ns:value', self.ns)
+        if first_value is None or first_value.get("name") != "IF0":
+            return self.confirm(block)
+        return False
+
 
-    return False
+def check_incomplete_block_sequences_error(workspace: Workspace) -> bool:
+    """Returns True if there is a possible error related to incomplete block sequences."""
+    return detect_silent_error(workspace, [IncompleteBlockSequencesRule]) is not None
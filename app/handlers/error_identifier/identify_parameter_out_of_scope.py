@@ -1,26 +1,43 @@
 """This module contains functions to identify parameter out of scope."""
 import xml.etree.ElementTree as ET
 
+from app.handlers.error_identifier.silent_error_engine import detect_silent_error
+from app.handlers.error_identifier.silent_error_rule import SilentErrorRule
+from app.handlers.utils.helper_functions import find_usages_outside_procedure
+from app.handlers.utils.workspace import PROCEDURE_DEFINITION_TYPES, Workspace
 
-def check_parameter_out_of_scope_error(code: str) -> bool:
+
+class ParameterOutOfScopeRule(SilentErrorRule):
+    """Rule that confirms a function parameter being used outside of its function."""
+
+    error_name = "parameter_out_of_scope_error"
+    block_types = PROCEDURE_DEFINITION_TYPES
+
+    def __init__(self, workspace: Workspace, find_all: bool = False):
+        """Initialize the rule."""
+        super().__init__(workspace, find_all)
+        self.function_blocks = []
+
+    def visit(self, block: ET.Element) -> bool:
+        """Collect the function definitions, usages can only be judged once the whole workspace is known."""
+        self.function_blocks.append(block)
+        return False
+
+    def finish(self) -> bool:
+        """Returns True if a parameter of one of the functions is used outside of it."""
+        for block in self.function_blocks:
+            parameter_blocks = block.findall('.//ns:mutation/ns:arg', self.ns)
+            for parameter_block in parameter_blocks:
+                self.workspace.check_cancellation()
+                parameter_name = parameter_block.get('name')
+                # Check if the parameter is used out of scope of the function
+                if find_usages_outside_procedure(self.workspace, parameter_name, block):
+                    self.confirm(block, parameter_name=parameter_name)
+                    if not self.find_all:
+                        return True
+        return bool(self.findings)
+
+
+def check_parameter_out_of_scope_error(workspace: Workspace) -> bool:
     """Returns True if there is a possible error related to parameter out of scope."""
-    root = ET.fromstring(code)
-    ns = {'ns': 'http://www.w3.org/1999/xhtml'}
-    # Find all function definitions
-    function_blocks_without_return = root.findall('.//ns:block[@type="procedures_defnoreturn"]', ns)
-    function_blocks_with_return = root.findall('.//ns:block[@type="procedures_defreturn"]', ns)
-    function_blocks = function_blocks_without_return + function_blocks_with_return
-    for block in function_blocks:
-        parameter_blocks = block.findall('.//ns:mutation/ns:arg', ns)
-        for parameter_block in parameter_blocks:
-            parameter_name = parameter_block.get('name')
-            # Check if the parameter is used out of scope of the function
-            variable_usage = root.findall(f'.//ns:block/ns:field[@name="VAR"]', ns)
-            variable_usage_in_block = block.findall(f'.//ns:block/ns:field[@name="VAR"]', ns)
-            parameter_usage = [u for u in variable_usage if u.text == parameter_name]
-            parameter_usage_in_block = [u for u in variable_usage_in_block if u.text == parameter_name]
-            if len(parameter_usage) == 0:
-                pass
-            if len(parameter_usage) > len(parameter_usage_in_block):
-                return True
-    return False
+    return detect_silent_error(workspace, [ParameterOutOfScopeRule]) is not None
@@ -0,0 +1,100 @@
+"""Detection engine that evaluates all silent error rules in a single walk over the workspace."""
+import xml.etree.ElementTree as ET
+from typing import Union
+
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.error_identifier.silent_error_rule import SilentErrorRule
+from app.handlers.utils.analysis_session import AnalysisSession
+from app.handlers.utils.workspace import Workspace
+
+
+def detect_silent_error(workspace: Workspace, rule_classes: list,
+                        session: Union[AnalysisSession, None] = None) -> Union[Finding, None]:
+    """Returns the finding of the first confirmed rule, rules are given in priority order.
+
+    With an analysis session, the local rules do not visit the blocks of stacks that did not change since the last
+    workspace of the session again.
+    """
+    rules = [rule_class(workspace) for rule_class in rule_classes]
+    dispatch = _build_dispatch(rules)
+    if session is not None:
+        session.update(workspace)
+
+    # Priority of the best rule confirmed so far, rules with a lower priority no longer need to be visited
+    best = len(rules)
+    cancellation = workspace.cancellation
+    for block in workspace.all_blocks():
+        if cancellation is not None:
+            cancellation.check()
+        for priority, rule in dispatch.get(block.get("type"), ()):
+            if priority >= best:
+                break
+            if _visit(rule, block, session):
+                best = priority
+                # Nothing can beat the first rule, stop walking
+                if best == 0:
+                    return _finding_of(rules[0])
+                break
+
+    # Rules that need to see the whole workspace are confirmed last
+    for priority in range(best):
+        if rules[priority].finish():
+            return _finding_of(rules[priority])
+    if best < len(rules):
+        return _finding_of(rules[best])
+    return None
+
+
+def detect_all_silent_errors(workspace: Workspace, rule_classes: list,
+                             session: Union[AnalysisSession, None] = None) -> list:
+    """Returns the findings of every offending block of every rule, ordered by rule priority and then by position."""
+    rules = [rule_class(workspace, find_all=True) for rule_class in rule_classes]
+    dispatch = _build_dispatch(rules)
+    if session is not None:
+        session.update(workspace)
+
+    # Rules that confirmed their error, in case they did not record any evidence of it
+    confirmed = set()
+    cancellation = workspace.cancellation
+    for block in workspace.all_blocks():
+        if cancellation is not None:
+            cancellation.check()
+        for priority, rule in dispatch.get(block.get("type"), ()):
+            if _visit(rule, block, session):
+                confirmed.add(priority)
+
+    findings = []
+    for priority, rule in enumerate(rules):
+        if rule.finish():
+            confirmed.add(priority)
+        if rule.findings:
+            findings.extend(rule.findings)
+        elif priority in confirmed:
+            findings.append(Finding(error_name=rule.error_name))
+    return findings
+
+
+def _visit(rule: SilentErrorRule, block: ET.Element, session: Union[AnalysisSession, None]) -> bool:
+    """Returns True if the rule confirms its error on the block, reusing the rejections of the session."""
+    if session is None or not rule.is_local:
+        return rule.visit(block)
+    if session.is_rejected(rule.error_name, block):
+        return False
+    # Confirmed blocks are always visited again, so their evidence points at the elements of the current workspace
+    confirmed = rule.visit(block)
+    session.record(rule.error_name, block, confirmed)
+    return confirmed
+
+
+def _build_dispatch(rules: list) -> dict:
+    """Returns a dispatch table from block type to the (priority, rule) pairs interested in it, in priority order."""
+    dispatch = {}
+    for priority, rule in enumerate(rules):
+        for block_type in rule.block_types:
+            dispatch.setdefault(block_type, []).append((priority, rule))
+    return dispatch
+
+
+def _finding_of(rule) -> Finding:
+    """Returns the finding of a confirmed rule, rules that did not record evidence only name the error."""
+    return rule.finding if rule.finding is not None else Finding(error_name=rule.error_name)
@@ -0,0 +1,46 @@
+"""Class to define a structure for a silent error rule."""
+import xml.etree.ElementTree as ET
+
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.utils.workspace import Workspace
+
+
+class SilentErrorRule:
+    """Class to define a structure for a silent error rule.
+
+    A rule is created for a single detection run. The engine calls `visit` for every block whose type is listed in
+    `block_types` and `finish` once all blocks have been visited. A rule that confirms its error keeps the evidence
+    in `finding`, so the hint generator does not have to search for it again. With `find_all` the rule keeps looking
+    after its first confirmation and collects the evidence of every offending block in `findings`.
+
+    Rules whose `visit` only depends on the subtree of the visited block set `is_local`, so an analysis session can
+    skip the blocks they rejected before if those did not change.
+    """
+
+    error_name = None
+    block_types = ()
+    is_local = False
+
+    def __init__(self, workspace: Workspace, find_all: bool = False):
+        """Initialize the rule."""
+        self.workspace = workspace
+        self.ns = workspace.ns
+        self.find_all = find_all
+        self.finding = None
+        self.findings = []
+
+    def visit(self, block: ET.Element) -> bool:
+        """Returns True if the block confirms the error."""
+        return False
+
+    def finish(self) -> bool:
+        """Returns True if the error is confirmed once all blocks have been visited."""
+        return False
+
+    def confirm(self, block: ET.Element, **details) -> bool:
+        """Record the offending block and evidence of the error, returns True to confirm it."""
+        finding = Finding(error_name=self.error_name, block=block, details=details)
+        if self.finding is None:
+            self.finding = finding
+        self.findings.append(finding)
+        return True
@@ -0,0 +1,201 @@
+"""Streaming variant of the silent error detection for huge workspaces.
+
+The rules of identify_silent_error_handler are evaluated on the parser events, and parsing stops as soon as the
+highest priority error is confirmed. Finished elements are dropped right away, so apart from the counters of variable
+usages and the operands of open comparisons the memory needed is proportional to the nesting depth of the workspace
+instead of its size. The finding carries the evidence the hint generators need, so the workspace is never parsed as a
+whole.
+"""
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Union
+
+from app import config
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.error_identifier.identify_comparing_literals import LITERAL_BLOCK_TYPES
+from app.handlers.utils.cancellation import CancellationToken
+from app.handlers.utils.workspace import (BLOCK_TAG, FIELD_TAG, NS, PROCEDURE_DEFINITION_TYPES, check_workspace_limits,
+                                         nesting_too_deep_error)
+
+VALUE_TAG = f"{{{NS['ns']}}}value"
+MUTATION_TAG = f"{{{NS['ns']}}}mutation"
+ARG_TAG = f"{{{NS['ns']}}}arg"
+INCOMPLETE_BLOCK_TYPES = ("controls_if", "controls_ifelse")
+# Number of characters fed to the parser at once
+CHUNK_SIZE = 64 * 1024
+
+# Priorities of the rules, in the order of SILENT_ERROR_RULES
+COMPARING_LITERALS = 0
+INCOMPLETE_BLOCK_SEQUENCES = 1
+PARAMETER_OUT_OF_SCOPE = 2
+ERROR_NAMES = ["comparing_literals_error", "incomplete_block_sequences_error", "parameter_out_of_scope_error"]
+
+
+def detect_silent_error_streaming(code: str,
+                                  cancellation: Union[CancellationToken, None] = None) -> Union[Finding, None]:
+    """Returns the finding of the highest priority silent error in the workspace, or None if there is none.
+
+    The block of the finding is detached from the workspace, only its attributes are kept, except for a comparison of
+    literals whose operands are kept as well. Raises WorkspaceTooComplexError if the workspace is over the limits.
+    """
+    check_workspace_limits(code)
+    parser = ET.XMLPullParser(events=("start", "end"))
+    detector = _StreamingDetector()
+    for offset in range(0, len(code), CHUNK_SIZE):
+        if cancellation is not None:
+            cancellation.check()
+        parser.feed(code[offset:offset + CHUNK_SIZE])
+        for event, element in parser.read_events():
+            detector.handle(event, element)
+            if detector.best == COMPARING_LITERALS:
+                # Nothing can beat the first rule, stop parsing
+                return detector.finish()
+    parser.close()
+    for event, element in parser.read_events():
+        detector.handle(event, element)
+    return detector.finish()
+
+
+class _StreamingDetector:
+    """Keeps the state of the silent error rules for the elements that are currently open."""
+
+    def __init__(self):
+        """Initialize the detector."""
+        self.best = len(ERROR_NAMES)
+        # Open elements with their position in document order, from the root to the element being parsed
+        self.stack = []
+        self.position = 0
+        # Number of open elements at which the workspace is nested too deep, None without a limit
+        self.max_depth = config.WORKSPACE_MAX_DEPTH if config.WORKSPACE_MAX_DEPTH > 0 else None
+        # Open comparisons as [block, operand A, operand B]. An operand is the (position of its value, block type) of
+        # the first block in the earliest value named A or B, like `.//ns:value[@name="A"]/ns:block` finds it.
+        self.compare_frames = []
+        # Open if blocks that did not see a value yet
+        self.if_frames = []
+        # Open procedure definitions as [block, parameter names, function name]
+        self.procedure_frames = []
+        self.procedures = []
+        self.usages = Counter()
+        self.usages_in_procedure = Counter()
+        # Offending block and details of every confirmed rule, in the shape of the findings of the tree rules
+        self.evidence = {}
+
+    def handle(self, event: str, element: ET.Element) -> None:
+        """Update the rules for a single parser event."""
+        if event == "start":
+            if len(self.stack) == self.max_depth:
+                raise nesting_too_deep_error()
+            self._start(element)
+            self.stack.append((element, self.position))
+            self.position += 1
+        else:
+            self.stack.pop()
+            self._end(element)
+            # The element is finished, drop it from the tree to keep the memory proportional to the depth. The content
+            # of open comparisons is kept, it is the evidence of a comparison of literals.
+            if self.stack and not self.compare_frames:
+                parent = self.stack[-1][0]
+                if len(parent) and parent[-1] is element:
+                    del parent[-1]
+
+    def _start(self, element: ET.Element) -> None:
+        """Handle the start of an element, its attributes are known but its content is not."""
+        parent, parent_position = self.stack[-1] if self.stack else (None, None)
+        if element.tag == BLOCK_TAG:
+            block_type = element.get("type")
+            if parent is not None and parent.tag == VALUE_TAG:
+                operand = {"A": 1, "B": 2}.get(parent.get("name"))
+                if operand:
+                    for frame in self.compare_frames:
+                        if frame[operand] is None or parent_position < frame[operand][0]:
+                            frame[operand] = (parent_position, block_type)
+            if block_type == "logic_compare":
+                self.compare_frames.append([element, None, None])
+            elif block_type in INCOMPLETE_BLOCK_TYPES and self.best > INCOMPLETE_BLOCK_SEQUENCES:
+                self.if_frames.append(element)
+            elif block_type in PROCEDURE_DEFINITION_TYPES and self.best > PARAMETER_OUT_OF_SCOPE:
+                frame = [element, [], None]
+                self.procedure_frames.append(frame)
+                self.procedures.append(frame)
+        elif element.tag == VALUE_TAG and self.if_frames:
+            # The first value in an if block should be its condition
+            if element.get("name") != "IF0":
+                # The outermost open if block comes first in document order
+                self._confirm_incomplete_block(self.if_frames[0])
+            self.if_frames.clear()
+        elif element.tag == ARG_TAG and parent is not None and parent.tag == MUTATION_TAG:
+            for frame in self.procedure_frames:
+                frame[1].append(element.get("name"))
+
+    def _end(self, element: ET.Element) -> None:
+        """Handle the end of an element, its content is complete."""
+        if element.tag == BLOCK_TAG:
+            block_type = element.get("type")
+            if block_type == "logic_compare":
+                _, operand_a, operand_b = self.compare_frames.pop()
+                # A comparison with an empty side does not compare literals
+                if operand_a is not None and operand_b is not None:
+                    if operand_a[1] in LITERAL_BLOCK_TYPES and operand_a[1] == operand_b[1]:
+                        self._confirm_comparing_literals(element)
+            elif self.if_frames and self.if_frames[-1] is element:
+                # An if block without any value has no condition
+                self.if_frames.pop()
+                self._confirm_incomplete_block(element)
+            elif self.procedure_frames and self.procedure_frames[-1][0] is element:
+                self.procedure_frames.pop()
+        elif element.tag == FIELD_TAG and element.get("name") == "VAR" and self.best > PARAMETER_OUT_OF_SCOPE:
+            parent = self.stack[-1][0] if self.stack else None
+            if parent is not None and parent.tag == BLOCK_TAG:
+                self.usages[element.text] += 1
+                # A field of the definition block itself is not enclosed by the definition
+                for procedure, _, _ in self.procedure_frames:
+                    if procedure is not parent:
+                        self.usages_in_procedure[(id(procedure), element.text)] += 1
+        elif element.tag == FIELD_TAG and element.get("name") == "NAME":
+            # The function name of the hint is the first NAME field in the definition
+            for frame in self.procedure_frames:
+                if frame[2] is None:
+                    frame[2] = element.text
+
+    def _confirm_comparing_literals(self, block: ET.Element) -> None:
+        """Confirm a comparison of literals, with the evidence that ComparingLiteralsRule records."""
+        # The nearest ancestor with a type, like find_parent_with_type finds it in the tree
+        parent_block = next((ancestor for ancestor, _ in reversed(self.stack) if "type" in ancestor.attrib), None)
+        self._confirm(COMPARING_LITERALS, block,
+                      operand_a=block.find('.//ns:value[@name="A"]/ns:block', NS),
+                      operand_b=block.find('.//ns:value[@name="B"]/ns:block', NS),
+                      parent_type=parent_block.get("type") if parent_block is not None else None)
+
+    def _confirm_incomplete_block(self, block: ET.Element) -> None:
+        """Confirm an if block without a condition.
+
+        The open if blocks that started before it can still be confirmed, and then come first in document order.
+        """
+        if self.best >= INCOMPLETE_BLOCK_SEQUENCES:
+            self.evidence[INCOMPLETE_BLOCK_SEQUENCES] = (block, {})
+        self._confirm(INCOMPLETE_BLOCK_SEQUENCES)
+
+    def _confirm(self, priority: int, block: Union[ET.Element, None] = None, **details) -> None:
+        """Record a confirmed rule and its evidence, rules with a lower priority no longer need to be evaluated."""
+        if priority < self.best:
+            self.best = priority
+            if block is not None:
+                self.evidence[priority] = (block, details)
+            if priority < INCOMPLETE_BLOCK_SEQUENCES:
+                self.if_frames.clear()
+            if priority <= PARAMETER_OUT_OF_SCOPE:
+                self.procedure_frames.clear()
+
+    def finish(self) -> Union[Finding, None]:
+        """Returns the finding of the best confirmed rule once the whole workspace was parsed."""
+        if self.best > PARAMETER_OUT_OF_SCOPE:
+            for procedure, parameter_names, function_name in self.procedures:
+                for parameter_name in parameter_names:
+                    # The parameter is used outside of the function if not all of its usages are inside of it
+                    if self.usages[parameter_name] > self.usages_in_procedure[(id(procedure), parameter_name)]:
+                        self._confirm(PARAMETER_OUT_OF_SCOPE, procedure, parameter_name=parameter_name,
+                                      function_name=function_name)
+        if self.best == len(ERROR_NAMES):
+            return None
+        block, details = self.evidence.get(self.best, (None, {}))
+        return Finding(error_name=ERROR_NAMES[self.best], block=block, details=details)
@@ -0,0 +1,124 @@
+"""Generates hints for a batch of hint requests, spreading the analysis over the worker processes."""
+import logging
+import xml.etree.ElementTree as ET
+from concurrent.futures.process import BrokenProcessPool
+from typing import Union
+
+from pydantic import ValidationError
+
+from app.handlers.hint_pipeline import run_fingerprinted_hint_pipeline
+from app.handlers.hint_service import SUPPORTED_CODE_LANGUAGES, store_hint_result, workspace_too_complex_result
+from app.handlers.utils.cancellation import WorkspaceTooComplexError
+from app.handlers.utils.hint_cache import hint_cache, raw_request_cache_key
+from app.handlers.utils.worker_pool import get_process_pool, reset_process_pool, submit_to_worker_pool
+from app.schemas.hint_request import HintRequest
+
+logger = logging.getLogger(__name__)
+
+
+def generate_hints_batch(hint_requests: list[Union[HintRequest, dict]]) -> list[tuple[str, int]]:
+    """Returns the (hint_text, status_code) of every hint request, in input order.
+
+    Raw items are validated one by one, so an invalid item or a failure while generating the hint of one request only
+    fails that request.
+    """
+    results = [None] * len(hint_requests)
+    # Requests that still need to be analysed, grouped by cache key so identical requests are analysed once. Only the
+    # raw request key is used here, the workspaces are parsed on the worker processes.
+    pending = {}
+    for index, hint_request in enumerate(hint_requests):
+        if not isinstance(hint_request, HintRequest):
+            try:
+                hint_request = HintRequest.model_validate(hint_request)
+            except ValidationError as error:
+                results[index] = (f"Invalid hint request: {_describe_validation_error(error)}", 422)
+                continue
+        if hint_request.code_language not in SUPPORTED_CODE_LANGUAGES:
+            results[index] = ("Only Python and Arduino are supported.", 400)
+            continue
+        raw_key = raw_request_cache_key(code=hint_request.code, error=hint_request.error, status=hint_request.status,
+                                        code_language=hint_request.code_language)
+        if raw_key in pending:
+            pending[raw_key][1].append(index)
+            continue
+        cached_result = hint_cache.get(raw_key)
+        if cached_result is not None:
+            results[index] = cached_result
+        else:
+            pending[raw_key] = (hint_request, [index])
+
+    for raw_key, (fingerprint, result) in _run_pipelines(pending).items():
+        hint_request, indexes = pending[raw_key]
+        # Unexpected failures and workspaces that are too complex are not cached, they may not happen again
+        if fingerprint is not None:
+            store_hint_result(raw_key=raw_key, fingerprint=fingerprint, hint_request=hint_request, result=result)
+        for index in indexes:
+            results[index] = result
+    return results
+
+
+def _run_pipelines(pending: dict) -> dict:
+    """Run the hint pipeline for every pending request, on the worker processes if they are enabled."""
+    if get_process_pool() is None:
+        return {raw_key: _run_pipeline_safely(hint_request) for raw_key, (hint_request, _) in pending.items()}
+
+    futures = {}
+    results = {}
+    pool_broken = False
+    for raw_key, (hint_request, _) in pending.items():
+        # The batch shares the bounded queue of the worker processes, it waits for a place instead of taking all
+        try:
+            futures[raw_key] = submit_to_worker_pool(run_fingerprinted_hint_pipeline, wait_for_place=True,
+                                                     code=hint_request.code, error=hint_request.error,
+                                                     output=hint_request.output, status=hint_request.status,
+                                                     code_language=hint_request.code_language)
+        except BrokenProcessPool:
+            pool_broken = True
+            results[raw_key] = _failed_result()
+    for raw_key, future in futures.items():
+        try:
+            results[raw_key] = future.result()
+        except BrokenProcessPool:
+            pool_broken = True
+            results[raw_key] = _failed_result()
+        except WorkspaceTooComplexError as error:
+            results[raw_key] = None, workspace_too_complex_result(error)
+        except ET.ParseError:
+            results[raw_key] = _invalid_workspace_result()
+        except Exception:
+            logger.exception("Hint generation failed for a batch item.")
+            results[raw_key] = _failed_result()
+    if pool_broken:
+        reset_process_pool()
+    return results
+
+
+def _run_pipeline_safely(hint_request: HintRequest) -> tuple:
+    """Run the hint pipeline in the current thread, turning unexpected failures into a failed result."""
+    try:
+        return run_fingerprinted_hint_pipeline(code=hint_request.code, error=hint_request.error,
+                                               output=hint_request.output, status=hint_request.status,
+                                               code_language=hint_request.code_language)
+    except WorkspaceTooComplexError as error:
+        return None, workspace_too_complex_result(error)
+    except ET.ParseError:
+        return _invalid_workspace_result()
+    except Exception:
+        logger.exception("Hint generation failed for a batch item.")
+        return _failed_result()
+
+
+def _failed_result() -> tuple:
+    """Returns the (fingerprint, result) of a request whose hint could not be generated."""
+    return None, ("Something went wrong while generating a hint for this request.", 500)
+
+
+def _invalid_workspace_result() -> tuple:
+    """Returns the (fingerprint, result) of a request whose code is not a valid workspace, a mistake of the client."""
+    return None, ("The code of this hint request is not a valid Blockly workspace.", 400)
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    """Returns the problems of an invalid batch item on a single line."""
+    return "; ".join(f"{'.'.join(str(part) for part in problem['loc']) or 'item'}: {problem['msg']}"
+                     for problem in error.errors())
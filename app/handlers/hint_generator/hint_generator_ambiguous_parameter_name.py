@@ -1,6 +1,4 @@
 """Generates hints for ambiguous parameter name."""
-import xml.etree.ElementTree as ET
-
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
 
 
@@ -20,18 +18,18 @@ class AmbiguousParameterNameHintGenerator(HintGenerator):
 
     def gather_error_info(self) -> dict:
         """Gather information about the error."""
-        root = ET.fromstring(self.code)
-        ns = {'ns': 'http://www.w3.org/1999/xhtml'}
+        ns = self.workspace.ns
         error_info = {
             "function_name": None,
             "ambiguous_parameter_names": None
         }
         # Find all the blocks that have ambiguous parameter names
-        function_blocks_without_return = root.findall('.//ns:block[@type="procedures_defnoreturn"]', ns)
-        function_blocks_with_return = root.findall('.//ns:block[@type="procedures_defreturn"]', ns)
+        function_blocks_without_return = self.workspace.blocks_of_type("procedures_defnoreturn")
+        function_blocks_with_return = self.workspace.blocks_of_type("procedures_defreturn")
         function_blocks = function_blocks_without_return + function_blocks_with_return
 
         for block in function_blocks:
+            self.workspace.check_cancellation()
             # Get the function name
             function_name = block.find('.//ns:field[@name="NAME"]', ns).text
             parameter_names = []
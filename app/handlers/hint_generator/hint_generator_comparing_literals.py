@@ -4,6 +4,13 @@ import xml.etree.ElementTree as ET
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
 from app.handlers.utils.helper_functions import find_parent_with_type
 
+# Names of the literal block types used in the hints
+LITERAL_TYPE_NAMES = {
+    "text": "string",
+    "math_number": "number",
+    "logic_boolean": "boolean",
+}
+
 
 class ComparingLiteralsHintGenerator(HintGenerator):
     """Generates hints for comparing literals errors."""
@@ -22,8 +29,12 @@ class ComparingLiteralsHintGenerator(HintGenerator):
 
     def gather_error_info(self) -> dict:
         """Gather information about the error."""
-        root = ET.fromstring(self.code)
-        ns = {'ns': 'http://www.w3.org/1999/xhtml'}
+        finding = self.offending_finding()
+        return self.gather_comparison_info(finding.block, finding.details["operand_a"], finding.details["operand_b"])
+
+    def gather_comparison_info(self, block: ET.Element, value_a_block: ET.Element, value_b_block: ET.Element) -> dict:
+        """Gather information about the comparison, the types are only set if it compares 2 literals."""
+        ns = self.workspace.ns
         error_info = {
             "a_type": None,
             "b_type": None,
@@ -32,32 +43,22 @@ class ComparingLiteralsHintGenerator(HintGenerator):
             "operator": None,
             "parent_block": None
         }
-        # Find all the blocks that compare 2 objects
-        logic_compare_blocks = root.findall('.//ns:block[@type="logic_compare"]', ns)
-        for block in logic_compare_blocks:
-            # Comparison values
-            value_a_block = block.find('.//ns:value[@name="A"]/ns:block', ns)
-            value_b_block = block.find('.//ns:value[@name="B"]/ns:block', ns)
-            error_info["operator"] = block.find('.//ns:field[@name="OP"]', ns).text
-            error_info["parent_block"] = find_parent_with_type(root, block).get('type') if not None else None
-            error_info["a_value"] = value_a_block.find('.//ns:field', ns).text
-            error_info["b_value"] = value_b_block.find('.//ns:field', ns).text
+        error_info["operator"] = block.find('.//ns:field[@name="OP"]', ns).text
+        if "parent_type" in self.finding.details:
+            # A streamed comparison is detached from the workspace, the detector recorded the type of its parent
+            error_info["parent_block"] = self.finding.details["parent_type"]
+        else:
+            parent_block = find_parent_with_type(self.workspace, block)
+            error_info["parent_block"] = parent_block.get('type') if parent_block is not None else None
+        error_info["a_value"] = value_a_block.find('.//ns:field', ns).text
+        error_info["b_value"] = value_b_block.find('.//ns:field', ns).text
 
-            # Comparing 2 string values
-            if value_a_block.get("type") == "text" and value_b_block.get("type") == "text":
-                error_info["a_type"] = "string"
-                error_info["b_type"] = "string"
-                return error_info
-            # Comparing 2 number values
-            elif value_a_block.get("type") == "math_number" and value_b_block.get("type") == "math_number":
-                error_info["a_type"] = "number"
-                error_info["b_type"] = "number"
-                return error_info
-            # Comparing 2 boolean values
-            elif value_a_block.get("type") == "logic_boolean" and value_b_block.get("type") == "logic_boolean":
-                error_info["a_type"] = "boolean"
-                error_info["b_type"] = "boolean"
-                return error_info
+        # Comparing 2 string, number or boolean values
+        value_a_type = value_a_block.get("type")
+        if value_a_type in LITERAL_TYPE_NAMES and value_a_type == value_b_block.get("type"):
+            error_info["a_type"] = LITERAL_TYPE_NAMES[value_a_type]
+            error_info["b_type"] = LITERAL_TYPE_NAMES[value_a_type]
+        return error_info
 
     @staticmethod
     def generate_transformation_hint() -> str:
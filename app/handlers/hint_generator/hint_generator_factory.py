@@ -1,4 +1,7 @@
 """Factory method to generate the class based on the error_name."""
+from typing import Union
+
+from app.handlers.error_identifier.finding import Finding
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
 from app.handlers.hint_generator.hint_generator_zero_division import ZeroDivisionHintGenerator
 from app.handlers.hint_generator.hint_generator_comparing_literals import ComparingLiteralsHintGenerator
@@ -8,25 +11,27 @@ from app.handlers.hint_generator.hint_generator_ambiguous_parameter_name import
 from app.handlers.hint_generator.hint_generator_incomplete_block_sequences import IncompleteBlockSequencesGenerator
 from app.handlers.hint_generator.hint_generator_parameter_out_of_scope import ParameterOutOfScopeHintGenerator
 from app.handlers.hint_generator.hint_generator_none_type_error import NoneTypeHintGenerator
+from app.handlers.utils.workspace import Workspace
 
 
-def hint_generator_factory(error_name: str, code: str, error: str, code_language: str) -> HintGenerator:
+def hint_generator_factory(error_name: str, workspace: Workspace, error: str, code_language: str,
+                           finding: Union[Finding, None] = None) -> HintGenerator:
     """Factory method to generate the class based on the error_name."""
     if error_name == "zero_division_error":
-        return ZeroDivisionHintGenerator(code=code, error=error, code_language=code_language)
+        return ZeroDivisionHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "comparing_literals_error":
-        return ComparingLiteralsHintGenerator(code=code, error=error, code_language=code_language)
+        return ComparingLiteralsHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "out_of_bounds_error":
-        return OutOfBoundsHintGenerator(code=code, error=error, code_language=code_language)
+        return OutOfBoundsHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "type_error":
-        return TypeErrorHintGenerator(code=code, error=error, code_language=code_language)
+        return TypeErrorHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "ambiguous_parameter_name":
-        return AmbiguousParameterNameHintGenerator(code=code, error=error, code_language=code_language)
+        return AmbiguousParameterNameHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "incomplete_block_sequences_error":
-        return IncompleteBlockSequencesGenerator(code=code, error=error, code_language=code_language)
+        return IncompleteBlockSequencesGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "parameter_out_of_scope_error":
-        return ParameterOutOfScopeHintGenerator(code=code, error=error, code_language=code_language)
+        return ParameterOutOfScopeHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     elif error_name == "none_type_error":
-        return NoneTypeHintGenerator(code=code, error=error, code_language=code_language)
+        return NoneTypeHintGenerator(workspace=workspace, error=error, code_language=code_language, finding=finding)
     else:
         raise NotImplementedError("No hint generator found for this error.")
@@ -1,6 +1,4 @@
 """Generates hints for incomplete block sequences."""
-import xml.etree.ElementTree as ET
-
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
 
 
@@ -20,36 +18,9 @@ class IncompleteBlockSequencesGenerator(HintGenerator):
 
     def gather_error_info(self) -> dict:
         """Gather information about the error."""
-        root = ET.fromstring(self.code)
-        ns = {'ns': 'http://www.w3.org/1999/xhtml'}
-        error_info = {
-            "block_type": None
+        return {
+            "block_type": self.offending_finding().block.get("type")
         }
-        # IF DO BLOCKS
-        if_do_blocks = root.findall('.//ns:block[@type="controls_if"]', ns)
-        for block in if_do_blocks:
-            # Find all the blocks inside the if else block
-            values = block.findall('.//ns:value', ns)
-            # The first value should be the if else conditional. If it is not, it means the block is incomplete.
-            if len(values) == 0:
-                error_info["block_type"] = "controls_if"
-            if values[0].get("name") == "IF0":
-                pass
-            else:
-                error_info["block_type"] = "controls_if"
-        # IF DO ELSE DO BLOCKS
-        if_do_else_do_blocks = root.findall('.//ns:block[@type="controls_ifelse"]', ns)
-        for block in if_do_else_do_blocks:
-            # Find all the blocks inside the if else block
-            values = block.findall('.//ns/value', ns)
-            # The first value should be the if else conditional. If it is not, it means the block is incomplete.
-            if len(values) == 0:
-                error_info["block_type"] = "controls_ifelse"
-            if values[0].get("name") == "IF0":
-                pass
-            else:
-                error_info["block_type"] = "controls_ifelse"
-        return error_info
 
     @staticmethod
     def generate_transformation_hint() -> str:
@@ -1,8 +1,5 @@
 """Generates hints for none type errors."""
-import xml.etree.ElementTree as ET
-
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
-from app.handlers.utils.helper_functions import check_variable_type
 
 
 class NoneTypeHintGenerator(HintGenerator):
@@ -24,14 +21,7 @@ class NoneTypeHintGenerator(HintGenerator):
         error_info = {
             "error_statement": None,
         }
-        if self.code_language == "Python":
-            error_lines = self.error.strip().split("\n")
-            error_variables = error_lines[-2].strip()
-            error_info["error_statement"] = error_variables
-        elif self.code_language == "Arduino":
-            error_lines = self.error.strip().split("\n")
-            error_variables = error_lines[-3].strip().replace(";", "")
-            error_info["error_statement"] = error_variables
+        error_info["error_statement"] = self.parsed_error.statement
         return error_info
 
     @staticmethod
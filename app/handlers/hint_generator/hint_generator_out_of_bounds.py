@@ -1,8 +1,5 @@
 """Generates hints for out of bounds / index errors."""
-import xml.etree.ElementTree as ET
-
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
-from app.handlers.utils.helper_functions import find_parent_with_type
 
 
 class OutOfBoundsHintGenerator(HintGenerator):
@@ -24,9 +21,8 @@ class OutOfBoundsHintGenerator(HintGenerator):
         error_info = {
             "error_statement": None,
         }
-        error_lines = self.error.strip().split("\n")
-        error_variables = error_lines[-2].strip()
-        error_info["error_statement"] = error_variables
+        # The statement is taken from the line above the last one for both languages
+        error_info["error_statement"] = self.parsed_error.line_from_end(2)
         return error_info
 
     @staticmethod
@@ -20,32 +20,22 @@ class ParameterOutOfScopeHintGenerator(HintGenerator):
 
     def gather_error_info(self) -> dict:
         """Gather information about the error."""
-        root = ET.fromstring(self.code)
-        ns = {'ns': 'http://www.w3.org/1999/xhtml'}
+        finding = self.offending_finding()
+        if "function_name" in finding.details:
+            # A streamed function definition is detached from the workspace, the detector recorded its name
+            return {"function_name": finding.details["function_name"],
+                    "parameter_name": finding.details["parameter_name"]}
+        return self.gather_function_info(finding.block, finding.details["parameter_name"])
+
+    def gather_function_info(self, block: ET.Element, parameter_name: str) -> dict:
+        """Gather information about the function whose parameter is used outside of it."""
         error_info = {
             "function_name": None,
-            "parameter_name": None,
+            "parameter_name": parameter_name,
         }
-        # Find all function definitions
-        function_blocks_without_return = root.findall('.//ns:block[@type="procedures_defnoreturn"]', ns)
-        function_blocks_with_return = root.findall('.//ns:block[@type="procedures_defreturn"]', ns)
-        function_blocks = function_blocks_without_return + function_blocks_with_return
-        for block in function_blocks:
-            function_name_element = block.find('.//ns:field[@name="NAME"]', ns)
-            if function_name_element is not None:
-                error_info["function_name"] = function_name_element.text
-            parameter_blocks = block.findall('.//ns:mutation/ns:arg', ns)
-            for parameter_block in parameter_blocks:
-                parameter_name = parameter_block.get('name')
-                # Check if the parameter is used out of scope of the function
-                variable_usage = root.findall(f'.//ns:block/ns:field[@name="VAR"]', ns)
-                variable_usage_in_block = block.findall(f'.//ns:block/ns:field[@name="VAR"]', ns)
-                parameter_usage = [u for u in variable_usage if u.text == parameter_name]
-                parameter_usage_in_block = [u for u in variable_usage_in_block if u.text == parameter_name]
-                if len(parameter_usage) == 0:
-                    pass
-                if len(parameter_usage) > len(parameter_usage_in_block):
-                    error_info["parameter_name"] = parameter_name
+        function_name_element = block.find('.//ns:field[@name="NAME"]', self.workspace.ns)
+        if function_name_element is not None:
+            error_info["function_name"] = function_name_element.text
         return error_info
 
     @staticmethod
@@ -1,14 +1,36 @@
 """Class to define a structure for a hint generator."""
+from typing import Union
+
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.utils.error_parser import ParsedError, parse_error
+from app.handlers.utils.workspace import Workspace
 
 
 class HintGenerator:
     """Class to define a structure for a hint generator."""
 
-    def __init__(self, code: str, error: str, code_language: str):
+    def __init__(self, workspace: Workspace, error: str, code_language: str, finding: Union[Finding, None] = None):
         """Initialize the hint generator."""
-        self.code = code
+        self.workspace = workspace
+        # Evidence of the identifier, the generators of silent errors describe its offending block
+        self.finding = finding
+        self.code = workspace.code
         self.error = error
         self.code_language = code_language
+        self._parsed_error = None
+
+    @property
+    def parsed_error(self) -> ParsedError:
+        """The structured end of the error message, parsed on first access."""
+        if self._parsed_error is None:
+            self._parsed_error = parse_error(self.error, self.code_language)
+        return self._parsed_error
+
+    def offending_finding(self) -> Finding:
+        """Returns the finding of the identifier, raises ValueError if it does not point at an offending block."""
+        if self.finding is None or self.finding.block is None:
+            raise ValueError(f"{type(self).__name__} needs the finding of the identifier with its offending block.")
+        return self.finding
 
     def generate_hint(self) -> str:
         """Generate a hint based on the error."""
@@ -1,6 +1,4 @@
 """Generates hints for type errors."""
-import xml.etree.ElementTree as ET
-
 from app.handlers.hint_generator.hint_generator_template import HintGenerator
 from app.handlers.utils.helper_functions import check_variable_type
 
@@ -22,17 +20,17 @@ class TypeErrorHintGenerator(HintGenerator):
 
     def gather_error_info(self) -> dict:
         """Gather information about the error."""
-        root = ET.fromstring(self.code)
         error_info = {
             "a_type": None,
             "b_type": None,
             "a_value": None,
             "b_value": None,
         }
-        ns = {'ns': 'http://www.w3.org/1999/xhtml'}
+        ns = self.workspace.ns
         # Find all the blocks that have math in there
-        math_blocks = root.findall('.//ns:block[@type="math_arithmetic"]', ns)
+        math_blocks = self.workspace.blocks_of_type("math_arithmetic")
         for block in math_blocks:
+            self.workspace.check_cancellation()
             # Comparison values
             value_a_block = block.find('.//ns:value[@name="A"]/ns:block', ns)
             value_b_block = block.find('.//ns:value[@name="B"]/ns:block', ns)
@@ -41,10 +39,10 @@ class TypeErrorHintGenerator(HintGenerator):
             # Comparing 2 string values
             if type_a == "variables_get":
                 variable_name_a = value_a_block.find('.//ns:field', ns).text
-                type_a = check_variable_type(variable_name_a, root, ns)
+                type_a = check_variable_type(variable_name_a, self.workspace)
             if type_b == "variables_get":
                 variable_name_b = value_b_block.find('.//ns:field', ns).text
-                type_b = check_variable_type(variable_name_b, root, ns)
+                type_b = check_variable_type(variable_name_b, self.workspace)
             if type_a != type_b:
                 error_info["a_type"] = type_a
                 error_info["b_type"] = type_b
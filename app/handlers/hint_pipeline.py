@@ -0,0 +1,87 @@
+"""Runs the full identify and generate pipeline for a single hint request."""
+from typing import Union
+
+from app import config
+from app.handlers.error_identifier.identify_error import identify_all_errors_handler, identify_error_handler
+from app.handlers.hint_generator.hint_generator_factory import hint_generator_factory
+from app.handlers.utils.analysis_session import AnalysisSession
+from app.handlers.utils.cancellation import CancellationToken
+from app.handlers.utils.metrics import record_error_name, timed_stage
+from app.handlers.utils.workspace import Workspace
+
+
+def run_hint_pipeline(code: str, error: str, output: str, status: str, code_language: str,
+                      workspace: Union[Workspace, None] = None,
+                      session: Union[AnalysisSession, None] = None) -> tuple[str, int]:
+    """Identify the error and generate a hint, returns the hint text and the status code.
+
+    An already parsed workspace of the code can be passed in to avoid parsing it again. With an analysis session only
+    the blocks that changed since the last workspace of the session are analysed again.
+    """
+    # Parse the workspace once, it is shared by the identifier and the hint generator
+    if workspace is None:
+        workspace = Workspace(code)
+    # Identify the error
+    # Generate the hint based on the error
+    try:
+        with timed_stage("detection"):
+            finding = identify_error_handler(error_message=error, workspace=workspace, output=output, status=status, code_language=code_language, session=session)
+        record_error_name(finding.error_name)
+        workspace.check_cancellation()
+        with timed_stage("generation"):
+            hint_generator = hint_generator_factory(error_name=finding.error_name, workspace=workspace, error=error, code_language=code_language, finding=finding)
+            hint, status_code = hint_generator.generate_hint()
+    except NotImplementedError:
+        hint = "No generated hints found for this error."
+        status_code = 404
+    return hint, status_code
+
+
+def run_all_hints_pipeline(code: str, error: str, output: str, status: str, code_language: str,
+                           workspace: Union[Workspace, None] = None,
+                           session: Union[AnalysisSession, None] = None) -> list[tuple[str, int]]:
+    """Identify every error and generate a hint for each of them, returns the hints and status codes in priority order.
+
+    An already parsed workspace of the code can be passed in to avoid parsing it again. With an analysis session only
+    the blocks that changed since the last workspace of the session are analysed again.
+    """
+    if workspace is None:
+        workspace = Workspace(code)
+    try:
+        with timed_stage("detection"):
+            findings = identify_all_errors_handler(error_message=error, workspace=workspace, output=output, status=status, code_language=code_language, session=session)
+    except NotImplementedError:
+        findings = []
+    if findings:
+        record_error_name(findings[0].error_name)
+    hints = []
+    for finding in findings:
+        workspace.check_cancellation()
+        try:
+            with timed_stage("generation"):
+                hint_generator = hint_generator_factory(error_name=finding.error_name, workspace=workspace, error=error, code_language=code_language, finding=finding)
+                hint = hint_generator.generate_hint()
+        except NotImplementedError:
+            continue
+        # Offending blocks of the same kind can get the same hint, it only has to be shown once
+        if hint not in hints:
+            hints.append(hint)
+    if not hints:
+        hints.append(("No generated hints found for this error.", 404))
+    return hints
+
+
+def run_fingerprinted_hint_pipeline(code: str, error: str, output: str, status: str,
+                                    code_language: str) -> tuple[str, tuple[str, int]]:
+    """Run the hint pipeline and return the workspace fingerprint together with the result.
+
+    Used by the worker processes, so the caller can cache the result under the fingerprint without parsing the code.
+    Raises WorkspaceTooComplexError when the workspace is needed but over the limits, or its analysis runs out of its
+    time budget.
+    """
+    cancellation = CancellationToken()
+    cancellation.limit_time(config.ANALYSIS_TIME_BUDGET)
+    workspace = Workspace(code, cancellation)
+    result = run_hint_pipeline(code=code, error=error, output=output, status=status, code_language=code_language,
+                               workspace=workspace)
+    return workspace.fingerprint, result
@@ -0,0 +1,180 @@
+"""Serves hint requests from the cache and runs the hint pipeline for the ones that miss it."""
+from typing import Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.handlers.error_identifier.identify_error import needs_silent_error_analysis
+from app.handlers.hint_pipeline import run_all_hints_pipeline, run_fingerprinted_hint_pipeline, run_hint_pipeline
+from app.handlers.utils.analysis_session import AnalysisSession, analysis_sessions
+from app.handlers.utils.cancellation import AnalysisCancelledError, CancellationToken, WorkspaceTooComplexError
+from app.handlers.utils.hint_cache import hint_cache, hint_cache_key, raw_request_cache_key
+from app.handlers.utils.metrics import current_request_timings
+from app.handlers.utils.profiling import profiled_analysis
+from app.handlers.utils.single_flight import hint_flights
+from app.handlers.utils.worker_pool import run_in_worker_pool
+from app.handlers.utils.workspace import Workspace
+from app.schemas.hint_request import HintRequest
+
+SUPPORTED_CODE_LANGUAGES = ["Python", "Arduino"]
+
+
+def get_hint(hint_request: HintRequest, cancellation: Union[CancellationToken, None] = None) -> tuple[str, int]:
+    """Returns the (hint_text, status_code) of a hint request, analysing the workspace in the current thread.
+
+    Raises AnalysisCancelledError when the cancellation token is cancelled before the analysis finished.
+    """
+    return _get_cached_result(hint_request, run_hint_pipeline, all_findings=False, cancellation=cancellation)
+
+
+def get_all_hints(hint_request: HintRequest,
+                  cancellation: Union[CancellationToken, None] = None) -> list[tuple[str, int]]:
+    """Returns the (hint_text, status_code) of every error found in a hint request, in priority order.
+
+    Raises AnalysisCancelledError when the cancellation token is cancelled before the analysis finished.
+    """
+    return _get_cached_result(hint_request, run_all_hints_pipeline, all_findings=True, cancellation=cancellation)
+
+
+def get_cached_hint(hint_request: HintRequest, all_findings: bool = False):
+    """Returns the result of a hint request cached in memory, or None if it is not.
+
+    Only the raw request key is checked in the memory of the cache, so the workspace is not parsed and the persistent
+    store is not read, which is cheap enough for the event loop. A miss is looked up in the store once the request is
+    handled in a thread. The handling of the request starts here, so a cache hit is timed like any other request.
+    """
+    _start_handling(hint_request)
+    raw_key = raw_request_cache_key(code=hint_request.code, error=hint_request.error, status=hint_request.status,
+                                    code_language=hint_request.code_language, all_findings=all_findings)
+    return hint_cache.get(raw_key, count_miss=False, memory_only=True)
+
+
+def _get_cached_result(hint_request: HintRequest, pipeline, all_findings: bool,
+                       cancellation: Union[CancellationToken, None] = None):
+    """Returns the result of the pipeline for a hint request, served from the cache when possible."""
+    _start_handling(hint_request)
+    raw_key = raw_request_cache_key(code=hint_request.code, error=hint_request.error, status=hint_request.status,
+                                    code_language=hint_request.code_language, all_findings=all_findings)
+    cached_result = hint_cache.get(raw_key, count_miss=False)
+    if cached_result is not None:
+        return cached_result
+
+    # Concurrent identical requests, e.g. a whole class running the same starter program, share a single analysis
+    try:
+        return hint_flights.do(raw_key, lambda: _compute_result(hint_request, pipeline, all_findings, raw_key,
+                                                                cancellation))
+    except AnalysisCancelledError:
+        if cancellation is not None and cancellation.cancelled:
+            raise
+        # The request that started the shared analysis was superseded, this one still needs the result
+        return _compute_result(hint_request, pipeline, all_findings, raw_key, cancellation)
+
+
+def _compute_result(hint_request: HintRequest, pipeline, all_findings: bool, raw_key: str,
+                    cancellation: Union[CancellationToken, None] = None):
+    """Returns the result of the pipeline for a hint request that missed the cache, and caches it."""
+    # An identical request may have finished since the cache was checked
+    cached_result = hint_cache.get(raw_key, count_miss=False)
+    if cached_result is not None:
+        return cached_result
+    if cancellation is not None:
+        # The request may have been superseded while it was waiting for a thread
+        cancellation.check()
+    else:
+        cancellation = CancellationToken()
+    # The time budget starts with the analysis, waiting for admission or for a thread does not count
+    cancellation.limit_time(config.ANALYSIS_TIME_BUDGET)
+    # Workspaces over the limits are rejected when they are parsed, requests that do not need them still get their hint
+    try:
+        # Parsing and fingerprinting are profiled as well, they can take most of the time of a pathological workspace
+        with profiled_analysis(hint_request):
+            if hint_request.session_id is None:
+                result = _get_fingerprinted_result(hint_request, pipeline, all_findings,
+                                                   Workspace(hint_request.code, cancellation))
+            else:
+                # Editors that resubmit their workspace after every edit only get the changed stacks analysed again
+                session = analysis_sessions.get(hint_request.session_id, len(hint_request.code))
+                with session.lock:
+                    workspace = session.workspace_for(hint_request.code)
+                    # The workspace of the session is reused, so it gets the token of the current request
+                    workspace.cancellation = cancellation
+                    result = _get_fingerprinted_result(hint_request, pipeline, all_findings, workspace, session)
+    except WorkspaceTooComplexError as error:
+        # Not cached, the time budget may not run out when the service is less busy
+        return workspace_too_complex_result(error, all_findings)
+    hint_cache.set(raw_key, result)
+    return result
+
+
+def workspace_too_complex_result(error: WorkspaceTooComplexError, all_findings: bool = False):
+    """Returns the result of a request whose workspace is too complex to be analysed."""
+    result = (f"This workspace is too complex to be analysed. {error}", 422)
+    return [result] if all_findings else result
+
+
+def _get_fingerprinted_result(hint_request: HintRequest, pipeline, all_findings: bool, workspace: Workspace,
+                              session: Union[AnalysisSession, None] = None):
+    """Returns the result of the pipeline for a workspace, served from the cache entry of its fingerprint if possible."""
+    # Workspaces that only differ in layout share the entry of their structural fingerprint
+    fingerprint_key = hint_cache_key(fingerprint=workspace.fingerprint, error=hint_request.error,
+                                     status=hint_request.status, code_language=hint_request.code_language,
+                                     all_findings=all_findings)
+    result = hint_cache.get(fingerprint_key)
+    if result is None:
+        result = pipeline(code=hint_request.code, error=hint_request.error, output=hint_request.output,
+                          status=hint_request.status, code_language=hint_request.code_language, workspace=workspace,
+                          session=session)
+        hint_cache.set(fingerprint_key, result)
+    return result
+
+
+async def get_hint_async(hint_request: HintRequest) -> tuple[str, int]:
+    """Returns the (hint_text, status_code) of a hint request, analysing the workspace on the worker processes.
+
+    Called after get_cached_hint missed the memory of the cache. Computing the fingerprint would parse the workspace
+    on the event loop, so only the raw request key is looked up in the persistent store, in a thread. Requests whose
+    error message identifies the error are handled in a thread as well, their analysis is cheaper than the round trip
+    to a worker. Raises WorkerPoolBusyError when too many requests are waiting for a worker.
+    """
+    _start_handling(hint_request)
+    if not needs_silent_error_analysis(error_message=hint_request.error, status=hint_request.status,
+                                       code_language=hint_request.code_language):
+        return await run_in_threadpool(get_hint, hint_request)
+    raw_key = raw_request_cache_key(code=hint_request.code, error=hint_request.error, status=hint_request.status,
+                                    code_language=hint_request.code_language)
+    if hint_cache.store is None:
+        # The memory is the only tier of the cache, and get_cached_hint already missed it
+        hint_cache.record_miss()
+    else:
+        # A read of the store can wait for the lock of a writer, which must not stall the event loop
+        cached_result = await run_in_threadpool(hint_cache.get, raw_key)
+        if cached_result is not None:
+            return cached_result
+
+    async def analyse():
+        fingerprint, result = await run_in_worker_pool(run_fingerprinted_hint_pipeline, code=hint_request.code,
+                                                       error=hint_request.error, output=hint_request.output,
+                                                       status=hint_request.status,
+                                                       code_language=hint_request.code_language)
+        store_hint_result(raw_key=raw_key, fingerprint=fingerprint, hint_request=hint_request, result=result)
+        return result
+
+    # Concurrent identical requests wait for the same worker process instead of each taking a place in its queue
+    try:
+        return await hint_flights.do_async(raw_key, analyse)
+    except WorkspaceTooComplexError as error:
+        return workspace_too_complex_result(error)
+
+
+def _start_handling(hint_request: HintRequest) -> None:
+    """Mark the end of the validation of a timed request, its stages are labelled with its code language."""
+    timings = current_request_timings()
+    if timings is not None:
+        timings.start_handling(hint_request.code_language)
+
+
+def store_hint_result(raw_key: str, fingerprint: str, hint_request: HintRequest, result: tuple[str, int]) -> None:
+    """Cache a result under both the raw request key and the fingerprint key of the request."""
+    hint_cache.set(raw_key, result)
+    hint_cache.set(hint_cache_key(fingerprint=fingerprint, error=hint_request.error, status=hint_request.status,
+                                  code_language=hint_request.code_language), result)
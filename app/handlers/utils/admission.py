@@ -0,0 +1,119 @@
+"""Admission control of hint requests, so an overloaded service rejects requests quickly instead of slowing down."""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+
+from app import config
+from app.handlers.error_identifier.identify_error import needs_silent_error_analysis
+from app.handlers.utils.metrics import timed_stage
+from app.schemas.hint_request import HintRequest
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is not admitted because its budget is exhausted."""
+
+
+class AdmissionBudget:
+    """Limit on the number of requests of a kind that run at once, with a bounded queue in front of it.
+
+    Requests that find the queue full, or that wait longer than the maximum queue wait, are rejected right away. The
+    budget lives on the event loop, so requests wait there instead of in the threadpool, which only gets the admitted
+    requests. A maximum concurrency of 0 disables the limit.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, max_queue_wait: float):
+        """Initialize the budget."""
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.running = 0
+        # Futures of the waiting requests, a finished request hands its slot to the first one
+        self._waiters = deque()
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_queue_timeout = 0
+
+    @asynccontextmanager
+    async def admit(self):
+        """Run the with block once the request is admitted, raises AdmissionRejectedError if it is not."""
+        if self.max_concurrency <= 0:
+            yield
+            return
+        # The wait in the queue is a stage of its own, so an overloaded service does not look like slow validation
+        with timed_stage("admission"):
+            await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        """Take a slot, waiting in the queue for at most the maximum queue wait."""
+        if self.running < self.max_concurrency and not self._waiters:
+            self.running += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            raise AdmissionRejectedError(f"The queue of {self.name} requests is full.")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the wait ended, pass it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(error, asyncio.CancelledError):
+                raise
+            self.shed_queue_timeout += 1
+            raise AdmissionRejectedError(f"A {self.name} request waited too long to be admitted.") from None
+        self.admitted += 1
+
+    def _release(self) -> None:
+        """Hand the slot to the first waiting request, or free it if nobody is waiting."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def stats(self) -> dict:
+        """Returns the load of the budget and the number of admitted and shed requests."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_queue_wait": self.max_queue_wait,
+            "running": self.running,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_queue_timeout": self.shed_queue_timeout,
+        }
+
+
+# Requests with a real error only classify the error message, requests with a possible silent error analyse the XML
+cheap_requests = AdmissionBudget("cheap", max_concurrency=config.ADMISSION_CHEAP_MAX_CONCURRENCY,
+                                 max_queue=config.ADMISSION_CHEAP_MAX_QUEUE,
+                                 max_queue_wait=config.ADMISSION_MAX_QUEUE_WAIT)
+expensive_requests = AdmissionBudget("expensive", max_concurrency=config.ADMISSION_EXPENSIVE_MAX_CONCURRENCY,
+                                     max_queue=config.ADMISSION_EXPENSIVE_MAX_QUEUE,
+                                     max_queue_wait=config.ADMISSION_MAX_QUEUE_WAIT)
+
+
+def admission_budget_for(hint_request: HintRequest, all_findings: bool = False) -> AdmissionBudget:
+    """Returns the budget a hint request is admitted on, decided from its error message without parsing the code."""
+    if needs_silent_error_analysis(error_message=hint_request.error, status=hint_request.status,
+                                   code_language=hint_request.code_language, all_findings=all_findings):
+        return expensive_requests
+    return cheap_requests
+
+
+def admission_stats() -> dict:
+    """Returns the stats of every budget."""
+    return {budget.name: budget.stats() for budget in (cheap_requests, expensive_requests)}
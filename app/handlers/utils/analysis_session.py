@@ -0,0 +1,136 @@
+"""Analysis sessions that let an editor resubmit an edited workspace without analysing it again as a whole."""
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+from app import config
+from app.handlers.utils.workspace import BLOCK_TAG, Workspace
+
+
+class AnalysisSession:
+    """The last workspace analysed in a session, with the verdicts of the rules that can be reused for the next one.
+
+    Editors resubmit the whole workspace after every edit, but an edit only changes one stack of blocks. Stacks are
+    matched on their structural fingerprint, which is computed for the hint cache anyway, so finding the unchanged
+    stacks costs nothing extra. The blocks of an unchanged stack keep the rejections of the rules that only look at the
+    subtree of a block, the blocks of a changed stack are analysed again.
+    """
+
+    def __init__(self):
+        """Initialize the session."""
+        # Held while a workspace of the session is analysed, the editor may send overlapping requests
+        self.lock = threading.Lock()
+        self.workspace = None
+        # Stack fingerprint to the (rule error name, block position) rejections in the stack
+        self._rejections = {}
+        self._positions = {}
+        self.reused = 0
+
+    def workspace_for(self, code: str) -> Workspace:
+        """Returns the last workspace of the session if the code did not change, with its parse and indexes."""
+        if self.workspace is None or self.workspace.code != code:
+            self.workspace = Workspace(code)
+        return self.workspace
+
+    def update(self, workspace: Workspace) -> None:
+        """Diff the workspace against the last one of the session and make it the last one."""
+        rejections = {}
+        positions = {}
+        for stack, stack_fingerprint in workspace.top_level_fingerprints.items():
+            if stack.tag != BLOCK_TAG:
+                continue
+            # Stacks with the same fingerprint have the same blocks at the same positions, so they share verdicts
+            rejections[stack_fingerprint] = self._rejections.get(stack_fingerprint, set())
+            for position, block in enumerate(stack.iter(BLOCK_TAG)):
+                positions[block] = (stack_fingerprint, position)
+        # Stacks that are gone are forgotten, so the session never outgrows the workspace
+        self._rejections = rejections
+        self._positions = positions
+
+    def is_rejected(self, error_name: str, block: ET.Element) -> bool:
+        """Returns True if the rule rejected the block before and its stack did not change since."""
+        position = self._positions.get(block)
+        if position is None or (error_name, position[1]) not in self._rejections[position[0]]:
+            return False
+        self.reused += 1
+        return True
+
+    def record(self, error_name: str, block: ET.Element, confirmed: bool) -> None:
+        """Record the verdict of a rule on a block of the current workspace."""
+        position = self._positions.get(block)
+        if position is None:
+            return
+        rejections = self._rejections[position[0]]
+        if confirmed:
+            rejections.discard((error_name, position[1]))
+        else:
+            rejections.add((error_name, position[1]))
+
+
+class AnalysisSessionStore:
+    """Thread-safe LRU store of analysis sessions with a size bound, a length bound and an idle timeout.
+
+    A session keeps the parsed tree of its workspace, so the total length of the workspaces of the sessions is bounded
+    as well as their number.
+    """
+
+    def __init__(self, max_size: int, idle_ttl: float, max_length: int = 0):
+        """Initialize the store."""
+        self.max_size = max_size
+        self.max_length = max_length
+        self.idle_ttl = idle_ttl
+        self._sessions = OrderedDict()
+        self._length = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str, code_length: int = 0) -> AnalysisSession:
+        """Returns the session with the given id, a new session if it does not exist or was idle for too long.
+
+        The session is accounted with the length of the code it is about to analyse, which becomes its workspace.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._length -= entry[2]
+                if entry[0] <= now:
+                    self.expirations += 1
+                    entry = None
+            session = entry[1] if entry is not None else AnalysisSession()
+            if 0 < self.max_length < code_length:
+                # A workspace over the length bound alone does not push out other sessions, its session only serves
+                # this request
+                self.evictions += entry is not None
+            elif self.max_size > 0:
+                self._sessions[session_id] = (now + self.idle_ttl, session, code_length)
+                self._length += code_length
+                while len(self._sessions) > self.max_size or 0 < self.max_length < self._length:
+                    self._length -= self._sessions.popitem(last=False)[1][2]
+                    self.evictions += 1
+            return session
+
+    def clear(self) -> None:
+        """Remove all sessions, the counters are kept."""
+        with self._lock:
+            self._sessions.clear()
+            self._length = 0
+
+    def stats(self) -> dict:
+        """Returns the size, the length of the workspaces and the eviction and expiration counters of the store."""
+        with self._lock:
+            return {
+                "size": len(self._sessions),
+                "max_size": self.max_size,
+                "length": self._length,
+                "max_length": self.max_length,
+                "idle_ttl": self.idle_ttl,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+analysis_sessions = AnalysisSessionStore(max_size=config.HINT_SESSION_MAX_COUNT, idle_ttl=config.HINT_SESSION_IDLE_TTL,
+                                         max_length=config.HINT_SESSION_MAX_LENGTH)
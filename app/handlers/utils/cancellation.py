@@ -0,0 +1,42 @@
+"""Cooperative cancellation of the analysis of a workspace that is no longer needed or takes too long."""
+import time
+
+
+class AnalysisCancelledError(Exception):
+    """Raised inside the analysis of a workspace when it was cancelled."""
+
+
+class WorkspaceTooComplexError(Exception):
+    """Raised when a workspace is too large to be analysed, or its analysis ran out of its time budget."""
+
+
+class CancellationToken:
+    """Flag shared between the code that starts an analysis and the analysis itself, with an optional time budget.
+
+    A running analysis cannot be interrupted from the outside, so the detectors check the token while they walk the
+    workspace and stop at the next check once it is cancelled or its time budget has run out.
+    """
+
+    def __init__(self):
+        """Initialize the token."""
+        # A plain attribute is enough, setting it is atomic and checking it is cheaper than an Event
+        self.cancelled = False
+        # Monotonic time after which the analysis is over its budget, None for no budget
+        self.deadline = None
+        self.time_budget = None
+
+    def cancel(self) -> None:
+        """Cancel the analysis, it stops at its next check."""
+        self.cancelled = True
+
+    def limit_time(self, time_budget: float) -> None:
+        """Give the analysis time_budget seconds from now, 0 removes the limit."""
+        self.time_budget = time_budget
+        self.deadline = time.monotonic() + time_budget if time_budget > 0 else None
+
+    def check(self) -> None:
+        """Raise AnalysisCancelledError if the analysis was cancelled, WorkspaceTooComplexError if it is over budget."""
+        if self.cancelled:
+            raise AnalysisCancelledError("The analysis was cancelled.")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise WorkspaceTooComplexError(f"Its analysis takes longer than {self.time_budget:g} seconds.")
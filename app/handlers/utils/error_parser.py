@@ -0,0 +1,104 @@
+"""Parses tracebacks and compiler output from the end, without splitting the whole error message into lines."""
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Union
+
+from app import config
+
+# Number of lines at the end of the error message that the hint generators look at
+TAIL_LINE_COUNT = 3
+
+PYTHON_FRAME = re.compile(r'^\s*File "(?P<file>[^"]*)", line (?P<line>\d+)(?:, in (?P<name>.+))?$')
+PYTHON_EXCEPTION = re.compile(r'^(?P<type>[A-Za-z_][\w.]*):(?:\s|$)')
+ARDUINO_DIAGNOSTIC = re.compile(
+    r'^(?P<file>.+?):(?P<line>\d+):(?:\d+:)? (?P<kind>fatal error|error|warning): (?P<message>.*)$')
+WHITESPACE = " \t\r\n\f\v"
+
+
+@dataclass
+class ErrorFrame:
+    """A location in the program that the error message refers to."""
+    file: str
+    line_number: int
+    name: Union[str, None] = None
+
+
+@dataclass
+class ParsedError:
+    """Structured information from the end of an error message."""
+    statement: str = ""
+    exception_type: Union[str, None] = None
+    line_number: Union[int, None] = None
+    frames: list = field(default_factory=list)
+    tail_lines: list = field(default_factory=list)
+    truncated: bool = False
+
+    def line_from_end(self, position: int) -> str:
+        """Returns the stripped line at the given position from the end (1 is the last line), or '' if missing."""
+        if position > len(self.tail_lines):
+            return ""
+        return self.tail_lines[-position].strip()
+
+
+def parse_error(error: str, code_language: str, max_length: Union[int, None] = None) -> ParsedError:
+    """Parse the end of an error message of the given language.
+
+    Only the last `max_length` characters are looked at, ERROR_TAIL_MAX_LENGTH by default, and lines are found by
+    searching backwards, so runaway output is never copied or split as a whole.
+    """
+    if max_length is None:
+        max_length = config.ERROR_TAIL_MAX_LENGTH
+    # Ignore trailing whitespace like str.strip() did, without copying the message
+    end = len(error)
+    while end > 0 and error[end - 1] in WHITESPACE:
+        end -= 1
+    start = max(0, end - max_length)
+    parsed_error = ParsedError(truncated=start > 0)
+
+    frames = []
+    for line in _iter_lines_reversed(error, start, end):
+        if len(parsed_error.tail_lines) < TAIL_LINE_COUNT:
+            parsed_error.tail_lines.insert(0, line)
+        if code_language == "Python":
+            frame_match = PYTHON_FRAME.match(line)
+            if frame_match:
+                frames.append(ErrorFrame(file=frame_match["file"], line_number=int(frame_match["line"]),
+                                         name=frame_match["name"]))
+            elif parsed_error.exception_type is None and not frames:
+                exception_match = PYTHON_EXCEPTION.match(line)
+                if exception_match:
+                    parsed_error.exception_type = exception_match["type"]
+        elif code_language == "Arduino":
+            diagnostic_match = ARDUINO_DIAGNOSTIC.match(line)
+            if diagnostic_match:
+                frames.append(ErrorFrame(file=diagnostic_match["file"], line_number=int(diagnostic_match["line"])))
+                if parsed_error.exception_type is None:
+                    parsed_error.exception_type = diagnostic_match["kind"]
+    # Frames were found from the end, report them in the order of the message
+    frames.reverse()
+    parsed_error.frames = frames
+    if frames:
+        parsed_error.line_number = frames[-1].line_number
+
+    # The failing statement is printed right above the last line of a Python traceback, and two lines above the end
+    # of the compiler output for Arduino
+    if code_language == "Python":
+        parsed_error.statement = parsed_error.line_from_end(2)
+    elif code_language == "Arduino":
+        parsed_error.statement = parsed_error.line_from_end(3).replace(";", "")
+    return parsed_error
+
+
+def _iter_lines_reversed(text: str, start: int, end: int) -> Iterator[str]:
+    """Yield the lines of text[start:end] from the last to the first.
+
+    A line cut off by `start` is skipped, unless `start` is the beginning of the text.
+    """
+    while end >= start:
+        newline = text.rfind("\n", start, end)
+        if newline == -1:
+            if start == 0:
+                yield text[:end]
+            return
+        yield text[newline + 1:end]
+        end = newline
@@ -0,0 +1,102 @@
+"""Canonical form and structural fingerprint of Blockly workspaces.
+
+Submissions that only differ in block ids, block coordinates, attribute order or indentation get identical hints, so
+they get the same canonical form and fingerprint.
+"""
+import hashlib
+import xml.etree.ElementTree as ET
+
+# Attributes that only describe the layout of the workspace in the editor
+LAYOUT_ATTRIBUTES = frozenset({"id", "x", "y"})
+
+
+def canonicalize_workspace(code: str) -> str:
+    """Returns the canonical XML of a workspace, without layout attributes and with sorted attributes.
+
+    Every element is rebuilt from its canonical parts, so the canonical XML and the fingerprint follow the same rules.
+    """
+    root = ET.fromstring(code)
+    for element in root.iter():
+        # The parts after the tag and the number of children
+        parts = iter(_canonical_parts([element])[2:])
+        attributes = {}
+        element.text = element.tail = None
+        for part in parts:
+            if part[0] == "@":
+                attributes[part[1:]] = next(parts)
+            elif part[0] == "#":
+                element.text = part[1:]
+            else:
+                element.tail = part[1:]
+        element.attrib.clear()
+        element.attrib.update(attributes)
+    return ET.tostring(root, encoding="unicode")
+
+
+def structural_fingerprint(root: ET.Element) -> str:
+    """Returns a hash of the canonical form of a parsed workspace."""
+    return structural_fingerprints(root)[0]
+
+
+def structural_fingerprints(root: ET.Element) -> tuple[str, dict]:
+    """Returns the structural fingerprint of a parsed workspace and the fingerprints of its top level elements.
+
+    The fingerprint of the workspace is a hash of its root element and the fingerprints of the top level elements, so
+    both are computed in a single walk over the tree.
+    """
+    parts = _canonical_parts(root.iter(), skip_children=True)
+    element_fingerprints = {}
+    for element in root:
+        element_fingerprint = _hash_parts(_canonical_parts(element.iter()))
+        element_fingerprints[element] = element_fingerprint
+        parts.append(element_fingerprint)
+    return _hash_parts(parts), element_fingerprints
+
+
+def workspace_fingerprint(code: str) -> str:
+    """Returns the structural fingerprint of a workspace, falling back to a hash of the raw code if it is no XML."""
+    try:
+        root = ET.fromstring(code)
+    except ET.ParseError:
+        return raw_fingerprint(code)
+    return structural_fingerprint(root)
+
+
+def raw_fingerprint(code: str) -> str:
+    """Returns a hash of code that could not be parsed as a workspace."""
+    return "raw:" + hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _canonical_parts(elements, skip_children: bool = False) -> list:
+    """Returns the canonical parts of the elements of a pre-order walk, or only of its first element."""
+    parts = []
+    append = parts.append
+    # The pre-order sequence of elements together with their number of children fully determines the tree, so no
+    # explicit stack is needed to encode the nesting. Every part is prefixed with its kind to keep the encoding
+    # unambiguous. This loop runs for every request, so the canonical attribute and text rules are inlined here, and
+    # only here: canonicalize_workspace rebuilds the elements from their parts.
+    for element in elements:
+        append("<" + element.tag)
+        append(str(len(element)))
+        attrib = element.attrib
+        if attrib:
+            for name in sorted(attrib):
+                if name not in LAYOUT_ATTRIBUTES:
+                    append("@" + name)
+                    append(attrib[name])
+        text = element.text
+        if text is not None and (len(element) == 0 or text.strip()):
+            append("#" + text)
+        tail = element.tail
+        if tail is not None and tail.strip():
+            append("$" + tail)
+        if skip_children:
+            break
+    return parts
+
+
+def _hash_parts(parts: list) -> str:
+    """Returns a hash of canonical parts."""
+    # XML text can not contain NUL characters, which makes it a safe separator
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
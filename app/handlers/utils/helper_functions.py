@@ -1,32 +1,34 @@
 """Helper functions for the handlers module."""
 import xml.etree.ElementTree as ET
+from typing import Union
 
+from app.handlers.utils.workspace import Workspace
 
-def find_parent_with_type(root, child):
-    """Find the parent of a child element with a 'type' attribute."""
-    for elem in root.iter():
-        for subelem in elem:
-            if subelem == child:
-                # If this element has a 'type' attribute, return it
-                if 'type' in elem.attrib:
-                    return elem
-                else:
-                    # Recursively search up the tree
-                    return find_parent_with_type(root, elem)
-    return None
 
+def find_parent_with_type(workspace: Workspace, child: ET.Element) -> Union[ET.Element, None]:
+    """Find the nearest ancestor of a child element with a 'type' attribute."""
+    parent = workspace.parent(child)
+    # Walk up the parent index until an element with a 'type' attribute is found
+    while parent is not None and 'type' not in parent.attrib:
+        parent = workspace.parent(parent)
+    return parent
 
-def check_variable_type(variable_name: str, root: ET, ns: dict) -> str:
+
+def find_ancestors_with_type(workspace: Workspace, child: ET.Element) -> list:
+    """Find all ancestors of a child element with a 'type' attribute, nearest first."""
+    ancestors = []
+    parent = find_parent_with_type(workspace, child)
+    while parent is not None:
+        ancestors.append(parent)
+        parent = find_parent_with_type(workspace, parent)
+    return ancestors
+
+
+def find_usages_outside_procedure(workspace: Workspace, variable_name: str, procedure: ET.Element) -> list:
+    """Returns the usages of a variable that are not enclosed by the given procedure definition."""
+    return [usage for usage in workspace.variable_usages(variable_name) if procedure not in usage.procedures]
+
+
+def check_variable_type(variable_name: str, workspace: Workspace) -> str:
     """Returns the type of the variable."""
-    variable_blocks = root.findall('.//ns:block[@type="variables_set"]', ns)
-    for block in variable_blocks:
-        # Check if this `variables_set` block is setting the specified variable
-        var_field = block.find(".//ns:field[@name='VAR']", ns)
-        if var_field is not None and var_field.text == variable_name:
-            # Check the type of the assigned value block
-            value_block = block.find(".//ns:value/ns:block", ns)
-            if value_block is not None:
-                block_type = value_block.get("type")
-                return block_type
-
-    return "none_type"
+    return workspace.symbol_table.resolve_type(variable_name)
@@ -0,0 +1,160 @@
+"""In-process LRU cache with a time to live for generated hints, optionally backed by a persistent store."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Union
+
+from app import config
+from app.handlers.utils.persistent_hint_cache import SQLiteHintStore
+
+
+def hint_cache_key(fingerprint: str, error: str, status: str, code_language: str, all_findings: bool = False) -> str:
+    """Returns a content hash of the parts of a hint request that determine the hint.
+
+    The code is represented by its workspace fingerprint, so layout-only changes hit the same entry. The hints of
+    every finding are cached apart from the hint of the first one.
+    """
+    return _hash_parts("fingerprint", _mode(all_findings), fingerprint, error, status, code_language)
+
+
+def raw_request_cache_key(code: str, error: str, status: str, code_language: str, all_findings: bool = False) -> str:
+    """Returns a content hash of the raw hint request.
+
+    Computing it needs no parsing, so it is checked before the fingerprint key and is the only key available to
+    paths that must not parse the workspace in the serving thread.
+    """
+    return _hash_parts("raw", _mode(all_findings), code, error, status, code_language)
+
+
+def _mode(all_findings: bool) -> str:
+    """Returns the part of a cache key that tells the hint of the first finding from the hints of all findings."""
+    return "all" if all_findings else "first"
+
+
+def _hash_parts(*parts: str) -> str:
+    """Returns a hash of the parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        # Length prefix every part so that different splits of the same text never collide
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class HintCache:
+    """Thread-safe LRU cache of (hint_text, status_code) results with a size bound and a time to live.
+
+    With a persistent store, the entries missing in memory are looked up in the store, and every result is written to
+    both. The store is shared by the server processes and survives restarts.
+    """
+
+    def __init__(self, max_size: int, ttl: float, store: Union[SQLiteHintStore, None] = None):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = store
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, count_miss: bool = True,
+            memory_only: bool = False) -> Union[tuple[str, int], None]:
+        """Returns the cached result for the key, or None if it is missing or expired.
+
+        Lookups that are followed by a lookup under another key of the same request do not count their miss. A
+        lookup in memory only never reads the store, so it does not block on disk and is cheap enough for the event
+        loop, and it does not count its miss either.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if memory_only:
+                return None
+            if self.store is None:
+                self.misses += count_miss
+                return None
+        # The store is read outside of the lock, other threads only wait for the memory
+        result = self.store.get(key)
+        if result is None:
+            with self._lock:
+                self.misses += count_miss
+            return None
+        self._set_in_memory(key, result)
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def record_miss(self) -> None:
+        """Count the miss of a request whose lookups were all in memory only."""
+        with self._lock:
+            self.misses += 1
+
+    def contains(self, key: str) -> bool:
+        """Returns True if a result is cached for the key, without refreshing it or counting a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True
+        return self.store is not None and self.store.get(key) is not None
+
+    def set(self, key: str, result: tuple[str, int]) -> None:
+        """Store a result, evicting the least recently used entries when the cache is full."""
+        self._set_in_memory(key, result)
+        if self.store is not None:
+            self.store.set(key, result)
+
+    def _set_in_memory(self, key: str, result: tuple[str, int]) -> None:
+        """Store a result in memory only."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries, the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict:
+        """Returns the size and the hit, miss, eviction and expiration counters of the cache and of its store."""
+        store_stats = self.store.stats() if self.store is not None else None
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "store": store_stats,
+            }
+
+
+def _create_hint_store() -> Union[SQLiteHintStore, None]:
+    """Returns the persistent store of the hint cache, or None if it is not configured."""
+    if not config.HINT_CACHE_PATH:
+        return None
+    return SQLiteHintStore(path=config.HINT_CACHE_PATH, max_size=config.HINT_CACHE_PERSISTENT_MAX_SIZE,
+                           ttl=config.HINT_CACHE_TTL)
+
+
+hint_cache = HintCache(max_size=config.HINT_CACHE_MAX_SIZE, ttl=config.HINT_CACHE_TTL, store=_create_hint_store())
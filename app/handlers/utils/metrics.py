@@ -0,0 +1,155 @@
+"""Timings of the stages of hint requests, exposed as Prometheus histograms."""
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Union
+
+# Upper bounds in seconds of the buckets of the histograms, from a cache hit to a pathological workspace
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Thread-safe Prometheus histogram with labels."""
+
+    def __init__(self, name: str, documentation: str, label_names: tuple, buckets: tuple = DEFAULT_BUCKETS):
+        """Initialize the histogram."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # Label values to [count per bucket, sum, count]
+        self._series = {}
+
+    def observe(self, value: float, label_values: tuple) -> None:
+        """Count a single observation."""
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        """Returns the histogram in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(label_values, list(counts), total, count)
+                      for label_values, (counts, total, count) in sorted(self._series.items())]
+        for label_values, counts, total, count in series:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values))
+            # Prometheus buckets are cumulative, the observations are counted in their smallest bucket only
+            cumulative = 0
+            for upper_bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{upper_bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+stage_durations = Histogram(
+    name="hint_request_stage_duration_seconds",
+    documentation="Duration of the stages of hint requests, nested stages are not included in the outer stage.",
+    label_names=("stage", "code_language", "error_name", "status"),
+)
+
+
+class RequestTimings:
+    """Durations of the stages of a single request, a stage excludes the stages nested in it.
+
+    Stages of the same name add up, e.g. a workspace that is parsed twice in a request.
+    """
+
+    def __init__(self):
+        """Initialize the timings, the request starts now."""
+        self.started_at = time.perf_counter()
+        self.durations = {}
+        self.code_language = None
+        self.error_name = None
+        # Time spent in the stages nested in each open stage, the first item is the request itself
+        self._nested = [0.0]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the stage that runs in the with block."""
+        started_at = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            nested = self._nested.pop()
+            self._nested[-1] += elapsed
+            self.durations[name] = self.durations.get(name, 0.0) + elapsed - nested
+
+    def start_handling(self, code_language: str) -> None:
+        """Mark that the endpoint received the validated request, everything before it counts as validation.
+
+        Only the first call counts, the cache lookup of the endpoint and the analysis after admission both mark it.
+        """
+        if self.code_language is not None:
+            return
+        self.code_language = code_language
+        # Reading and validating the body, waiting for admission is timed as its own stage
+        self.durations["validation"] = time.perf_counter() - self.started_at
+
+    def finish(self, status_code: int) -> None:
+        """Record the stages of a request that was handled by a hint endpoint in the histograms."""
+        self.durations["total"] = time.perf_counter() - self.started_at
+        if self.code_language is None:
+            return
+        error_name = self.error_name or "none"
+        for stage, duration in self.durations.items():
+            stage_durations.observe(duration, (stage, self.code_language, error_name, str(status_code)))
+
+    def server_timing(self) -> str:
+        """Returns the durations as the value of a Server-Timing header, in milliseconds."""
+        return ", ".join(f"{stage};dur={duration * 1000:.3f}" for stage, duration in self.durations.items())
+
+
+# Timings of the request handled in the current context, None outside of a timed request
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """Start timing the request of the current context."""
+    timings = RequestTimings()
+    _request_timings.set(timings)
+    return timings
+
+
+def current_request_timings() -> Union[RequestTimings, None]:
+    """Returns the timings of the request of the current context, or None if it is not timed."""
+    return _request_timings.get()
+
+
+def record_error_name(error_name: str) -> None:
+    """Label the timings of the request of the current context with the error that was identified."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.error_name = error_name
+
+
+def timed_stage(name: str):
+    """Returns a context manager that times a stage of the current request, a no-op outside of a timed request."""
+    timings = _request_timings.get()
+    if timings is None:
+        return nullcontext()
+    return timings.stage(name)
+
+
+def render_metrics() -> str:
+    """Returns all metrics in the Prometheus text exposition format."""
+    return stage_durations.render()
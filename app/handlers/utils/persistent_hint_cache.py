@@ -0,0 +1,162 @@
+"""Persistent store of hint results on local disk, shared by the server processes and kept across restarts."""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the format of the stored results changes
+STORAGE_FORMAT_VERSION = 1
+# The sources that decide which hint a request gets, a change to any of them invalidates the stored hints
+HINT_SOURCES_DIRECTORY = Path(__file__).resolve().parents[1]
+# Number of writes between two eviction passes, counting the entries of the store is not free
+EVICTION_INTERVAL = 128
+
+
+def hint_sources_version() -> str:
+    """Returns a version that changes whenever the storage format or the source of the identifiers or generators does."""
+    digest = hashlib.sha256(str(STORAGE_FORMAT_VERSION).encode("utf-8"))
+    for source in sorted(HINT_SOURCES_DIRECTORY.rglob("*.py")):
+        digest.update(source.relative_to(HINT_SOURCES_DIRECTORY).as_posix().encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class SQLiteHintStore:
+    """Hint results in an SQLite database on local disk, with a size bound, a time to live and a version.
+
+    Every thread gets its own connection, and the database is in write-ahead logging mode, so the worker processes of
+    the server can read and write it at the same time. Entries of another version are never returned, so a deploy
+    that changes the hints does not serve the hints of the previous one. Expiry uses the wall clock, since the
+    entries outlive the process.
+    """
+
+    def __init__(self, path: str, max_size: int, ttl: float, version: Union[str, None] = None):
+        """Initialize the store, creating the database if it does not exist."""
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = version if version is not None else hint_sources_version()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.execute("CREATE TABLE IF NOT EXISTS hints (key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+                           "expires_at REAL NOT NULL, result TEXT NOT NULL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS hints_expires_at ON hints (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread, opened on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit, every statement is its own transaction and waits for the lock of other writers
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Losing the last writes on a power failure only costs a few analyses
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Union[tuple[str, int], list, None]:
+        """Returns the stored result for the key, or None if it is missing, expired, of another version or unreadable."""
+        try:
+            row = self._connection().execute("SELECT result FROM hints WHERE key = ? AND version = ? AND expires_at > ?",
+                                             (key, self.version, time.time())).fetchone()
+        except sqlite3.Error:
+            self._count_error("read")
+            return None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _decode_result(row[0])
+
+    def set(self, key: str, result: Union[tuple[str, int], list]) -> None:
+        """Store a result, the oldest entries are evicted once in a while when the store is full."""
+        if self.max_size <= 0:
+            return
+        try:
+            self._connection().execute("INSERT OR REPLACE INTO hints (key, version, expires_at, result) "
+                                       "VALUES (?, ?, ?, ?)",
+                                       (key, self.version, time.time() + self.ttl, json.dumps(result)))
+        except sqlite3.Error:
+            self._count_error("write")
+            return
+        with self._lock:
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction < EVICTION_INTERVAL:
+                return
+            self._writes_since_eviction = 0
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the expired entries and the entries of other versions, then the oldest ones above the size bound.
+
+        Every entry lives equally long, so the entries that expire first are the ones written first.
+        """
+        try:
+            connection = self._connection()
+            removed = connection.execute("DELETE FROM hints WHERE expires_at <= ? OR version != ?",
+                                         (time.time(), self.version)).rowcount
+            size = connection.execute("SELECT COUNT(*) FROM hints").fetchone()[0]
+            if size > self.max_size:
+                removed += connection.execute("DELETE FROM hints WHERE key IN (SELECT key FROM hints "
+                                              "ORDER BY expires_at LIMIT ?)", (size - self.max_size,)).rowcount
+        except sqlite3.Error:
+            self._count_error("evict")
+            return
+        with self._lock:
+            self.evictions += removed
+
+    def clear(self) -> None:
+        """Remove all entries, the counters are kept."""
+        try:
+            self._connection().execute("DELETE FROM hints")
+        except sqlite3.Error:
+            self._count_error("clear")
+
+    def _count_error(self, operation: str) -> None:
+        """Count a failed operation, a broken store only costs cache misses and must not fail the request."""
+        logger.warning("Failed to %s the persistent hint cache.", operation, exc_info=True)
+        with self._lock:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        """Returns the size, the version and the hit, miss, eviction and error counters of the store."""
+        try:
+            size = self._connection().execute("SELECT COUNT(*) FROM hints WHERE version = ?",
+                                              (self.version,)).fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        with self._lock:
+            return {
+                "path": self.path,
+                "version": self.version,
+                "size": size,
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+
+def _decode_result(encoded: str) -> Union[tuple[str, int], list]:
+    """Returns a stored result in the shape the pipeline returned it, JSON turns its tuples into lists."""
+    result = json.loads(encoded)
+    if result and isinstance(result[0], list):
+        # The hints of every finding
+        return [tuple(hint) for hint in result]
+    return tuple(result)
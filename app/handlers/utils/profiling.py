@@ -0,0 +1,110 @@
+"""Opt-in profiling of the analysis of hint requests, to reproduce and optimise slow workspaces offline."""
+import cProfile
+import itertools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from app import config
+from app.schemas.hint_request import HintRequest
+
+logger = logging.getLogger(__name__)
+
+# Request header that asks for the analysis of the request to be profiled
+PROFILE_HEADER = "X-Profile-Analysis"
+# Response header with the name of the written profile
+PROFILE_NAME_HEADER = "X-Profile-Name"
+
+# Only one profiler can be active at a time, requests that come in while another one is profiled are not profiled
+_profiler_lock = threading.Lock()
+_analysis_counter = itertools.count(1)
+
+
+class ProfileRequest:
+    """Asks for the analysis of the current request to be profiled, and gets the name of the written profile."""
+
+    def __init__(self):
+        """Initialize the profile request."""
+        self.profile_name = None
+
+
+# Profile request of the request handled in the current context, None if the header was not sent
+_profile_request = ContextVar("profile_request", default=None)
+
+
+def request_profile() -> ProfileRequest:
+    """Ask for the analysis of the request of the current context to be profiled."""
+    profile_request = ProfileRequest()
+    _profile_request.set(profile_request)
+    return profile_request
+
+
+@contextmanager
+def profiled_analysis(hint_request: HintRequest):
+    """Profile the analysis in the with block if profiling is enabled and the request asked for it or was sampled.
+
+    The profile is written together with the hint request, so the analysis can be reproduced offline. Sampled analyses
+    that were faster than PROFILING_MIN_DURATION are not written, only the slow ones are worth keeping.
+    """
+    profile_request = _profile_request.get()
+    if not config.PROFILING_ENABLED or not _should_profile(profile_request) or not _profiler_lock.acquire(False):
+        yield
+        return
+    try:
+        profiler = cProfile.Profile()
+        started_at = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - started_at
+            if profile_request is not None:
+                profile_request.profile_name = _write_profile(profiler, hint_request, duration)
+            elif duration >= config.PROFILING_MIN_DURATION:
+                _write_profile(profiler, hint_request, duration)
+    finally:
+        _profiler_lock.release()
+
+
+def _should_profile(profile_request) -> bool:
+    """Returns True if the request asked for a profile or is the 1 in PROFILING_SAMPLE_RATE that is sampled."""
+    if profile_request is not None:
+        return True
+    return config.PROFILING_SAMPLE_RATE > 0 and next(_analysis_counter) % config.PROFILING_SAMPLE_RATE == 0
+
+
+def _write_profile(profiler: cProfile.Profile, hint_request: HintRequest, duration: float) -> str:
+    """Write the profile and the hint request to the profile directory, and remove the oldest profiles."""
+    directory = Path(config.PROFILING_DIRECTORY)
+    profile_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000_000:09d}"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{profile_name}.prof")
+        request = {
+            "code": hint_request.code,
+            "output": hint_request.output,
+            "error": hint_request.error,
+            "status": hint_request.status,
+            "code_language": hint_request.code_language,
+        }
+        with open(directory / f"{profile_name}.json", "w", encoding="utf-8") as request_file:
+            json.dump({"duration_seconds": duration, "hint_request": request}, request_file)
+        _rotate_profiles(directory)
+    except OSError:
+        # A full disk must not fail the request that was profiled
+        logger.warning("Failed to write the profile %s.", profile_name, exc_info=True)
+    return profile_name
+
+
+def _rotate_profiles(directory: Path) -> None:
+    """Remove the oldest profiles and their hint requests above PROFILING_MAX_PROFILES."""
+    # The names start with the time they were written, so they sort from old to new
+    profiles = sorted(directory.glob("*.prof"))
+    for profile in profiles[:max(len(profiles) - config.PROFILING_MAX_PROFILES, 0)]:
+        profile.unlink(missing_ok=True)
+        profile.with_suffix(".json").unlink(missing_ok=True)
@@ -0,0 +1,102 @@
+"""Coalescing of concurrent identical hint requests into a single computation."""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Lets concurrent calls with the same key wait for the computation of the first one instead of repeating it.
+
+    Only calls that overlap in time are coalesced, a call that starts after the computation finished computes again
+    (usually hitting the cache that the first computation filled). Unique calls only pay for a lock and a dictionary
+    lookup. Threads and coroutines are coalesced separately, a coroutine must never block the event loop on a thread.
+    """
+
+    def __init__(self):
+        """Initialize the single flight."""
+        self._lock = threading.Lock()
+        # Key to the future of the running computation, for threads and for coroutines on the event loop
+        self._calls = {}
+        self._async_calls = {}
+        self.computations = 0
+        self.coalesced = 0
+
+    def do(self, key: str, function):
+        """Returns the result of function(), shared with the concurrent calls of the same key.
+
+        Exceptions are shared as well, every call of the same computation raises the same exception.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                self.computations += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(self, key: str, coroutine_function):
+        """Returns the result of await coroutine_function(), shared with the concurrent calls of the same key.
+
+        The computation runs in its own task, so a call that is cancelled, including the first one, does not cancel it
+        for the others. It is only cancelled once every call waiting for it was cancelled.
+        """
+        call = self._async_calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(coroutine_function())
+            # The task and the number of calls waiting for it
+            call = self._async_calls[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget_async_call(key, call))
+            self._count(coalesced=False)
+        else:
+            self._count(coalesced=True)
+        call[1] += 1
+        try:
+            return await asyncio.shield(call[0])
+        finally:
+            call[1] -= 1
+            if call[1] == 0 and not call[0].done():
+                call[0].cancel()
+
+    def _forget_async_call(self, key: str, call: list) -> None:
+        """Remove a finished computation, a call that starts after it computes again."""
+        if self._async_calls.get(key) is call:
+            del self._async_calls[key]
+        if not call[0].cancelled():
+            # Mark the exception as retrieved, there may not be any call left to retrieve it
+            call[0].exception()
+
+    def _count(self, coalesced: bool) -> None:
+        """Count a computation or a coalesced call, the counters are shared by the threads and the event loop."""
+        with self._lock:
+            if coalesced:
+                self.coalesced += 1
+            else:
+                self.computations += 1
+
+    def stats(self) -> dict:
+        """Returns the number of computations, the number of calls that were coalesced and the calls in flight."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls) + len(self._async_calls),
+                "computations": self.computations,
+                "coalesced": self.coalesced,
+            }
+
+
+hint_flights = SingleFlight()
@@ -0,0 +1,55 @@
+"""Symbol table with the assigned value types of every variable in a workspace."""
+import xml.etree.ElementTree as ET
+
+
+class SymbolTable:
+    """Maps every variable to the value blocks assigned to it, in assignment order."""
+
+    def __init__(self, variable_set_blocks: list, ns: dict):
+        """Build the symbol table from all `variables_set` blocks of a workspace."""
+        self.ns = ns
+        self.assignments = {}
+        for block in variable_set_blocks:
+            var_field = block.find(".//ns:field[@name='VAR']", ns)
+            value_block = block.find(".//ns:value/ns:block", ns)
+            # Assignments without a value do not give the variable a type
+            if var_field is not None and value_block is not None:
+                self.assignments.setdefault(var_field.text, []).append(value_block)
+        self._resolved_types = {}
+
+    def resolve_type(self, variable_name: str) -> str:
+        """Returns the type of the first value assigned to the variable.
+
+        Assignments of another variable (b = a) are followed until a value is found. Variables that are never assigned
+        a value, directly or through such a chain, are of type 'none_type'.
+        """
+        if variable_name in self._resolved_types:
+            return self._resolved_types[variable_name]
+        # Follow the chain of variable assignments iteratively, the visited names also resolve to the final type
+        chain = []
+        visited = set()
+        name = variable_name
+        block_type = "none_type"
+        while name not in self._resolved_types:
+            if name in visited or name not in self.assignments:
+                # Cycles like a = b, b = a never get a value either
+                block_type = "none_type"
+                break
+            chain.append(name)
+            visited.add(name)
+            value_block = self.assignments[name][0]
+            block_type = value_block.get("type")
+            if block_type != "variables_get":
+                break
+            name = self._referenced_variable(value_block)
+        else:
+            block_type = self._resolved_types[name]
+        for name in chain:
+            self._resolved_types[name] = block_type
+        self._resolved_types.setdefault(variable_name, block_type)
+        return block_type
+
+    def _referenced_variable(self, variables_get_block: ET.Element) -> str:
+        """Returns the name of the variable read by a `variables_get` block."""
+        var_field = variables_get_block.find(".//ns:field", self.ns)
+        return var_field.text if var_field is not None else None
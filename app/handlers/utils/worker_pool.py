@@ -0,0 +1,108 @@
+"""Process pool shared by the endpoints that offload the CPU heavy analysis of workspaces."""
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Union
+
+from app import config
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+# Number of jobs waiting for or running on the worker processes, shared by the event loop and the batch threads
+_queued_jobs = 0
+_queued_jobs_changed = threading.Condition()
+
+
+class WorkerPoolBusyError(Exception):
+    """Raised when the queue in front of the worker processes is full."""
+
+
+def get_process_pool() -> Union[ProcessPoolExecutor, None]:
+    """Returns the shared process pool, created on first use. Returns None if worker processes are disabled."""
+    global _process_pool
+    if config.HINT_WORKER_PROCESSES <= 0:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawn fresh interpreters, forking a process that runs the server threads is not safe
+            _process_pool = ProcessPoolExecutor(max_workers=config.HINT_WORKER_PROCESSES,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+def reset_process_pool() -> None:
+    """Drop a broken process pool, the next call to get_process_pool creates a new one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool and wait for running analyses to finish."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+def submit_to_worker_pool(function: Callable, wait_for_place: bool = False, **kwargs) -> Future:
+    """Submit a function to the worker processes, which must be enabled, and return its future.
+
+    At most HINT_WORKER_QUEUE_SIZE jobs wait for a free worker. Beyond that WorkerPoolBusyError is raised right away,
+    or with wait_for_place the calling thread waits until a job finishes.
+    """
+    _reserve_place(wait_for_place)
+    try:
+        future = get_process_pool().submit(functools.partial(function, **kwargs))
+    except BaseException:
+        _release_place()
+        raise
+    # A job keeps its place until its worker is done with it, even if its caller stopped waiting
+    future.add_done_callback(_release_place)
+    return future
+
+
+async def run_in_worker_pool(function: Callable, **kwargs):
+    """Run a function on the worker processes without blocking the event loop.
+
+    At most HINT_WORKER_QUEUE_SIZE jobs wait for a free worker, beyond that WorkerPoolBusyError is raised right away
+    instead of queueing the job. If worker processes are disabled the function runs on the default thread pool.
+    """
+    if get_process_pool() is None:
+        _reserve_place(wait=False)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(function, **kwargs))
+        finally:
+            _release_place()
+    try:
+        return await asyncio.wrap_future(submit_to_worker_pool(function, **kwargs))
+    except BrokenProcessPool:
+        reset_process_pool()
+        raise
+
+
+def _reserve_place(wait: bool) -> None:
+    """Take a place in the queue of the worker processes, raises WorkerPoolBusyError if it is full and not waiting."""
+    global _queued_jobs
+    max_jobs = max(config.HINT_WORKER_PROCESSES, 1) + config.HINT_WORKER_QUEUE_SIZE
+    with _queued_jobs_changed:
+        while _queued_jobs >= max_jobs:
+            if not wait:
+                raise WorkerPoolBusyError(f"{_queued_jobs} jobs are already waiting for the worker processes.")
+            _queued_jobs_changed.wait()
+        _queued_jobs += 1
+
+
+def _release_place(_future: Union[Future, None] = None) -> None:
+    """Give up a place in the queue of the worker processes."""
+    global _queued_jobs
+    with _queued_jobs_changed:
+        _queued_jobs -= 1
+        _queued_jobs_changed.notify_all()
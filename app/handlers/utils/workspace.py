@@ -0,0 +1,215 @@
+"""Parsed Blockly workspace shared by the error identifiers and the hint generators."""
+import xml.etree.ElementTree as ET
+from typing import NamedTuple, Union
+
+from app import config
+from app.handlers.utils.cancellation import CancellationToken, WorkspaceTooComplexError
+from app.handlers.utils.fingerprint import raw_fingerprint, structural_fingerprints
+from app.handlers.utils.metrics import timed_stage
+from app.handlers.utils.symbol_table import SymbolTable
+
+NS = {'ns': 'http://www.w3.org/1999/xhtml'}
+BLOCK_TAG = f"{{{NS['ns']}}}block"
+FIELD_TAG = f"{{{NS['ns']}}}field"
+PROCEDURE_DEFINITION_TYPES = ("procedures_defnoreturn", "procedures_defreturn")
+# Characters fed to the parser at once when the nesting depth of a workspace is counted while it is parsed
+_PARSE_CHUNK_SIZE = 64 * 1024
+
+
+class VariableUsage(NamedTuple):
+    """A single usage of a variable in the workspace."""
+    field: ET.Element
+    block: ET.Element
+    procedures: tuple
+
+
+class Workspace:
+    """Parses the Blockly XML of a request once and indexes its blocks by type and their parents.
+
+    Parsing is lazy, so requests that never look at the code (e.g. most real Python errors) do not pay for it, and are
+    not rejected by the limits on the size of the workspaces that are parsed.
+    """
+
+    def __init__(self, code: str, cancellation: Union[CancellationToken, None] = None):
+        """Initialize the workspace."""
+        self.code = code
+        self.ns = NS
+        # Checked by the detectors while they walk the workspace, so a superseded analysis stops early
+        self.cancellation = cancellation
+        self._root = None
+        self._blocks = None
+        self._blocks_by_type = None
+        self._parents = None
+        self._variable_usages = None
+        self._symbol_table = None
+        self._fingerprint = None
+        self._top_level_fingerprints = None
+
+    @property
+    def root(self) -> ET.Element:
+        """The root element of the workspace, parsed on first access."""
+        if self._root is None:
+            with timed_stage("parsing"):
+                self._root = parse_workspace(self.code)
+        return self._root
+
+    @property
+    def is_parsed(self) -> bool:
+        """Returns True if the workspace was already parsed."""
+        return self._root is not None
+
+    def check_cancellation(self) -> None:
+        """Raise if the analysis of the workspace was cancelled or ran out of its time budget."""
+        if self.cancellation is not None:
+            self.cancellation.check()
+
+    @property
+    def is_huge(self) -> bool:
+        """Returns True if the workspace is large enough to be checked for silent errors while streaming."""
+        return 0 < config.STREAMING_DETECTION_MIN_LENGTH <= len(self.code)
+
+    @property
+    def fingerprint(self) -> str:
+        """The structural fingerprint of the workspace, equal for workspaces that only differ in layout."""
+        if self._fingerprint is None:
+            with timed_stage("fingerprint"):
+                self._compute_fingerprints()
+        return self._fingerprint
+
+    @property
+    def top_level_fingerprints(self) -> dict:
+        """The structural fingerprints of the top level elements, computed together with the fingerprint."""
+        if self._top_level_fingerprints is None:
+            self.fingerprint
+        return self._top_level_fingerprints
+
+    def _compute_fingerprints(self) -> None:
+        """Compute the fingerprint of the workspace together with the fingerprints of its top level elements."""
+        if self.is_huge:
+            # Parsing a huge workspace as a whole only for its fingerprint would defeat the streaming detection
+            self._fingerprint = raw_fingerprint(self.code)
+            self._top_level_fingerprints = {}
+            return
+        try:
+            self._fingerprint, self._top_level_fingerprints = structural_fingerprints(self.root)
+        except (ET.ParseError, WorkspaceTooComplexError):
+            # A workspace over the limits only fails the requests that need its tree, e.g. not most real errors
+            self._fingerprint = raw_fingerprint(self.code)
+            self._top_level_fingerprints = {}
+
+    @property
+    def symbol_table(self) -> SymbolTable:
+        """The symbol table of the workspace, built on first access."""
+        if self._symbol_table is None:
+            self._symbol_table = SymbolTable(self.blocks_of_type("variables_set"), self.ns)
+        return self._symbol_table
+
+    def all_blocks(self) -> list:
+        """Returns all blocks in document order."""
+        if self._blocks is None:
+            self._build_index()
+        return self._blocks
+
+    def blocks_of_type(self, block_type: str) -> list:
+        """Returns all blocks of the given type in document order."""
+        if self._blocks_by_type is None:
+            self._build_index()
+        return self._blocks_by_type.get(block_type, [])
+
+    def parent(self, element: ET.Element) -> Union[ET.Element, None]:
+        """Returns the direct parent of an element, or None for the root."""
+        if self._parents is None:
+            self._build_index()
+        return self._parents.get(element)
+
+    def variable_usages(self, variable_name: str) -> list:
+        """Returns all usages of a variable in document order, tagged with their enclosing procedure definitions."""
+        if self._variable_usages is None:
+            self._build_variable_usage_index()
+        return self._variable_usages.get(variable_name, [])
+
+    def _build_index(self) -> None:
+        """Index every block by its type and every element by its parent in a single pass over the tree."""
+        blocks = []
+        blocks_by_type = {}
+        parents = {}
+        for element in self.root.iter():
+            if element.tag == BLOCK_TAG:
+                blocks.append(element)
+                block_type = element.get("type")
+                if block_type is not None:
+                    blocks_by_type.setdefault(block_type, []).append(element)
+            for child in element:
+                parents[child] = element
+        self._blocks = blocks
+        self._blocks_by_type = blocks_by_type
+        self._parents = parents
+
+    def _build_variable_usage_index(self) -> None:
+        """Index every VAR field of a block by variable name."""
+        # Procedure definitions enclosing each VAR field, a procedure only has to look at its own subtree
+        enclosing_procedures = {}
+        for procedure_type in PROCEDURE_DEFINITION_TYPES:
+            for procedure in self.blocks_of_type(procedure_type):
+                self.check_cancellation()
+                for field in procedure.findall('.//ns:block/ns:field[@name="VAR"]', self.ns):
+                    enclosing_procedures.setdefault(field, []).append(procedure)
+
+        variable_usages = {}
+        for block in self.all_blocks():
+            for field in block:
+                if field.tag == FIELD_TAG and field.get("name") == "VAR":
+                    usage = VariableUsage(field, block, tuple(enclosing_procedures.get(field, ())))
+                    variable_usages.setdefault(field.text, []).append(usage)
+        self._variable_usages = variable_usages
+
+
+def parse_workspace(code: str) -> ET.Element:
+    """Returns the root element of a workspace, raises WorkspaceTooComplexError if it is over the limits.
+
+    The nesting depth is counted from the events of the parser, which builds the tree at the same time, so a workspace
+    that is nested too deep is rejected as soon as the parser reaches the limit.
+    """
+    check_workspace_limits(code)
+    # A workspace with fewer tags than the limit cannot be nested deeper, which saves the events for most of them
+    if not 0 < config.WORKSPACE_MAX_DEPTH < code.count("<"):
+        return ET.fromstring(code)
+    root = None
+    depth = 0
+    for event, element in _parse_events(code):
+        if event == "start":
+            depth += 1
+            if depth > config.WORKSPACE_MAX_DEPTH:
+                raise nesting_too_deep_error()
+            if root is None:
+                root = element
+        else:
+            depth -= 1
+    return root
+
+
+def check_workspace_limits(code: str) -> None:
+    """Raise WorkspaceTooComplexError if a workspace is longer or has more blocks than allowed.
+
+    Only the text of the workspace is scanned, so these workspaces are rejected before they are parsed. The nesting
+    depth is checked while parsing.
+    """
+    if 0 < config.WORKSPACE_MAX_LENGTH < len(code):
+        raise WorkspaceTooComplexError(f"It has more than {config.WORKSPACE_MAX_LENGTH} characters.")
+    if 0 < config.WORKSPACE_MAX_BLOCKS < code.count("<block"):
+        raise WorkspaceTooComplexError(f"It has more than {config.WORKSPACE_MAX_BLOCKS} blocks.")
+
+
+def nesting_too_deep_error() -> WorkspaceTooComplexError:
+    """Returns the error of a workspace whose elements are nested deeper than WORKSPACE_MAX_DEPTH."""
+    return WorkspaceTooComplexError(f"It is nested more than {config.WORKSPACE_MAX_DEPTH} levels deep.")
+
+
+def _parse_events(code: str):
+    """Yields the start and end events of the elements of a workspace while it is parsed in chunks."""
+    parser = ET.XMLPullParser(events=("start", "end"))
+    for offset in range(0, len(code), _PARSE_CHUNK_SIZE):
+        parser.feed(code[offset:offset + _PARSE_CHUNK_SIZE])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
@@ -1,12 +1,38 @@
-from fastapi import FastAPI
-from app.routers import api_endpoints
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from app import config
+from app.routers import api_endpoints, live_analysis
+from app.handlers.cache_warmer import warm_hint_cache
+from app.handlers.utils.metrics import render_metrics, start_request_timings
+from app.handlers.utils.profiling import PROFILE_HEADER, PROFILE_NAME_HEADER, request_profile
+from app.handlers.utils.worker_pool import shutdown_process_pool
 from fastapi.middleware.cors import CORSMiddleware
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Cache the hints of the common submissions before the service reports ready, so the first wave of students is
+    # served from the cache. Unreadable samples only cost the warm cache, the service starts anyway.
+    if config.HINT_CACHE_WARMUP_PATH:
+        try:
+            warm_hint_cache(config.HINT_CACHE_WARMUP_PATH)
+        except (OSError, UnicodeDecodeError) as error:
+            logger.error("Could not read the samples to warm the hint cache with, starting without them: %s", error)
+    yield
+    # Stop the worker processes used for the analysis of workspaces
+    shutdown_process_pool()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
 
 # Include routers for different endpoints
 app.include_router(api_endpoints.router)
+app.include_router(live_analysis.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +42,38 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers (e.g., Authorization)
 )
 
+
+# Time the stages of every request, the hint endpoints label them with the code language and the identified error
+@app.middleware("http")
+async def time_request_stages(request: Request, call_next):
+    if not config.METRICS_ENABLED:
+        return await call_next(request)
+    timings = start_request_timings()
+    response = await call_next(request)
+    timings.finish(response.status_code)
+    if config.METRICS_SERVER_TIMING and timings.code_language is not None:
+        response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
+
+# Profile the analysis of requests that ask for it, the name of the written profile is returned in a header
+@app.middleware("http")
+async def profile_requested_analysis(request: Request, call_next):
+    if not config.PROFILING_ENABLED or PROFILE_HEADER not in request.headers:
+        return await call_next(request)
+    profile_request = request_profile()
+    response = await call_next(request)
+    if profile_request.profile_name is not None:
+        response.headers[PROFILE_NAME_HEADER] = profile_request.profile_name
+    return response
+
+
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to FastAPI!"}
\ No newline at end of file
+    return {"message": "Welcome to FastAPI!"}
+
+
+# Stage timings of the hint requests in the Prometheus text format, scraped by the monitoring
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -1,11 +1,29 @@
-from fastapi import APIRouter
+import logging
+import secrets
+from typing import Any
+
+from fastapi import APIRouter, Header, Query
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from app import config
 from app.schemas.hint_request import HintRequest
-from app.handlers.error_identifier.identify_error import identify_error_handler
-from app.handlers.hint_generator.hint_generator_factory import hint_generator_factory
+from app.handlers.cache_warmer import warm_hint_cache
+from app.handlers.hint_batch import generate_hints_batch
+from app.handlers.hint_service import (SUPPORTED_CODE_LANGUAGES, get_all_hints, get_cached_hint, get_hint,
+                                       get_hint_async)
+from app.handlers.utils.admission import (AdmissionRejectedError, admission_budget_for, admission_stats,
+                                          expensive_requests)
+from app.handlers.utils.analysis_session import analysis_sessions
+from app.handlers.utils.hint_cache import hint_cache
+from app.handlers.utils.single_flight import hint_flights
+from app.handlers.utils.worker_pool import WorkerPoolBusyError
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Header with the token of the admin endpoints
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
 
 
 # Just a test endpoint to see how error handling works in FastAPI and if we can return custom error messages and
@@ -19,27 +37,117 @@ def debugging_hints(error_id: int):
         raise NotImplementedError("This error_id is not implemented.")
 
 
-# This endpoint will be used by the frontend to generate a debugging hint a random error
+# Response of a request that is rejected because the service is overloaded, rejecting it right away is better for
+# everyone than letting all requests wait
+def _busy_response() -> JSONResponse:
+    return JSONResponse(content={"hint_text": "The hint service is busy, please try again in a moment."},
+                        status_code=503, headers={"Retry-After": str(config.ADMISSION_RETRY_AFTER)})
+
+
+# This endpoint will be used by the frontend to generate a debugging hint a random error. With ?all=true the hints of
+# every problem found are returned at once, so a student does not have to fix and resubmit them one by one.
 @router.post("/get_debugging_hint")
-def get_debugging_hint(hint_request: HintRequest):
-    # Extract data from the request for processing
-    code = hint_request.code
-    output = hint_request.output
-    error = hint_request.error
-    status = hint_request.status
-    code_language = hint_request.code_language
-
-    if code_language not in ["Python", "Arduino"]:
+async def get_debugging_hint(hint_request: HintRequest, all_findings: bool = Query(False, alias="all")):
+    if hint_request.code_language not in SUPPORTED_CODE_LANGUAGES:
         return JSONResponse(content={"hint_text": "Only Python and Arduino are supported."}, status_code=400)
 
-    # Identify the error
-    # Generate the hint based on the error
-    try:
-        error_name = identify_error_handler(error_message=error, code=code, output=output, status=status, code_language=code_language)
-        hint_generator = hint_generator_factory(error_name=error_name, code=code, error=error, code_language=code_language)
-        hint, status_code = hint_generator.generate_hint()
-    except NotImplementedError:
-        hint = "No generated hints found for this error."
-        status_code = 404
+    # Cached results are served right away, only requests that need an analysis have to be admitted. Requests wait for
+    # admission on the event loop, so the threadpool only gets the requests that are analysed.
+    result = get_cached_hint(hint_request, all_findings)
+    if result is None:
+        try:
+            async with admission_budget_for(hint_request, all_findings).admit():
+                result = await run_in_threadpool(get_all_hints if all_findings else get_hint, hint_request)
+        except AdmissionRejectedError:
+            return _busy_response()
+
+    if all_findings:
+        results = result
+        hints = [{"hint_text": hint, "status_code": status_code} for hint, status_code in results]
+        # Only a request without any hint has a single "no hints found" entry with a failing status code
+        return JSONResponse(content={"hints": hints}, status_code=hints[0]["status_code"])
 
+    hint, status_code = result
     return JSONResponse(content={"hint_text": hint}, status_code=status_code)
+
+
+# Async variant of /get_debugging_hint, the analysis runs on the worker processes so large workspaces do not block
+# cheap requests
+@router.post("/get_debugging_hint_async")
+async def get_debugging_hint_async(hint_request: HintRequest):
+    if hint_request.code_language not in SUPPORTED_CODE_LANGUAGES:
+        return JSONResponse(content={"hint_text": "Only Python and Arduino are supported."}, status_code=400)
+
+    # Only a request that misses the cache is admitted, and everything after its single lookup runs on the admitted path
+    result = get_cached_hint(hint_request)
+    if result is None:
+        try:
+            async with admission_budget_for(hint_request).admit():
+                result = await get_hint_async(hint_request)
+        except (AdmissionRejectedError, WorkerPoolBusyError):
+            return _busy_response()
+    hint, status_code = result
+    return JSONResponse(content={"hint_text": hint}, status_code=status_code)
+
+
+# This endpoint is used by grading jobs and dashboards to generate the hints of many submissions at once. The items are
+# validated one by one, so an invalid item gets its own 422 instead of failing the whole batch.
+@router.post("/get_debugging_hints")
+async def get_debugging_hints(hint_requests: list[Any]):
+    if len(hint_requests) > config.HINT_BATCH_MAX_SIZE:
+        return JSONResponse(content={"hint_text": f"At most {config.HINT_BATCH_MAX_SIZE} hint requests are allowed "
+                                                  f"per batch."}, status_code=413)
+
+    # Every item gets its own status code, a failing item does not fail the batch. A batch is admitted as a whole on the
+    # budget of the expensive requests.
+    try:
+        async with expensive_requests.admit():
+            results = await run_in_threadpool(generate_hints_batch, hint_requests)
+    except AdmissionRejectedError:
+        return _busy_response()
+    hints = [{"hint_text": hint, "status_code": status_code} for hint, status_code in results]
+    return JSONResponse(content={"hints": hints}, status_code=200)
+
+
+# Warm the hint cache again from the configured samples, e.g. after the samples of a new exercise were added. Only the
+# configured path can be loaded, requests must not be able to read arbitrary files of the server. Warming runs the
+# analysis of every sample, so only callers with the admin token may start it.
+@router.post("/admin/warm_cache")
+def warm_cache(admin_token: str = Header("", alias=ADMIN_TOKEN_HEADER)):
+    if not config.ADMIN_TOKEN:
+        return JSONResponse(content={"message": "The admin endpoints are disabled."}, status_code=404)
+    if not secrets.compare_digest(admin_token.encode(), config.ADMIN_TOKEN.encode()):
+        return JSONResponse(content={"message": "Invalid admin token."}, status_code=403)
+    if not config.HINT_CACHE_WARMUP_PATH:
+        return JSONResponse(content={"message": "No samples to warm the hint cache with are configured."},
+                            status_code=404)
+    try:
+        return warm_hint_cache(config.HINT_CACHE_WARMUP_PATH)
+    except (OSError, UnicodeDecodeError) as error:
+        logger.error("Could not read the samples to warm the hint cache with: %s", error)
+        return JSONResponse(content={"message": "The samples to warm the hint cache with cannot be read."},
+                            status_code=500)
+
+
+# Counters of the hint cache, used to tune its size and time to live
+@router.get("/hint_cache/stats")
+def hint_cache_stats():
+    return hint_cache.stats()
+
+
+# Counters of the analysis sessions of editors, used to tune their number and idle timeout
+@router.get("/analysis_sessions/stats")
+def analysis_sessions_stats():
+    return analysis_sessions.stats()
+
+
+# Counters of the coalescing of concurrent identical hint requests, computations saved are counted as coalesced
+@router.get("/request_coalescing/stats")
+def request_coalescing_stats():
+    return hint_flights.stats()
+
+
+# Load of the admission budgets and the number of requests that were shed, used to tune the limits
+@router.get("/admission/stats")
+def admission_stats_endpoint():
+    return admission_stats()
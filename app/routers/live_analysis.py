@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import uuid
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.schemas.hint_request import HintRequest
+from app.handlers.hint_service import SUPPORTED_CODE_LANGUAGES, get_all_hints, get_hint
+from app.handlers.utils.admission import AdmissionRejectedError, admission_budget_for
+from app.handlers.utils.cancellation import AnalysisCancelledError, CancellationToken
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+# Editors keep this connection open while a student is editing and send a snapshot of the workspace after every edit,
+# with the fields of a hint request and an optional "all" flag. Snapshots are debounced, a newer snapshot cancels the
+# analysis of the previous one, and the hints of the latest snapshot are pushed back with its sequence number. Every
+# analysis is admitted like a hint request, so editors cannot bypass the admission budgets.
+@router.websocket("/live_analysis")
+async def live_analysis(websocket: WebSocket):
+    await websocket.accept()
+    # Snapshots without a session id share a session of the connection, so only the edited stacks are analysed again
+    connection_session_id = f"live-{uuid.uuid4().hex}"
+    sequence = 0
+    pending = None
+    # Superseded analyses keep running until their thread sees the token, so every task is kept until it is done
+    tasks = set()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            sequence += 1
+            try:
+                snapshot = dict(json.loads(message))
+                all_findings = bool(snapshot.pop("all", False))
+                snapshot["session_id"] = snapshot.get("session_id") or connection_session_id
+                hint_request = HintRequest(**snapshot)
+            except (TypeError, ValueError):
+                # Invalid snapshots are answered right away and do not supersede the pending one
+                await websocket.send_json({"sequence": sequence, "hint_text": "Invalid workspace snapshot.",
+                                           "status_code": 422})
+                continue
+            if pending is not None:
+                _supersede(*pending)
+            cancellation = CancellationToken()
+            task = asyncio.create_task(_analyse_snapshot(websocket, sequence, hint_request, all_findings, cancellation))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            pending = (task, cancellation)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if pending is not None:
+            _supersede(*pending)
+        # The connection is gone, wait until no analysis of it is left running and holding an admission slot
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _supersede(task: asyncio.Task, cancellation: CancellationToken) -> None:
+    """Stop the analysis of a snapshot, whether it is still waiting for the debounce delay or already running."""
+    task.cancel()
+    # Cancelling the task does not stop the thread that runs the analysis, the token does
+    cancellation.cancel()
+
+
+async def _analyse_snapshot(websocket: WebSocket, sequence: int, hint_request: HintRequest, all_findings: bool,
+                            cancellation: CancellationToken) -> None:
+    """Wait for the debounce delay, then analyse the snapshot and push its hints to the editor."""
+    # A newer snapshot that arrives within the delay cancels this task before any analysis is done
+    await asyncio.sleep(config.LIVE_ANALYSIS_DEBOUNCE)
+    try:
+        async with admission_budget_for(hint_request, all_findings).admit():
+            analysis = asyncio.ensure_future(run_in_threadpool(_live_hints, hint_request, all_findings, cancellation))
+            try:
+                content = await asyncio.shield(analysis)
+            except asyncio.CancelledError:
+                # The thread keeps running until it checks the token, its admission slot is only freed once it stopped
+                cancellation.cancel()
+                await asyncio.gather(analysis, return_exceptions=True)
+                raise
+    except AdmissionRejectedError:
+        content = {"hint_text": "The hint service is busy, please try again in a moment.", "status_code": 503}
+    except AnalysisCancelledError:
+        return
+    except Exception:
+        logger.exception("Hint generation failed for a live analysis snapshot.")
+        content = {"hint_text": "Something went wrong while generating a hint for this workspace.", "status_code": 500}
+    if cancellation.cancelled:
+        return
+    content["sequence"] = sequence
+    # Once the hints are ready they are sent as a whole, a newer snapshot must not cut the message off halfway
+    await asyncio.shield(websocket.send_json(content))
+
+
+def _live_hints(hint_request: HintRequest, all_findings: bool, cancellation: CancellationToken) -> dict:
+    """Returns the message with the hints of a snapshot, in the format of /get_debugging_hint."""
+    if hint_request.code_language not in SUPPORTED_CODE_LANGUAGES:
+        return {"hint_text": "Only Python and Arduino are supported.", "status_code": 400}
+    if all_findings:
+        hints = [{"hint_text": hint, "status_code": status_code}
+                 for hint, status_code in get_all_hints(hint_request, cancellation)]
+        return {"hints": hints, "status_code": hints[0]["status_code"]}
+    hint, status_code = get_hint(hint_request, cancellation)
+    return {"hint_text": hint, "status_code": status_code}
@@ -1,3 +1,5 @@
+from typing import Union
+
 from pydantic import BaseModel
 
 
@@ -7,3 +9,5 @@ class HintRequest(BaseModel):
     error: str
     status: str
     code_language: str
+    # Opt-in id of the editor session, resubmissions of an edited workspace only get the changed blocks analysed again
+    session_id: Union[str, None] = None
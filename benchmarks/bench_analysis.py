@@ -0,0 +1,188 @@
+"""Benchmark of every detector, helper and hint generator across sweeps of generated workspaces.
+
+Run from the repository root with `python -m benchmarks.bench_analysis --output results.json`. Every sweep varies a
+single field of the workspace spec, e.g. `--sweep block_count=100,1000,10000 --sweep depth=2,4,8`. The results are
+written as JSON, and `--compare` prints the ratios against the results of another commit.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from dataclasses import asdict, replace
+
+from app.handlers.error_identifier.identify_comparing_literals import check_comparing_literals_error
+from app.handlers.error_identifier.identify_error import identify_error_handler, identify_silent_error_handler
+from app.handlers.error_identifier.identify_incomplete_block_sequences import check_incomplete_block_sequences_error
+from app.handlers.error_identifier.identify_parameter_out_of_scope import check_parameter_out_of_scope_error
+from app.handlers.error_identifier.streaming_detector import detect_silent_error_streaming
+from app.handlers.hint_generator.hint_generator_factory import hint_generator_factory
+from app.handlers.utils.fingerprint import structural_fingerprint
+from app.handlers.utils.helper_functions import check_variable_type, find_parent_with_type
+from app.handlers.utils.workspace import FIELD_TAG, Workspace
+from benchmarks.workspace_generator import (REAL_ERRORS, SILENT_ERRORS, WorkspaceSpec, generate_error_message,
+                                            generate_workspace)
+
+DEFAULT_SWEEPS = ["block_count=100,1000,10000", "depth=2,4,8", "procedure_count=1,8,32",
+                  "arithmetic_density=0.1,0.5,0.9"]
+# Minimum duration of a single timing run, short calls are repeated until they take this long
+MIN_RUN_SECONDS = 0.05
+
+
+def warm_workspace(code: str) -> Workspace:
+    """Returns a workspace with all its lazy indexes built, so only the benchmarked function is timed."""
+    workspace = Workspace(code)
+    workspace.all_blocks()
+    workspace.variable_usages("")
+    workspace.symbol_table
+    return workspace
+
+
+def benchmark_cases(spec: WorkspaceSpec) -> dict:
+    """Returns the benchmarks for a workspace spec as a dictionary from name to function without arguments."""
+    code = generate_workspace(spec)
+    workspace = warm_workspace(code)
+    fields = [field for field in workspace.root.iter(FIELD_TAG) if field.get("name") == "VAR"]
+    variable_names = sorted({field.text for field in fields})
+    cases = {
+        # Lazily built structures, timed on a new workspace every call
+        "workspace.parse": lambda: Workspace(code).root,
+        "workspace.parse_and_index": lambda: Workspace(code).all_blocks(),
+        "workspace.fingerprint": lambda: structural_fingerprint(workspace.root),
+        "workspace.symbol_table": lambda: Workspace(code).symbol_table,
+        # Detectors and helpers on a warm workspace
+        "detector.check_comparing_literals_error": lambda: check_comparing_literals_error(workspace),
+        "detector.check_incomplete_block_sequences_error": lambda: check_incomplete_block_sequences_error(workspace),
+        "detector.check_parameter_out_of_scope_error": lambda: check_parameter_out_of_scope_error(workspace),
+        "detector.silent_error_engine": lambda: _identify_silent_error(workspace),
+        "detector.streaming": lambda: detect_silent_error_streaming(code),
+        "helper.find_parent_with_type": lambda: [find_parent_with_type(workspace, field) for field in fields],
+        "helper.check_variable_type": lambda: [check_variable_type(name, workspace) for name in variable_names],
+    }
+    for error_name in SILENT_ERRORS:
+        silent_code = generate_workspace(replace(spec, silent_error=error_name))
+        silent_workspace = warm_workspace(silent_code)
+        finding = identify_silent_error_handler(silent_workspace)
+        cases[f"generator.{error_name}"] = _generator_case(silent_workspace, finding, "", "Python")
+    # The hint of an ambiguous parameter name points at the function with the duplicate parameter
+    ambiguous_workspace = warm_workspace(generate_workspace(replace(spec, duplicate_parameter=True)))
+    for error_name in REAL_ERRORS:
+        real_error_workspace = ambiguous_workspace if error_name == "ambiguous_parameter_name" else workspace
+        for code_language in ("Python", "Arduino"):
+            error = generate_error_message(error_name, code_language, frame_count=5)
+            status = "1" if code_language == "Python" else "0"
+            finding = identify_error_handler(error_message=error, workspace=real_error_workspace, output="",
+                                             status=status, code_language=code_language)
+            cases[f"generator.{error_name}.{code_language}"] = _generator_case(real_error_workspace, finding, error,
+                                                                               code_language)
+    return cases
+
+
+def _identify_silent_error(workspace: Workspace):
+    """Returns the finding of the silent error engine, or None if there is no silent error."""
+    try:
+        return identify_silent_error_handler(workspace)
+    except NotImplementedError:
+        return None
+
+
+def _generator_case(workspace: Workspace, finding, error: str, code_language: str):
+    """Returns a function that generates the hint of a finding."""
+    def generate():
+        return hint_generator_factory(error_name=finding.error_name, workspace=workspace, error=error,
+                                      code_language=code_language, finding=finding).generate_hint()
+    return generate
+
+
+def time_function(function, repeat: int) -> dict:
+    """Returns the minimum and median duration of a call, each of the runs repeats the call for MIN_RUN_SECONDS."""
+    number = 1
+    while True:
+        duration = timeit.timeit(function, number=number)
+        if duration >= MIN_RUN_SECONDS or number >= 1_000_000:
+            break
+        number *= 10
+    durations = [duration / number] + [timeit.timeit(function, number=number) / number for _ in range(repeat - 1)]
+    return {"min_seconds": min(durations), "median_seconds": statistics.median(durations), "number": number,
+            "repeat": repeat}
+
+
+def parse_sweep(sweep: str) -> tuple[str, list]:
+    """Returns the spec field and its values of a sweep like "block_count=100,1000"."""
+    field_name, values = sweep.split("=", 1)
+    field_type = type(getattr(WorkspaceSpec(), field_name))
+    return field_name, [field_type(value) for value in values.split(",")]
+
+
+def run(sweeps: list, repeat: int, only: str) -> dict:
+    """Run every benchmark for every value of every sweep and return the results."""
+    results = []
+    for sweep in sweeps:
+        field_name, values = parse_sweep(sweep)
+        for value in values:
+            spec = replace(WorkspaceSpec(), **{field_name: value})
+            code = generate_workspace(spec)
+            for name, function in benchmark_cases(spec).items():
+                if only and only not in name:
+                    continue
+                timing = time_function(function, repeat)
+                results.append({"benchmark": name, "sweep": field_name, "value": value, "spec": asdict(spec),
+                                "bytes": len(code), **timing})
+                print(f"{field_name}={value:<8} {name:<60} {timing['min_seconds'] * 1000:>10.3f} ms",
+                      file=sys.stderr)
+    return {"metadata": _metadata(repeat), "results": results}
+
+
+def _metadata(repeat: int) -> dict:
+    """Returns the environment of the run, results are only comparable between runs on the same machine."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+    }
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the ratio of every benchmark to the same benchmark in the baseline, above 1 is slower."""
+    baseline_timings = {(result["benchmark"], result["sweep"], str(result["value"])): result["min_seconds"]
+                        for result in baseline["results"]}
+    print(f"Compared to {baseline['metadata'].get('commit')}:")
+    for result in results["results"]:
+        before = baseline_timings.get((result["benchmark"], result["sweep"], str(result["value"])))
+        if before:
+            print(f"{result['sweep']}={result['value']:<8} {result['benchmark']:<60} "
+                  f"{result['min_seconds'] / before:>6.2f}x")
+
+
+def main() -> None:
+    """Run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sweep", action="append", help="spec field and its values, e.g. block_count=100,1000")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing runs per benchmark")
+    parser.add_argument("--only", default="", help="only run the benchmarks whose name contains this text")
+    parser.add_argument("--output", help="file to write the JSON results to, stdout if omitted")
+    parser.add_argument("--compare", help="JSON results of another commit to compare against")
+    arguments = parser.parse_args()
+
+    results = run(arguments.sweep or DEFAULT_SWEEPS, arguments.repeat, arguments.only)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == "__main__":
+    main()
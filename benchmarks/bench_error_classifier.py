@@ -0,0 +1,60 @@
+"""Micro-benchmark of the error message classifier against the former if/elif chain of substring checks.
+
+Run from the repository root with `python -m benchmarks.bench_error_classifier`.
+"""
+import re
+import timeit
+
+from app.handlers.error_identifier.error_classifier import ARDUINO_ERROR_PATTERNS
+
+ARDUINO_PATTERNS = [
+    "warning: division by zero",
+    "error: index out of bounds for",
+    "error: no match for",
+    "error: redefinition of",
+    "was not declared in this scope",
+]
+COMBINED_REGEX = re.compile("|".join(f"(?P<p{index}>{re.escape(pattern)})"
+                                     for index, pattern in enumerate(ARDUINO_PATTERNS)))
+WARNING = "/tmp/sketch/sketch.ino:12:5: warning: unused variable 'foo' [-Wunused-variable]\n   int foo = 3;\n       ^~~\n"
+ERROR = "/tmp/sketch/sketch.ino:5:3: error: 'a' was not declared in this scope\n   a = a + 1;\n   ^\n"
+
+
+def legacy_arduino_classifier(error_message: str):
+    """The if/elif chain that identify_real_arduino_error_handler used before the pattern registry."""
+    if "warning: division by zero" in error_message:
+        return "zero_division_error"
+    elif "error: index out of bounds for" in error_message:
+        return "out_of_bounds_error"
+    elif "error: no match for" in error_message:
+        return "type_error"
+    elif "error: redefinition of" in error_message:
+        return "ambiguous_parameter_name"
+    elif "was not declared in this scope" in error_message:
+        return "none_type_error"
+    return None
+
+
+def combined_regex_classifier(error_message: str):
+    """A single combined regular expression, kept to show why the registry does not use one."""
+    found = {int(match.lastgroup[1:]) for match in COMBINED_REGEX.finditer(error_message)}
+    return ARDUINO_PATTERNS[min(found)] if found else None
+
+
+def main() -> None:
+    """Time the classifiers on compiler output of increasing size, with the error at the end of the output."""
+    print(f"{'bytes':>10} {'legacy ms':>10} {'classify ms':>12} {'classify_all ms':>16} {'combined regex ms':>18}")
+    for warning_count in (0, 10, 100, 1_000, 10_000):
+        error_message = WARNING * warning_count + ERROR
+        assert ARDUINO_ERROR_PATTERNS.classify(error_message) == legacy_arduino_classifier(error_message)
+        repeats = max(10, 100_000 // (warning_count + 1))
+        timings = [
+            timeit.timeit(lambda: classifier(error_message), number=repeats) / repeats * 1000
+            for classifier in (legacy_arduino_classifier, ARDUINO_ERROR_PATTERNS.classify,
+                               ARDUINO_ERROR_PATTERNS.classify_all, combined_regex_classifier)
+        ]
+        print(f"{len(error_message):>10} {timings[0]:>10.4f} {timings[1]:>12.4f} {timings[2]:>16.4f} {timings[3]:>18.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Benchmark of the workspace fingerprint on large workspaces.
+
+Run from the repository root with `python -m benchmarks.bench_fingerprint`.
+"""
+import timeit
+import xml.etree.ElementTree as ET
+
+from app.handlers.utils.fingerprint import canonicalize_workspace, structural_fingerprint, workspace_fingerprint
+from benchmarks.workspace_generator import WorkspaceSpec, generate_workspace
+
+
+def main() -> None:
+    """Time the fingerprint functions for increasing workspace sizes."""
+    print(f"{'blocks':>8} {'bytes':>10} {'parse ms':>10} {'fingerprint ms':>15} {'parse+fp ms':>12} {'canonicalize ms':>16}")
+    for block_count in (100, 1_000, 10_000, 50_000):
+        code = generate_workspace(WorkspaceSpec(block_count=block_count))
+        root = ET.fromstring(code)
+        repeats = max(1, 20_000 // block_count)
+        parse = timeit.timeit(lambda: ET.fromstring(code), number=repeats) / repeats * 1000
+        fingerprint = timeit.timeit(lambda: structural_fingerprint(root), number=repeats) / repeats * 1000
+        total = timeit.timeit(lambda: workspace_fingerprint(code), number=repeats) / repeats * 1000
+        canonical = timeit.timeit(lambda: canonicalize_workspace(code), number=repeats) / repeats * 1000
+        print(f"{block_count:>8} {len(code):>10} {parse:>10.2f} {fingerprint:>15.2f} {total:>12.2f} {canonical:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""End-to-end load test of the hint endpoints, against a running server or the in-process ASGI app.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.load_test --pattern burst --class-size 30 --bursts 5
+    python -m benchmarks.load_test --target http://127.0.0.1:8000 --pattern ramp --rps 20 --max-rps 400
+
+Requests are sent open loop: every request has a scheduled send time, and its latency is measured from that time. A
+server that falls behind therefore shows up in the latencies instead of silently slowing down the load. The request
+mix is generated from benchmarks.workspace_generator, no external services or data are needed.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from urllib.parse import urlsplit
+
+from benchmarks.workspace_generator import (REAL_ERRORS, SILENT_ERRORS, WorkspaceSpec, generate_error_message,
+                                            generate_workspace)
+
+
+@dataclass
+class RequestMix:
+    """Shares of the kinds of requests in the load, each between 0 and 1."""
+    python: float = 0.5
+    silent: float = 0.5
+    # Requests for a workspace that was requested before, the rest are unique and miss the cache
+    hit: float = 0.8
+    block_count: int = 200
+    # Number of distinct workspaces the cache hits are drawn from, like the starter programs of a lab
+    hot_set_size: int = 10
+
+
+class RequestFactory:
+    """Generates the JSON bodies of hint requests according to a request mix."""
+
+    def __init__(self, mix: RequestMix, seed: int = 0):
+        """Initialize the factory, the workspaces are generated up front."""
+        self.mix = mix
+        self.random = random.Random(seed)
+        self.unique = 0
+        self.hot = 0
+        spec = WorkspaceSpec(block_count=mix.block_count, seed=seed)
+        self.clean_workspace = generate_workspace(spec)
+        self.silent_workspaces = [generate_workspace(replace(spec, silent_error=error_name))
+                                  for error_name in SILENT_ERRORS]
+        self.hot_set = [self._build(unique=False) for _ in range(mix.hot_set_size)]
+
+    def next_body(self) -> bytes:
+        """Returns the body of the next request."""
+        if self.random.random() < self.mix.hit:
+            return self.random.choice(self.hot_set)
+        return self._build(unique=True)
+
+    def _build(self, unique: bool) -> bytes:
+        """Returns the body of a random request, a unique one gets a workspace that was never requested before."""
+        code_language = "Python" if self.random.random() < self.mix.python else "Arduino"
+        if self.random.random() < self.mix.silent:
+            code = self.random.choice(self.silent_workspaces)
+            error, status = "", "0"
+        else:
+            code = self.clean_workspace
+            error = generate_error_message(self.random.choice(REAL_ERRORS), code_language,
+                                           frame_count=self.random.randint(1, 5))
+            status = "1" if code_language == "Python" else "0"
+        if unique:
+            # A loose block with a new number changes the structural fingerprint, so the request misses every cache
+            self.unique += 1
+            code = code.replace("</xml>", f'<block type="math_number" id="load{self.unique}">'
+                                          f'<field name="NUM">{self.unique}</field></block></xml>')
+        else:
+            # Hot requests differ in the number of their workspace only, so they are distinct cache entries
+            self.hot += 1
+            code = code.replace("</xml>", f'<block type="math_number" id="hot">'
+                                          f'<field name="NUM">{-self.hot}</field></block></xml>')
+        return json.dumps({"code": code, "output": "", "error": error, "status": status,
+                           "code_language": code_language}).encode("utf-8")
+
+
+class AsgiClient:
+    """Sends requests straight to an ASGI app in the same process, without a server or sockets."""
+
+    def __init__(self, app):
+        """Initialize the client."""
+        self.app = app
+
+    async def post(self, path: str, body: bytes) -> int:
+        """Send a POST request and return its status code."""
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+            "path": path, "raw_path": path.encode("utf-8"), "query_string": b"", "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+        }
+        request_sent = False
+        status_code = None
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # The client never disconnects, wait until the app stops listening
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        await self.app(scope, receive, send)
+        return status_code
+
+
+class HttpClient:
+    """Sends requests to a running server over keep-alive connections, one per thread."""
+
+    def __init__(self, base_url: str, concurrency: int):
+        """Initialize the client."""
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def post(self, path: str, body: bytes) -> int:
+        """Send a POST request and return its status code, 599 if the connection failed."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._post, path, body)
+
+    def _post(self, path: str, body: bytes) -> int:
+        """Send a POST request on the connection of the current thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            return 599
+
+
+@dataclass
+class PhaseResult:
+    """Latencies and status codes of the requests of a phase of the load."""
+    name: str
+    offered_rps: float
+    duration: float = 0.0
+    latencies: list = field(default_factory=list)
+    status_codes: dict = field(default_factory=dict)
+
+    def record(self, latency: float, status_code: int) -> None:
+        """Record a finished request."""
+        self.latencies.append(latency)
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    @property
+    def failures(self) -> int:
+        """Number of requests that failed or were shed by the server."""
+        return sum(count for status_code, count in self.status_codes.items() if status_code >= 500)
+
+    def report(self) -> dict:
+        """Returns the throughput and the latency percentiles of the phase."""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive") if count > 1 else latencies * 99
+        return {
+            "phase": self.name,
+            "requests": count,
+            "offered_rps": round(self.offered_rps, 1),
+            "throughput_rps": round(count / self.duration, 1) if self.duration else 0.0,
+            "p50_ms": round(percentiles[49] * 1000, 2) if count else None,
+            "p95_ms": round(percentiles[94] * 1000, 2) if count else None,
+            "p99_ms": round(percentiles[98] * 1000, 2) if count else None,
+            "max_ms": round(latencies[-1] * 1000, 2) if count else None,
+            "failures": self.failures,
+            "status_codes": {str(status_code): count for status_code, count in sorted(self.status_codes.items())},
+        }
+
+
+async def run_schedule(client, path: str, factory: RequestFactory, send_times: list, result: PhaseResult) -> None:
+    """Send a request at every send time, relative to now, and wait until all of them finished."""
+    started_at = time.perf_counter()
+
+    async def send(scheduled_at: float, body: bytes):
+        delay = started_at + scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        status_code = await client.post(path, body)
+        # Measured from the scheduled time, so a request that could not be sent on time counts its wait
+        result.record(time.perf_counter() - started_at - scheduled_at, status_code)
+
+    bodies = [factory.next_body() for _ in send_times]
+    await asyncio.gather(*(send(scheduled_at, body) for scheduled_at, body in zip(send_times, bodies)))
+    result.duration = time.perf_counter() - started_at
+
+
+def steady_schedule(rps: float, duration: float) -> list:
+    """Returns evenly spaced send times for a constant request rate."""
+    return [index / rps for index in range(int(rps * duration))]
+
+
+def burst_schedule(class_size: int, bursts: int, interval: float) -> list:
+    """Returns send times where a whole class hits Run at once, every interval seconds."""
+    return [burst * interval for burst in range(bursts) for _ in range(class_size)]
+
+
+async def run_load(client, arguments, factory: RequestFactory) -> list:
+    """Run the load pattern and return the results of its phases."""
+    path = arguments.endpoint
+    results = []
+    if arguments.pattern == "steady":
+        result = PhaseResult("steady", arguments.rps)
+        await run_schedule(client, path, factory, steady_schedule(arguments.rps, arguments.duration), result)
+        results.append(result)
+    elif arguments.pattern == "burst":
+        result = PhaseResult(f"burst of {arguments.class_size}", arguments.class_size / arguments.burst_interval)
+        await run_schedule(client, path, factory,
+                           burst_schedule(arguments.class_size, arguments.bursts, arguments.burst_interval), result)
+        results.append(result)
+    else:
+        # Increase the rate until the server can no longer keep up within the latency objective
+        rps = arguments.rps
+        while rps <= arguments.max_rps:
+            result = PhaseResult(f"ramp {rps:g} rps", rps)
+            await run_schedule(client, path, factory, steady_schedule(rps, arguments.duration), result)
+            results.append(result)
+            print_report(result.report())
+            if not is_sustainable(result, arguments.slo_ms):
+                break
+            rps *= arguments.ramp_factor
+    return results
+
+
+def is_sustainable(result: PhaseResult, slo_ms: float) -> bool:
+    """Returns True if the server kept up with the offered rate within the latency objective and without failures."""
+    report = result.report()
+    return (report["p95_ms"] is not None and report["p95_ms"] <= slo_ms
+            and result.failures <= 0.01 * report["requests"]
+            and report["throughput_rps"] >= 0.9 * result.offered_rps)
+
+
+def print_report(report: dict) -> None:
+    """Print a line of the latency and throughput report."""
+    print(f"{report['phase']:<18} {report['requests']:>7} req {report['throughput_rps']:>8} rps  "
+          f"p50 {report['p50_ms']:>8} ms  p95 {report['p95_ms']:>8} ms  p99 {report['p99_ms']:>8} ms  "
+          f"max {report['max_ms']:>8} ms  failures {report['failures']}  {report['status_codes']}", file=sys.stderr)
+
+
+def main() -> None:
+    """Run the load test and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="asgi", help="'asgi' for the in-process app, or the URL of a server")
+    parser.add_argument("--endpoint", default="/get_debugging_hint")
+    parser.add_argument("--pattern", choices=("steady", "burst", "ramp"), default="steady")
+    parser.add_argument("--rps", type=float, default=50, help="request rate of steady load, start rate of a ramp")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of steady load or of each ramp step")
+    parser.add_argument("--max-rps", type=float, default=2000, help="highest request rate of a ramp")
+    parser.add_argument("--ramp-factor", type=float, default=1.5, help="rate increase between ramp steps")
+    parser.add_argument("--slo-ms", type=float, default=500, help="p95 latency a sustainable rate must stay below")
+    parser.add_argument("--class-size", type=int, default=30, help="requests sent at once in a burst")
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-interval", type=float, default=2, help="seconds between bursts")
+    parser.add_argument("--python", type=float, default=0.5, help="share of Python requests, the rest is Arduino")
+    parser.add_argument("--silent", type=float, default=0.5, help="share of silent errors, the rest are real errors")
+    parser.add_argument("--hit", type=float, default=0.8, help="share of requests for previously requested workspaces")
+    parser.add_argument("--block-count", type=int, default=200, help="number of blocks of the workspaces")
+    parser.add_argument("--concurrency", type=int, default=64, help="connections to a server")
+    parser.add_argument("--json", help="file to write the report to as JSON")
+    arguments = parser.parse_args()
+
+    factory = RequestFactory(RequestMix(python=arguments.python, silent=arguments.silent, hit=arguments.hit,
+                                        block_count=arguments.block_count))
+    if arguments.target == "asgi":
+        from app.main import app
+        from app.handlers.utils.worker_pool import shutdown_process_pool
+        client = AsgiClient(app)
+    else:
+        shutdown_process_pool = None
+        client = HttpClient(arguments.target, arguments.concurrency)
+
+    try:
+        results = asyncio.run(run_load(client, arguments, factory))
+    finally:
+        if shutdown_process_pool is not None:
+            shutdown_process_pool()
+    reports = [result.report() for result in results]
+    if arguments.pattern != "ramp":
+        for report in reports:
+            print_report(report)
+    else:
+        sustainable = [report for result, report in zip(results, reports) if is_sustainable(result, arguments.slo_ms)]
+        max_rps = sustainable[-1]["throughput_rps"] if sustainable else None
+        print(f"Max sustainable throughput within p95 {arguments.slo_ms:g} ms: {max_rps} rps", file=sys.stderr)
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as output:
+            json.dump({"arguments": vars(arguments), "phases": reports}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
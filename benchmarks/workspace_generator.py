@@ -0,0 +1,207 @@
+"""Deterministic generator of Blockly workspaces and error messages for the benchmarks.
+
+The same spec always gives the same workspace, so the timings of different commits can be compared.
+"""
+import random
+from dataclasses import dataclass
+from typing import Union
+
+NS = "http://www.w3.org/1999/xhtml"
+SILENT_ERRORS = ("comparing_literals_error", "incomplete_block_sequences_error", "parameter_out_of_scope_error")
+REAL_ERRORS = ("zero_division_error", "out_of_bounds_error", "type_error", "ambiguous_parameter_name",
+               "none_type_error")
+ARITHMETIC_OPERATORS = ("ADD", "MINUS", "MULTIPLY", "DIVIDE", "POWER")
+COMPARE_OPERATORS = ("EQ", "NEQ", "LT", "LTE", "GT", "GTE")
+
+
+@dataclass(frozen=True)
+class WorkspaceSpec:
+    """Shape of a generated workspace."""
+    block_count: int = 1_000
+    # Maximum nesting of statements and expressions
+    depth: int = 4
+    procedure_count: int = 4
+    parameter_count: int = 2
+    # Probability that an expression is an arithmetic operation instead of a variable or a number
+    arithmetic_density: float = 0.3
+    variable_count: int = 8
+    # Give the first procedure the same parameter twice, the workspace of an ambiguous parameter name error
+    duplicate_parameter: bool = False
+    # Silent error added at the end of the workspace, so the detectors have to walk the whole workspace to find it
+    silent_error: Union[str, None] = None
+    seed: int = 0
+
+
+def generate_workspace(spec: WorkspaceSpec) -> str:
+    """Returns the Blockly XML of a workspace with the given shape."""
+    return _WorkspaceBuilder(spec).build()
+
+
+class _WorkspaceBuilder:
+    """Builds the blocks of a workspace until the block budget is spent."""
+
+    def __init__(self, spec: WorkspaceSpec):
+        """Initialize the builder."""
+        self.spec = spec
+        self.random = random.Random(spec.seed)
+        self.blocks = 0
+        self.variables = [f"v{index}" for index in range(spec.variable_count)]
+        self.procedures = [(f"procedure{index}", [f"p{index}_{parameter}" for parameter in range(spec.parameter_count)])
+                           for index in range(spec.procedure_count)]
+        if spec.duplicate_parameter and self.procedures and self.procedures[0][1]:
+            self.procedures[0][1].append(self.procedures[0][1][0])
+
+    def build(self) -> str:
+        """Returns the XML of the workspace."""
+        parameters = sorted({name for _, names in self.procedures for name in names})
+        variables = "".join(f'<variable id="{name}">{name}</variable>' for name in self.variables + parameters)
+        # Every variable gets a value first, so only the injected errors are found
+        stacks = [self._chain([self._set(name, self._number()) for name in self.variables])]
+        budget_per_procedure = self.spec.block_count // (2 * max(len(self.procedures), 1))
+        for name, parameters in self.procedures:
+            stacks.append(self._procedure(name, parameters, self.blocks + budget_per_procedure))
+        while self.blocks < self.spec.block_count:
+            stacks.append(self._chain(self._statements(0, self.variables, min(self.blocks + 50,
+                                                                               self.spec.block_count))))
+        if self.spec.silent_error is not None:
+            stacks.append(self._silent_error(self.spec.silent_error))
+        positioned = "".join(stack.replace("<block ", f'<block x="{index * 20}" y="{index * 40}" ', 1)
+                             for index, stack in enumerate(stacks))
+        return f'<xml xmlns="{NS}"><variables>{variables}</variables>{positioned}</xml>'
+
+    def _block(self, block_type: str, content: str) -> str:
+        """Returns a block and counts it."""
+        self.blocks += 1
+        return f'<block type="{block_type}" id="b{self.blocks}">{content}</block>'
+
+    @staticmethod
+    def _chain(statements: list) -> str:
+        """Returns the statements connected into a single stack."""
+        stack = ""
+        for statement in reversed(statements):
+            stack = statement[:-len("</block>")] + (f"<next>{stack}</next>" if stack else "") + "</block>"
+        return stack
+
+    def _statements(self, depth: int, variables: list, until: int) -> list:
+        """Returns statements until the block count reaches until, at least one."""
+        statements = [self._statement(depth, variables)]
+        while self.blocks < until and len(statements) < 8:
+            statements.append(self._statement(depth, variables))
+        return statements
+
+    def _statement(self, depth: int, variables: list) -> str:
+        """Returns a random statement, nested statements stop at the maximum depth."""
+        kind = self.random.random()
+        if depth < self.spec.depth and kind < 0.25:
+            condition = self._compare(self._variable(variables), self._expression(depth + 1, variables))
+            body = self._chain(self._statements(depth + 1, variables, self.blocks + 6))
+            return self._block("controls_if", f'<value name="IF0">{condition}</value>'
+                                              f'<statement name="DO0">{body}</statement>')
+        if depth < self.spec.depth and kind < 0.35:
+            body = self._chain(self._statements(depth + 1, variables, self.blocks + 6))
+            return self._block("controls_repeat_ext", f'<value name="TIMES">{self._number()}</value>'
+                                                      f'<statement name="DO">{body}</statement>')
+        if self.procedures and kind < 0.45 and variables is self.variables:
+            name, parameters = self.random.choice(self.procedures)
+            arguments = "".join(f'<arg name="{parameter}"></arg>' for parameter in parameters)
+            values = "".join(f'<value name="ARG{index}">{self._expression(depth + 1, variables)}</value>'
+                             for index in range(len(parameters)))
+            return self._block("procedures_callnoreturn", f'<mutation name="{name}">{arguments}</mutation>{values}')
+        if kind < 0.7:
+            return self._set(self.random.choice(self.variables), self._expression(depth + 1, variables))
+        return self._block("text_print", f'<value name="TEXT">{self._expression(depth + 1, variables)}</value>')
+
+    def _expression(self, depth: int, variables: list) -> str:
+        """Returns a random expression, arithmetic with the configured density up to the maximum depth."""
+        if depth < self.spec.depth and self.random.random() < self.spec.arithmetic_density:
+            operator = self.random.choice(ARITHMETIC_OPERATORS)
+            return self._block("math_arithmetic", f'<field name="OP">{operator}</field>'
+                                                  f'<value name="A">{self._expression(depth + 1, variables)}</value>'
+                                                  f'<value name="B">{self._expression(depth + 1, variables)}</value>')
+        if self.random.random() < 0.6:
+            return self._variable(variables)
+        return self._number()
+
+    def _procedure(self, name: str, parameters: list, until: int) -> str:
+        """Returns a procedure definition whose body uses its parameters."""
+        arguments = "".join(f'<arg name="{parameter}"></arg>' for parameter in parameters)
+        body = self._chain(self._statements(1, self.variables + parameters, until))
+        return self._block("procedures_defnoreturn", f'<mutation>{arguments}</mutation>'
+                                                     f'<field name="NAME">{name}</field>'
+                                                     f'<statement name="STACK">{body}</statement>')
+
+    def _silent_error(self, error_name: str) -> str:
+        """Returns a stack with the given silent error."""
+        if error_name == "comparing_literals_error":
+            condition = self._compare(self._number(), self._number())
+            return self._block("controls_if", f'<value name="IF0">{condition}</value>')
+        if error_name == "incomplete_block_sequences_error":
+            body = self._set(self.variables[0], self._number())
+            return self._block("controls_if", f'<statement name="DO0">{body}</statement>')
+        if error_name == "parameter_out_of_scope_error" and self.procedures:
+            parameter = self.procedures[0][1][0] if self.procedures[0][1] else self.variables[0]
+            return self._block("text_print", f'<value name="TEXT">{self._variable([parameter])}</value>')
+        raise ValueError(f"Cannot generate this silent error: {error_name}")
+
+    def _compare(self, value_a: str, value_b: str) -> str:
+        """Returns a comparison of two values."""
+        operator = self.random.choice(COMPARE_OPERATORS)
+        return self._block("logic_compare", f'<field name="OP">{operator}</field><value name="A">{value_a}</value>'
+                                            f'<value name="B">{value_b}</value>')
+
+    def _set(self, variable: str, value: str) -> str:
+        """Returns an assignment of a value to a variable."""
+        return self._block("variables_set", f'<field name="VAR" id="{variable}">{variable}</field>'
+                                            f'<value name="VALUE">{value}</value>')
+
+    def _variable(self, variables: list) -> str:
+        """Returns a usage of a random variable."""
+        variable = self.random.choice(variables)
+        return self._block("variables_get", f'<field name="VAR" id="{variable}">{variable}</field>')
+
+    def _number(self) -> str:
+        """Returns a random number."""
+        return self._block("math_number", f'<field name="NUM">{self.random.randint(0, 100)}</field>')
+
+
+def generate_error_message(error_name: str, code_language: str, frame_count: int = 1) -> str:
+    """Returns a synthetic error message of the given language that is classified as the given real error.
+
+    Python tracebacks get frame_count frames, to measure how the parsers scale with the length of the message.
+    """
+    if code_language == "Python":
+        frames = "".join(f'  File "main.py", line {line}, in procedure{line}\n    procedure{line + 1}(v0)\n'
+                         for line in range(1, frame_count))
+        return f"Traceback (most recent call last):\n{frames}{PYTHON_ERRORS[error_name]}"
+    if code_language == "Arduino":
+        warnings = "".join(f"/tmp/sketch/sketch.ino:{line}:5: warning: unused variable 'v{line}' "
+                           f"[-Wunused-variable]\n   int v{line} = 3;\n       ^~\n"
+                           for line in range(1, frame_count))
+        return f"/tmp/sketch/sketch.ino: In function 'void loop()':\n{warnings}{ARDUINO_ERRORS[error_name]}"
+    raise ValueError(f"Unsupported code language: {code_language}")
+
+
+PYTHON_ERRORS = {
+    "zero_division_error": ('  File "main.py", line 12, in <module>\n    print(v0 / v1)\n'
+                            "ZeroDivisionError: division by zero\n"),
+    "out_of_bounds_error": ('  File "main.py", line 12, in <module>\n    print(v0[7])\n'
+                            "IndexError: list index out of range\n"),
+    "type_error": ('  File "main.py", line 12, in <module>\n    print(v0 + v1)\n'
+                   "TypeError: unsupported operand type(s) for +: 'int' and 'str'\n"),
+    "ambiguous_parameter_name": ('  File "main.py", line 1\n    def procedure0(x, x):\n'
+                                 "SyntaxError: duplicate argument 'x' in function definition\n"),
+    "none_type_error": ('  File "main.py", line 12, in <module>\n    v0.append(1)\n'
+                        "AttributeError: 'NoneType' object has no attribute 'append'\n"),
+}
+ARDUINO_ERRORS = {
+    "zero_division_error": "/tmp/sketch/sketch.ino:12:13: warning: division by zero [-Wdiv-by-zero]\n"
+                           "   int v0 = 10 / 0;\n           ~~~^~~\n",
+    "out_of_bounds_error": "/tmp/sketch/sketch.ino:12:5: error: index out of bounds for type 'int [3]'\n"
+                           "   v0[7] = 1;\n     ^\n",
+    "type_error": "/tmp/sketch/sketch.ino:12:9: error: no match for 'operator+' (operand types are 'String' and "
+                  "'int')\n   v0 = v1 + 1;\n        ^\n",
+    "ambiguous_parameter_name": "/tmp/sketch/sketch.ino:3:22: error: redefinition of 'int x'\n"
+                                " void procedure0(int x, int x) {\n                      ^\n",
+    "none_type_error": "/tmp/sketch/sketch.ino:12:3: error: 'v9' was not declared in this scope\n"
+                       "   v9 = v9 + 1;\n   ^\n",
+}
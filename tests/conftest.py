@@ -0,0 +1,26 @@
+"""Fixtures shared by the tests."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config
+from app.handlers.utils.analysis_session import analysis_sessions
+from app.handlers.utils.hint_cache import hint_cache
+from app.main import app
+
+
+@pytest.fixture(autouse=True)
+def isolated_service(monkeypatch):
+    """Analyse in the test process and start every test with an empty hint cache and no analysis sessions."""
+    monkeypatch.setattr(config, "HINT_WORKER_PROCESSES", 0)
+    hint_cache.clear()
+    analysis_sessions.clear()
+    yield
+    hint_cache.clear()
+    analysis_sessions.clear()
+
+
+@pytest.fixture
+def client():
+    """Returns a client of the service, started like the server starts it."""
+    with TestClient(app) as test_client:
+        yield test_client
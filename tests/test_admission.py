@@ -0,0 +1,109 @@
+"""Tests of the admission budgets of hint requests."""
+import asyncio
+
+import pytest
+
+from app.handlers.utils.admission import (AdmissionBudget, AdmissionRejectedError, admission_budget_for,
+                                          cheap_requests, expensive_requests)
+from tests.workspaces import ZERO_DIVISION_ERROR, hint_request, workspace
+
+
+async def hold(budget: AdmissionBudget, release: asyncio.Event) -> None:
+    """Hold a slot of the budget until the event is set."""
+    async with budget.admit():
+        await release.wait()
+
+
+def test_admits_up_to_the_concurrency_and_queues_the_rest():
+    budget = AdmissionBudget("test", max_concurrency=1, max_queue=1, max_queue_wait=5)
+
+    async def main():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        assert budget.stats()["running"] == 1
+        assert budget.stats()["queued"] == 1
+        release.set()
+        await asyncio.gather(running, queued)
+
+    asyncio.run(main())
+    assert budget.stats()["admitted"] == 2
+    assert budget.stats()["running"] == 0
+
+
+def test_sheds_requests_when_the_queue_is_full():
+    budget = AdmissionBudget("test", max_concurrency=1, max_queue=0, max_queue_wait=5)
+
+    async def main():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError):
+            async with budget.admit():
+                pass
+        release.set()
+        await running
+
+    asyncio.run(main())
+    assert budget.stats()["shed_queue_full"] == 1
+
+
+def test_sheds_requests_that_wait_too_long():
+    budget = AdmissionBudget("test", max_concurrency=1, max_queue=1, max_queue_wait=0.01)
+
+    async def main():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError):
+            async with budget.admit():
+                pass
+        assert budget.stats()["queued"] == 0
+        release.set()
+        await running
+
+    asyncio.run(main())
+    assert budget.stats()["shed_queue_timeout"] == 1
+    assert budget.stats()["running"] == 0
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    budget = AdmissionBudget("test", max_concurrency=1, max_queue=1, max_queue_wait=5)
+
+    async def main():
+        release = asyncio.Event()
+        running = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(hold(budget, release))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await running
+
+    asyncio.run(main())
+    assert budget.stats()["queued"] == 0
+    assert budget.stats()["running"] == 0
+
+
+def test_zero_concurrency_disables_the_limit():
+    budget = AdmissionBudget("test", max_concurrency=0, max_queue=0, max_queue_wait=0)
+
+    async def main():
+        release = asyncio.Event()
+        holders = [asyncio.ensure_future(hold(budget, release)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*holders)
+
+    asyncio.run(main())
+    assert budget.stats()["shed_queue_full"] == 0
+
+
+def test_requests_are_admitted_on_the_budget_of_their_analysis():
+    assert admission_budget_for(hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1")) is cheap_requests
+    assert admission_budget_for(hint_request(workspace())) is expensive_requests
+    assert admission_budget_for(hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1"),
+                                all_findings=True) is expensive_requests
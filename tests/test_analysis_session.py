@@ -0,0 +1,130 @@
+"""Tests that analysis sessions find the same errors as a fresh analysis while a workspace is edited."""
+import random
+
+import pytest
+
+from app.handlers.error_identifier.identify_error import SILENT_ERROR_RULES
+from app.handlers.error_identifier.silent_error_engine import detect_all_silent_errors, detect_silent_error
+from app.handlers.hint_service import get_hint
+from app.handlers.utils.analysis_session import AnalysisSession, AnalysisSessionStore
+from app.handlers.utils.hint_cache import hint_cache
+from app.handlers.utils.workspace import Workspace
+from tests.workspaces import assign, compare, get, hint_request, if_block, number, print_block, procedure, stack, \
+    workspace
+
+# Stacks an edit can add, replace or remove, with and without silent errors
+STACKS = [
+    stack(assign("a", number(1)), print_block(get("a"))),
+    stack(assign("b", number(2)), if_block(compare(get("b"), number(2)), print_block(get("b")))),
+    if_block(compare(number(1), number(2)), print_block(get("a"))),
+    if_block(None, print_block(get("a"))),
+    if_block(compare(get("a"), number(1)), if_block(None, assign("a", number(2)))),
+    procedure("greet", ["name"], print_block(get("name"))),
+    print_block(get("name")),
+    procedure("count", ["n"], if_block(compare(get("n"), number(0)), print_block(get("n")))),
+    stack(assign("x", compare(number(3), number(3), "LT")), print_block(get("x"))),
+]
+
+# Edit sequences that fix and introduce each error in turn, as lists of the stacks of every submitted workspace
+EDIT_SEQUENCES = {
+    "fix_comparing_literals": [[0, 2], [0, 2], [0, 1], [0, 1, 8], [0, 1]],
+    "fix_incomplete_block": [[0, 3], [0, 3, 1], [0, 4, 1], [0, 1], [3, 0, 1]],
+    "fix_parameter_out_of_scope": [[5, 6], [5, 6, 0], [5, 0], [7, 5, 0], [7, 6, 0]],
+    "reorder_stacks": [[2, 3, 6, 5], [5, 6, 3, 2], [3, 5, 2], [3, 5, 2, 2]],
+}
+
+
+def random_edit_sequence(seed: int) -> list:
+    """Returns a sequence of workspaces where every step adds, replaces, removes or keeps a single stack."""
+    generator = random.Random(seed)
+    stacks = [generator.randrange(len(STACKS)) for _ in range(3)]
+    sequence = [list(stacks)]
+    for _ in range(10):
+        edit = generator.choice(["add", "replace", "remove", "keep"])
+        if edit == "add" or not stacks:
+            stacks.insert(generator.randint(0, len(stacks)), generator.randrange(len(STACKS)))
+        elif edit == "replace":
+            stacks[generator.randrange(len(stacks))] = generator.randrange(len(STACKS))
+        elif edit == "remove":
+            del stacks[generator.randrange(len(stacks))]
+        sequence.append(list(stacks))
+    return sequence
+
+
+SEQUENCES = list(EDIT_SEQUENCES.items()) + [(f"random_{seed}", random_edit_sequence(seed)) for seed in range(30)]
+
+
+def comparable(finding, parsed_workspace: Workspace):
+    """Returns the finding with its blocks replaced by their positions, so findings of two parses can be compared."""
+    if finding is None:
+        return None
+    elements = list(parsed_workspace.root.iter())
+    details = {name: elements.index(value) if hasattr(value, "tag") else value
+               for name, value in finding.details.items()}
+    block = elements.index(finding.block) if finding.block is not None else None
+    return finding.error_name, block, details
+
+
+def codes_of(sequence: list) -> list:
+    """Returns the code of every workspace of an edit sequence."""
+    return [workspace(*[STACKS[index] for index in stacks]) for stacks in sequence]
+
+
+@pytest.mark.parametrize("sequence", [sequence for _, sequence in SEQUENCES], ids=[name for name, _ in SEQUENCES])
+def test_session_finds_the_same_error_as_a_fresh_workspace(sequence):
+    session = AnalysisSession()
+    for code in codes_of(sequence):
+        expected = Workspace(code)
+        session_workspace = session.workspace_for(code)
+        assert (comparable(detect_silent_error(session_workspace, SILENT_ERROR_RULES, session), session_workspace)
+                == comparable(detect_silent_error(expected, SILENT_ERROR_RULES), expected))
+
+
+@pytest.mark.parametrize("sequence", [sequence for _, sequence in SEQUENCES], ids=[name for name, _ in SEQUENCES])
+def test_session_finds_the_same_errors_in_all_findings_mode(sequence):
+    session = AnalysisSession()
+    for code in codes_of(sequence):
+        expected = Workspace(code)
+        session_workspace = session.workspace_for(code)
+        found = detect_all_silent_errors(session_workspace, SILENT_ERROR_RULES, session)
+        expected_found = detect_all_silent_errors(expected, SILENT_ERROR_RULES)
+        assert ([comparable(finding, session_workspace) for finding in found]
+                == [comparable(finding, expected) for finding in expected_found])
+
+
+def test_session_reuses_verdicts_of_unchanged_stacks():
+    session = AnalysisSession()
+    for code in codes_of([[0, 1, 7], [0, 1, 7, 3]]):
+        detect_silent_error(session.workspace_for(code), SILENT_ERROR_RULES, session)
+    assert session.reused > 0
+
+
+@pytest.mark.parametrize("name", list(EDIT_SEQUENCES))
+def test_hints_of_a_session_match_hints_without_session(name):
+    for code in codes_of(EDIT_SEQUENCES[name]):
+        with_session = get_hint(hint_request(code, session_id=name))
+        hint_cache.clear()
+        assert with_session == get_hint(hint_request(code))
+        hint_cache.clear()
+
+
+def test_store_drops_the_least_recently_used_sessions_beyond_its_length():
+    store = AnalysisSessionStore(max_size=10, idle_ttl=60, max_length=100)
+    first = store.get("first", 40)
+    second = store.get("second", 40)
+    assert store.get("first", 40) is first
+    store.get("third", 30)
+    assert store.stats()["size"] == 2
+    assert store.stats()["length"] == 70
+    assert store.get("first", 40) is first
+    assert store.get("second", 40) is not second
+    assert store.stats()["evictions"] == 2
+
+
+def test_session_over_the_length_serves_its_request_only():
+    store = AnalysisSessionStore(max_size=10, idle_ttl=60, max_length=100)
+    store.get("small", 10)
+    session = store.get("large", 200)
+    assert store.get("large", 200) is not session
+    assert store.stats()["size"] == 1
+    assert store.stats()["length"] == 10
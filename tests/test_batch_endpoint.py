@@ -0,0 +1,40 @@
+"""Tests of the batch hint endpoint."""
+import logging
+
+from app import config
+from tests.workspaces import ZERO_DIVISION_ERROR, compare, hint_request, number, workspace
+
+
+def test_every_item_gets_its_own_hint(client):
+    items = [hint_request(workspace(compare(number(1), number(2)))).model_dump(),
+             hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1").model_dump(),
+             hint_request(workspace(), code_language="Scratch").model_dump()]
+    response = client.post("/get_debugging_hints", json=items)
+    assert response.status_code == 200
+    hints = response.json()["hints"]
+    assert [hint["status_code"] for hint in hints] == [200, 200, 400]
+    assert "comparing literals" in hints[0]["hint_text"]
+    assert "ZeroDivison" in hints[1]["hint_text"]
+
+
+def test_invalid_item_does_not_fail_the_batch(client):
+    valid = hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1").model_dump()
+    response = client.post("/get_debugging_hints", json=[{"code": 1}, valid, "not a request"])
+    assert response.status_code == 200
+    hints = response.json()["hints"]
+    assert [hint["status_code"] for hint in hints] == [422, 200, 422]
+    assert "code" in hints[0]["hint_text"]
+
+
+def test_invalid_workspace_is_a_client_error_without_traceback(client, caplog):
+    with caplog.at_level(logging.ERROR):
+        response = client.post("/get_debugging_hints", json=[hint_request("<xml").model_dump()])
+    assert response.json()["hints"][0]["status_code"] == 400
+    assert not caplog.records
+
+
+def test_rejects_too_large_batch(client, monkeypatch):
+    monkeypatch.setattr(config, "HINT_BATCH_MAX_SIZE", 1)
+    item = hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1").model_dump()
+    response = client.post("/get_debugging_hints", json=[item, item])
+    assert response.status_code == 413
@@ -0,0 +1,60 @@
+"""Tests of warming the hint cache from sample hint requests."""
+import json
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import config
+from app.handlers.cache_warmer import warm_hint_cache
+from app.handlers.hint_service import get_cached_hint
+from app.main import app
+from tests.workspaces import ZERO_DIVISION_ERROR, compare, hint_request, number, workspace
+
+ADMIN_TOKEN = "secret"
+
+
+@pytest.fixture
+def samples(tmp_path):
+    """Write a JSONL file with two valid samples, a duplicate and an invalid line."""
+    requests = [hint_request(workspace(compare(number(1), number(2)))),
+                hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1")]
+    lines = [request.model_dump_json() for request in requests + requests[:1]] + [json.dumps({"code": 1})]
+    path = tmp_path / "samples.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    return path, requests
+
+
+def test_warms_the_hints_of_the_samples(samples):
+    path, requests = samples
+    report = warm_hint_cache(str(path))
+    assert report["requests"] == 3
+    assert report["invalid"] == 1
+    assert report["warmed"] == 3
+    assert report["failed"] == 0
+    assert all(get_cached_hint(request) is not None for request in requests)
+
+
+def test_service_starts_when_the_samples_cannot_be_read(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(config, "HINT_CACHE_WARMUP_PATH", str(tmp_path / "missing.jsonl"))
+    with caplog.at_level(logging.ERROR), TestClient(app) as client:
+        assert client.get("/").status_code == 200
+    assert "warm the hint cache" in caplog.text
+
+
+def test_admin_endpoint_is_disabled_without_token(samples, monkeypatch):
+    monkeypatch.setattr(config, "HINT_CACHE_WARMUP_PATH", str(samples[0]))
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    with TestClient(app) as client:
+        assert client.post("/admin/warm_cache", headers={"X-Admin-Token": ""}).status_code == 404
+
+
+def test_admin_endpoint_requires_the_token(samples, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", ADMIN_TOKEN)
+    with TestClient(app) as client:
+        monkeypatch.setattr(config, "HINT_CACHE_WARMUP_PATH", str(samples[0]))
+        assert client.post("/admin/warm_cache").status_code == 403
+        assert client.post("/admin/warm_cache", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        response = client.post("/admin/warm_cache", headers={"X-Admin-Token": ADMIN_TOKEN})
+    assert response.status_code == 200
+    assert response.json()["warmed"] == 3
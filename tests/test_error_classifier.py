@@ -0,0 +1,46 @@
+"""Tests of the classification of error messages by their patterns."""
+from app.handlers.error_identifier.error_classifier import (ARDUINO_ERROR_PATTERNS, PYTHON_ERROR_PATTERNS,
+                                                            ErrorPatternRegistry)
+
+
+def registry() -> ErrorPatternRegistry:
+    """Returns a registry with a substring and a regular expression pattern for the same error."""
+    patterns = ErrorPatternRegistry()
+    patterns.register("first", "first_error")
+    patterns.register(r"sec(o|0)nd", "second_error", is_regex=True)
+    patterns.register("third", "third_error")
+    patterns.register("again", "first_error")
+    return patterns
+
+
+def test_errors_are_listed_in_priority_order_not_in_message_order():
+    patterns = registry()
+    message = "third then sec0nd then first"
+    assert patterns.classify(message) == "first_error"
+    assert patterns.classify_all(message) == ["first_error", "second_error", "third_error"]
+
+
+def test_error_found_by_several_patterns_is_listed_once_at_its_first_matching_pattern():
+    patterns = registry()
+    assert patterns.classify_all("again and first") == ["first_error"]
+    assert patterns.classify_all("third, again") == ["third_error", "first_error"]
+
+
+def test_message_without_known_error():
+    patterns = registry()
+    assert patterns.classify("nothing") is None
+    assert patterns.classify_all("nothing") == []
+
+
+def test_patterns_registered_later_are_matched():
+    patterns = registry()
+    assert patterns.classify("fourth") is None
+    patterns.register("fourth", "fourth_error")
+    assert patterns.classify_all("fourth and third") == ["third_error", "fourth_error"]
+
+
+def test_real_errors_of_both_languages_keep_their_priority():
+    python_message = "TypeError: unsupported operand\nZeroDivisionError: division by zero\n"
+    assert PYTHON_ERROR_PATTERNS.classify_all(python_message) == ["zero_division_error", "type_error"]
+    arduino_message = "error: 'x' was not declared in this scope\nwarning: division by zero\n"
+    assert ARDUINO_ERROR_PATTERNS.classify_all(arduino_message) == ["zero_division_error", "none_type_error"]
@@ -0,0 +1,21 @@
+"""Tests of the parser of error messages."""
+from app import config
+from app.handlers.utils.error_parser import parse_error
+from tests.workspaces import ZERO_DIVISION_ERROR
+
+
+def test_parses_end_of_python_traceback():
+    parsed_error = parse_error(ZERO_DIVISION_ERROR, "Python")
+    assert parsed_error.exception_type == "ZeroDivisionError"
+    assert parsed_error.statement == "print(a / b)"
+    assert parsed_error.line_number == 3
+    assert not parsed_error.truncated
+
+
+def test_truncates_runaway_output_to_configured_tail(monkeypatch):
+    error = "spam\n" * 10_000 + ZERO_DIVISION_ERROR
+    monkeypatch.setattr(config, "ERROR_TAIL_MAX_LENGTH", 200)
+    parsed_error = parse_error(error, "Python")
+    assert parsed_error.truncated
+    assert parsed_error.exception_type == "ZeroDivisionError"
+    assert not parse_error(error, "Python", max_length=len(error)).truncated
@@ -0,0 +1,64 @@
+"""Tests of the canonical form and structural fingerprint of workspaces."""
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.handlers.utils.fingerprint import canonicalize_workspace, structural_fingerprints, workspace_fingerprint
+from tests.workspaces import NS, assign, compare, get, if_block, number, print_block, stack, workspace
+
+CODE = workspace(stack(assign("a", number(1)), if_block(compare(get("a"), number(1)), print_block(get("a")))),
+                 print_block(number(2)))
+
+# Submissions that only differ from CODE in their layout in the editor
+SAME_STRUCTURE = {
+    "block_ids": CODE.replace('<block type="variables_set"', '<block id="Xq1!a" type="variables_set"')
+                     .replace('<block type="math_number"', '<block id="n#2" type="math_number"'),
+    "coordinates": CODE.replace('x="0" y="0"', 'x="412" y="-37"').replace('x="20" y="40"', 'x="3" y="9"'),
+    "attribute_order": CODE.replace('<block x="0" y="0" type="variables_set">', '<block type="variables_set" x="0" '
+                                    'y="0">').replace('<value name="IF0">', '<value  name = "IF0" >'),
+    "indentation": CODE.replace("><", ">\n    <").replace(f'<xml xmlns="{NS}">', f'<xml xmlns="{NS}">\n\t'),
+}
+
+# Submissions with another structure than CODE
+OTHER_STRUCTURE = {
+    "field": CODE.replace(">1<", ">3<", 1),
+    "block_type": CODE.replace("text_print", "text_append", 1),
+    "field_text_whitespace": CODE.replace('<field name="VAR">a</field>', '<field name="VAR"> a</field>', 1),
+    "stack_order": workspace(print_block(number(2)), stack(assign("a", number(1)), if_block(compare(
+        get("a"), number(1)), print_block(get("a"))))),
+}
+
+
+@pytest.mark.parametrize("code", list(SAME_STRUCTURE.values()), ids=list(SAME_STRUCTURE))
+def test_layout_does_not_change_the_fingerprint(code):
+    assert code != CODE
+    assert workspace_fingerprint(code) == workspace_fingerprint(CODE)
+    assert canonicalize_workspace(code) == canonicalize_workspace(CODE)
+
+
+@pytest.mark.parametrize("code", list(OTHER_STRUCTURE.values()), ids=list(OTHER_STRUCTURE))
+def test_structure_changes_the_fingerprint(code):
+    assert workspace_fingerprint(code) != workspace_fingerprint(CODE)
+    assert canonicalize_workspace(code) != canonicalize_workspace(CODE)
+
+
+def test_canonical_form_drops_the_layout():
+    canonical = canonicalize_workspace(SAME_STRUCTURE["indentation"])
+    assert "\n" not in canonical and ' x="' not in canonical and ' id="' not in canonical
+    # The canonical form is a fixed point
+    assert canonicalize_workspace(canonical) == canonical
+
+
+def test_top_level_fingerprints_only_depend_on_their_stack():
+    fingerprint, stack_fingerprints = structural_fingerprints(ET.fromstring(CODE))
+    # Only the value printed by the second stack changes
+    other_code = CODE.replace('<field name="NUM">2</field>', '<field name="NUM">5</field>')
+    other_fingerprint, other_stack_fingerprints = structural_fingerprints(ET.fromstring(other_code))
+    assert fingerprint != other_fingerprint
+    assert list(stack_fingerprints.values())[0] == list(other_stack_fingerprints.values())[0]
+    assert list(stack_fingerprints.values())[1] != list(other_stack_fingerprints.values())[1]
+
+
+def test_code_that_is_no_xml_falls_back_to_its_text():
+    assert workspace_fingerprint("<xml>").startswith("raw:")
+    assert workspace_fingerprint("<xml>") != workspace_fingerprint("<xml> ")
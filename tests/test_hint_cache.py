@@ -0,0 +1,88 @@
+"""Tests of the LRU and time to live behaviour of the hint cache."""
+import pytest
+
+from app.handlers.utils import hint_cache as hint_cache_module
+from app.handlers.utils.hint_cache import HintCache, hint_cache_key, raw_request_cache_key
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the test moves it."""
+
+    def __init__(self):
+        """Initialize the clock."""
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        """Returns the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    """Replace the monotonic clock of the hint cache."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(hint_cache_module.time, "monotonic", fake_clock)
+    return fake_clock
+
+
+def test_returns_stored_result_and_counts_hits_and_misses():
+    cache = HintCache(max_size=4, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", ("hint", 200))
+    assert cache.get("a") == ("hint", 200)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lookup_without_counting_the_miss():
+    cache = HintCache(max_size=4, ttl=60)
+    assert cache.get("a", count_miss=False) is None
+    assert cache.stats()["misses"] == 0
+
+
+def test_evicts_least_recently_used_entry():
+    cache = HintCache(max_size=2, ttl=60)
+    cache.set("a", ("a", 200))
+    cache.set("b", ("b", 200))
+    # Reading a makes b the least recently used entry
+    cache.get("a")
+    cache.set("c", ("c", 200))
+    assert cache.get("b") is None
+    assert cache.get("a") == ("a", 200)
+    assert cache.get("c") == ("c", 200)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expires_entries_after_time_to_live(clock):
+    cache = HintCache(max_size=4, ttl=10)
+    cache.set("a", ("a", 200))
+    clock.now += 9
+    assert cache.get("a") == ("a", 200)
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_size_zero_disables_cache():
+    cache = HintCache(max_size=0, ttl=60)
+    cache.set("a", ("a", 200))
+    assert cache.get("a") is None
+
+
+def test_keys_separate_request_parts_and_modes():
+    key = raw_request_cache_key(code="ab", error="c", status="0", code_language="Python")
+    assert key != raw_request_cache_key(code="a", error="bc", status="0", code_language="Python")
+    assert key != raw_request_cache_key(code="ab", error="c", status="0", code_language="Python", all_findings=True)
+    assert hint_cache_key(fingerprint="ab", error="c", status="0", code_language="Python") != key
+
+
+def test_contains_does_not_count_or_refresh(clock):
+    cache = HintCache(max_size=4, ttl=10)
+    cache.set("a", ("a", 200))
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 0
+    clock.now += 11
+    assert not cache.contains("a")
@@ -0,0 +1,67 @@
+"""Tests of the single hint request endpoints."""
+import pytest
+
+from app.handlers.utils import admission
+from tests.workspaces import ZERO_DIVISION_ERROR, assign, compare, get, hint_request, if_block, number, \
+    print_block, stack, workspace
+
+
+@pytest.fixture
+def closed_budgets(monkeypatch):
+    """Admit no request at all, every request that needs an analysis is shed."""
+    for budget in (admission.cheap_requests, admission.expensive_requests):
+        monkeypatch.setattr(budget, "max_concurrency", 1)
+        monkeypatch.setattr(budget, "max_queue", 0)
+        monkeypatch.setattr(budget, "running", 1)
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+def test_generates_hint(client, endpoint):
+    response = client.post(endpoint, json=hint_request(workspace(compare(number(1), number(1)))).model_dump())
+    assert response.status_code == 200
+    assert "comparing literals" in response.json()["hint_text"]
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+def test_cached_hint_is_served_without_admission(client, closed_budgets, endpoint, monkeypatch):
+    request = hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1").model_dump()
+    monkeypatch.setattr(admission.cheap_requests, "running", 0)
+    assert client.post(endpoint, json=request).status_code == 200
+    monkeypatch.setattr(admission.cheap_requests, "running", 1)
+    assert client.post(endpoint, json=request).status_code == 200
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+def test_cache_miss_is_shed_when_budget_is_exhausted(client, closed_budgets, endpoint):
+    response = client.post(endpoint, json=hint_request(workspace(compare(number(1), number(2)))).model_dump())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert admission.expensive_requests.stats()["shed_queue_full"] >= 1
+
+
+def test_all_findings_get_a_hint_each_in_priority_order(client):
+    code = workspace(if_block(None), compare(number(1), number(2)))
+    request = hint_request(code, error=ZERO_DIVISION_ERROR, status="1").model_dump()
+    response = client.post("/get_debugging_hint?all=true", json=request)
+    assert response.status_code == 200
+    hints = response.json()["hints"]
+    assert [hint["status_code"] for hint in hints] == [200, 200, 200]
+    # The real error comes first, the silent errors follow in the priority order of their rules
+    assert "ZeroDivison" in hints[0]["hint_text"]
+    assert "comparing literals" in hints[1]["hint_text"]
+    assert "incomplete block sequences" in hints[2]["hint_text"]
+
+
+def test_all_findings_with_the_same_hint_are_shown_once(client):
+    code = workspace(if_block(None), compare(number(1), number(2)), if_block(None), compare(number(1), number(2)))
+    hints = client.post("/get_debugging_hint?all=true", json=hint_request(code).model_dump()).json()["hints"]
+    assert len(hints) == 2
+    assert len({hint["hint_text"] for hint in hints}) == 2
+
+
+def test_all_findings_of_a_clean_workspace_are_a_single_not_found_entry(client):
+    code = workspace(stack(assign("a", number(1)), print_block(get("a"))))
+    response = client.post("/get_debugging_hint?all=true", json=hint_request(code).model_dump())
+    assert response.status_code == 404
+    assert response.json() == {"hints": [{"hint_text": "No generated hints found for this error.",
+                                          "status_code": 404}]}
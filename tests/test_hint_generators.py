@@ -0,0 +1,32 @@
+"""Tests of the hint generators of silent errors."""
+import pytest
+
+from app.handlers.error_identifier.finding import Finding
+from app.handlers.hint_generator.hint_generator_factory import hint_generator_factory
+from app.handlers.utils.workspace import Workspace
+from tests.workspaces import compare, if_block, number, workspace
+
+SILENT_ERRORS = ["comparing_literals_error", "incomplete_block_sequences_error", "parameter_out_of_scope_error"]
+
+
+@pytest.mark.parametrize("finding", [None, "without_block"], ids=["no_finding", "without_block"])
+@pytest.mark.parametrize("error_name", SILENT_ERRORS)
+def test_generators_of_silent_errors_need_the_offending_block(error_name, finding):
+    if finding is not None:
+        finding = Finding(error_name=error_name)
+    generator = hint_generator_factory(error_name=error_name, workspace=Workspace(workspace(if_block(None))), error="",
+                                       code_language="Python", finding=finding)
+    with pytest.raises(ValueError, match="offending block"):
+        generator.generate_hint()
+
+
+def test_generator_describes_the_block_of_the_finding():
+    parsed_workspace = Workspace(workspace(if_block(compare(number(1), number(2)))))
+    comparison = parsed_workspace.blocks_of_type("logic_compare")[0]
+    operands = parsed_workspace.blocks_of_type("math_number")
+    finding = Finding(error_name="comparing_literals_error", block=comparison,
+                      details={"operand_a": operands[0], "operand_b": operands[1]})
+    hint_text, status_code = hint_generator_factory(error_name=finding.error_name, workspace=parsed_workspace,
+                                                    error="", code_language="Python", finding=finding).generate_hint()
+    assert status_code == 200
+    assert "block 'if' and with comparison '1 = 2'" in hint_text
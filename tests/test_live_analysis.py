@@ -0,0 +1,67 @@
+"""Tests of the live analysis websocket."""
+import threading
+import time
+
+import pytest
+
+from app import config
+from app.handlers.utils import admission
+from app.routers import live_analysis
+from tests.workspaces import compare, hint_request, number, workspace
+
+
+@pytest.fixture(autouse=True)
+def no_debounce(monkeypatch):
+    """Analyse snapshots without a debounce delay."""
+    monkeypatch.setattr(config, "LIVE_ANALYSIS_DEBOUNCE", 0)
+
+
+def snapshot() -> dict:
+    """Returns a snapshot of a workspace with a silent error."""
+    return hint_request(workspace(compare(number(1), number(2)))).model_dump()
+
+
+def test_pushes_hints_of_a_snapshot(client):
+    with client.websocket_connect("/live_analysis") as websocket:
+        websocket.send_json(snapshot())
+        message = websocket.receive_json()
+    assert message["sequence"] == 1
+    assert message["status_code"] == 200
+    assert "comparing literals" in message["hint_text"]
+
+
+def test_snapshot_is_shed_when_budget_is_exhausted(client, monkeypatch):
+    monkeypatch.setattr(admission.expensive_requests, "max_queue", 0)
+    monkeypatch.setattr(admission.expensive_requests, "running", admission.expensive_requests.max_concurrency)
+    with client.websocket_connect("/live_analysis") as websocket:
+        websocket.send_json(snapshot())
+        message = websocket.receive_json()
+    assert message["status_code"] == 503
+    assert admission.expensive_requests.stats()["shed_queue_full"] >= 1
+
+
+def test_disconnect_cancels_and_waits_for_running_analysis(client, monkeypatch):
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def blocking_hints(hint_request, all_findings, cancellation):
+        started.set()
+        # Stand in for an analysis that only stops at its next check of the token
+        while not cancellation.cancelled:
+            threading.Event().wait(0.01)
+        stopped.set()
+        return {}
+
+    monkeypatch.setattr(live_analysis, "_live_hints", blocking_hints)
+    running = admission.expensive_requests.running
+    with client.websocket_connect("/live_analysis") as websocket:
+        websocket.send_json(snapshot())
+        assert started.wait(5)
+        assert admission.expensive_requests.running == running + 1
+        websocket.close()
+        assert stopped.wait(5)
+        # The admission slot is held until the thread of the analysis stopped
+        deadline = time.monotonic() + 5
+        while admission.expensive_requests.running != running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert admission.expensive_requests.running == running
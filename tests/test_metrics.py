@@ -0,0 +1,55 @@
+"""Tests of the stage timings of hint requests."""
+import pytest
+
+from app import config
+from app.handlers.utils import admission, metrics
+from app.handlers.utils.metrics import Histogram
+from tests.workspaces import ZERO_DIVISION_ERROR, compare, hint_request, number, workspace
+
+
+@pytest.fixture
+def stage_durations(monkeypatch) -> Histogram:
+    """Record the stage timings in a fresh histogram and return them in a Server-Timing header."""
+    histogram = Histogram(name=metrics.stage_durations.name, documentation=metrics.stage_durations.documentation,
+                          label_names=metrics.stage_durations.label_names)
+    monkeypatch.setattr(metrics, "stage_durations", histogram)
+    monkeypatch.setattr(config, "METRICS_SERVER_TIMING", True)
+    return histogram
+
+
+def total_count(histogram: Histogram) -> int:
+    """Returns the number of requests counted in the total stage."""
+    return sum(series[2] for labels, series in histogram._series.items() if labels[0] == "total")
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+def test_cache_hits_are_counted_and_timed(client, stage_durations, endpoint):
+    request = hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1").model_dump()
+    responses = [client.post(endpoint, json=request) for _ in range(3)]
+    assert [response.status_code for response in responses] == [200] * 3
+    assert total_count(stage_durations) == 3
+    # Only the first request misses the cache, the others are timed as well
+    assert all("validation;dur=" in response.headers["Server-Timing"] for response in responses)
+
+
+def test_admission_wait_is_its_own_stage(client, stage_durations):
+    request = hint_request(workspace(compare(number(1), number(2)))).model_dump()
+    response = client.post("/get_debugging_hint", json=request)
+    assert "admission;dur=" in response.headers["Server-Timing"]
+    assert admission.expensive_requests.stats()["admitted"] >= 1
+
+
+def test_stage_histograms_are_exposed_to_prometheus(client, stage_durations):
+    request = hint_request(workspace(compare(number(1), number(2)))).model_dump()
+    assert client.post("/get_debugging_hint", json=request).status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    name = "hint_request_stage_duration_seconds"
+    assert f"# TYPE {name} histogram" in lines
+    for stage in ("validation", "admission", "detection", "generation", "total"):
+        labels = f'stage="{stage}",code_language="Python",error_name="comparing_literals_error",status="200"'
+        assert f'{name}_bucket{{{labels},le="+Inf"}} 1' in lines
+        assert f"{name}_count{{{labels}}} 1" in lines
+        assert any(line.startswith(f"{name}_sum{{{labels}}} ") for line in lines)
@@ -0,0 +1,100 @@
+"""Tests of the persistent SQLite store of the hint cache."""
+import asyncio
+
+import pytest
+
+from app.handlers.utils import persistent_hint_cache
+from app.handlers.utils.hint_cache import HintCache, hint_cache
+from app.handlers.utils.persistent_hint_cache import SQLiteHintStore
+from tests.workspaces import ZERO_DIVISION_ERROR, hint_request, workspace
+
+
+class LoopRecordingStore(SQLiteHintStore):
+    """Store that records whether each of its reads ran on an event loop."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads_on_loop = []
+
+    def get(self, key: str):
+        try:
+            asyncio.get_running_loop()
+            self.reads_on_loop.append(True)
+        except RuntimeError:
+            self.reads_on_loop.append(False)
+        return super().get(key)
+
+
+@pytest.fixture
+def store_path(tmp_path) -> str:
+    """Returns the path of a new database."""
+    return str(tmp_path / "hints.sqlite3")
+
+
+def test_results_keep_their_shape(store_path):
+    store = SQLiteHintStore(store_path, max_size=10, ttl=60, version="1")
+    store.set("single", ("hint", 200))
+    store.set("all", [("first", 200), ("second", 200)])
+    assert store.get("single") == ("hint", 200)
+    assert store.get("all") == [("first", 200), ("second", 200)]
+    assert store.get("missing") is None
+    assert store.stats()["hits"] == 2
+    assert store.stats()["misses"] == 1
+
+
+def test_results_survive_a_restart_of_the_same_version_only(store_path):
+    SQLiteHintStore(store_path, max_size=10, ttl=60, version="1").set("key", ("hint", 200))
+    assert SQLiteHintStore(store_path, max_size=10, ttl=60, version="1").get("key") == ("hint", 200)
+    assert SQLiteHintStore(store_path, max_size=10, ttl=60, version="2").get("key") is None
+
+
+def test_expired_results_are_not_returned(store_path, monkeypatch):
+    store = SQLiteHintStore(store_path, max_size=10, ttl=60, version="1")
+    store.set("key", ("hint", 200))
+    now = persistent_hint_cache.time.time()
+    monkeypatch.setattr(persistent_hint_cache.time, "time", lambda: now + 61)
+    assert store.get("key") is None
+
+
+def test_eviction_keeps_the_newest_entries(store_path, monkeypatch):
+    monkeypatch.setattr(persistent_hint_cache, "EVICTION_INTERVAL", 1)
+    store = SQLiteHintStore(store_path, max_size=2, ttl=60, version="1")
+    clock = [1000.0]
+    monkeypatch.setattr(persistent_hint_cache.time, "time", lambda: clock[0])
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        store.set(key, (key, 200))
+    assert store.get("a") is None
+    assert store.get("c") == ("c", 200)
+    assert store.stats()["size"] == 2
+
+
+def test_memory_misses_are_served_from_the_store(store_path):
+    store = SQLiteHintStore(store_path, max_size=10, ttl=60, version="1")
+    HintCache(max_size=10, ttl=60, store=store).set("key", ("hint", 200))
+    # A new cache, e.g. another server process, starts with empty memory
+    cache = HintCache(max_size=10, ttl=60, store=store)
+    assert cache.get("key") == ("hint", 200)
+    assert cache.stats()["size"] == 1
+
+
+def test_broken_store_only_costs_misses(store_path):
+    store = SQLiteHintStore(store_path, max_size=10, ttl=60, version="1")
+    store._connection().execute("DROP TABLE hints")
+    store.set("key", ("hint", 200))
+    assert store.get("key") is None
+    assert store.stats()["errors"] == 2
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+@pytest.mark.parametrize("error, status", [("", "0"), (ZERO_DIVISION_ERROR, "1")], ids=["silent", "real"])
+def test_store_is_not_read_on_the_event_loop(client, store_path, monkeypatch, endpoint, error, status):
+    store = LoopRecordingStore(store_path, max_size=10, ttl=60, version="1")
+    monkeypatch.setattr(hint_cache, "store", store)
+    request = hint_request(workspace(), error=error, status=status).model_dump()
+    first = client.post(endpoint, json=request).json()
+    # A result only in the store, as written by another server process
+    hint_cache._entries.clear()
+    assert client.post(endpoint, json=request).json() == first
+    assert store.reads_on_loop and not any(store.reads_on_loop)
+    assert store.stats()["hits"] >= 1
@@ -0,0 +1,40 @@
+"""Tests of the profiling of the analysis of hint requests."""
+import pytest
+
+from app import config
+from app.handlers.utils import profiling
+from app.handlers.utils.profiling import profiled_analysis, request_profile
+from tests.workspaces import hint_request, workspace
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    """Enable profiling of every analysis into a temporary directory."""
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILING_SAMPLE_RATE", 1)
+    monkeypatch.setattr(config, "PROFILING_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(profiling, "_profile_request", profiling.ContextVar("profile_request", default=None))
+    return tmp_path
+
+
+def test_fast_sampled_analysis_is_not_written(profiles, monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_MIN_DURATION", 60)
+    with profiled_analysis(hint_request(workspace())):
+        pass
+    assert not list(profiles.glob("*.prof"))
+
+
+def test_slow_sampled_analysis_is_written(profiles, monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_MIN_DURATION", 0)
+    with profiled_analysis(hint_request(workspace())):
+        pass
+    assert len(list(profiles.glob("*.prof"))) == 1
+    assert len(list(profiles.glob("*.json"))) == 1
+
+
+def test_requested_profile_is_always_written(profiles, monkeypatch):
+    monkeypatch.setattr(config, "PROFILING_MIN_DURATION", 60)
+    profile_request = request_profile()
+    with profiled_analysis(hint_request(workspace())):
+        pass
+    assert (profiles / f"{profile_request.profile_name}.prof").exists()
@@ -0,0 +1,114 @@
+"""Tests of the coalescing of concurrent identical computations."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.handlers.utils.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_computation():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "hint"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = [executor.submit(flights.do, "key", compute) for _ in range(4)]
+        while flights.stats()["coalesced"] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        assert [result.result() for result in results] == ["hint"] * 4
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "computations": 1, "coalesced": 3}
+
+
+def test_exception_is_raised_and_next_call_computes_again():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert flights.do("key", lambda: "hint") == "hint"
+    assert flights.stats()["computations"] == 2
+
+
+def test_concurrent_coroutines_share_one_computation():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "hint"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("key", compute) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["hint"] * 3
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "computations": 1, "coalesced": 2}
+
+
+def test_cancelled_first_call_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "hint"
+
+    async def main():
+        leader = asyncio.ensure_future(flights.do_async("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do_async("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "hint"
+
+
+def test_computation_is_cancelled_once_every_call_is_cancelled():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def main():
+        calls = [asyncio.ensure_future(flights.do_async("key", compute)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [1]
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_exception_of_a_coroutine_is_shared():
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async("key", compute) for _ in range(2)), return_exceptions=True)
+
+    assert [type(result) for result in asyncio.run(main())] == [ValueError, ValueError]
@@ -0,0 +1,46 @@
+"""Tests that the streaming detector finds the same silent errors and hints as the detection on the parsed tree."""
+import json
+import pathlib
+
+import pytest
+
+from app import config
+from app.handlers.error_identifier import streaming_detector
+from app.handlers.error_identifier.identify_error import identify_silent_error_handler
+from app.handlers.error_identifier.streaming_detector import detect_silent_error_streaming
+from app.handlers.hint_pipeline import run_hint_pipeline
+from app.handlers.utils.workspace import Workspace
+
+# Hand written edge cases followed by small random workspaces, one JSON object with a name and a code per line
+CORPUS_PATH = pathlib.Path(__file__).parent / "corpus" / "streaming_equivalence.jsonl"
+CORPUS = [json.loads(line) for line in CORPUS_PATH.read_text().splitlines() if line]
+
+
+def tree_error_name(code: str):
+    """Returns the name of the silent error found on the parsed tree, None if there is none."""
+    try:
+        return identify_silent_error_handler(Workspace(code)).error_name
+    except NotImplementedError:
+        return None
+
+
+@pytest.fixture(params=[7, streaming_detector.CHUNK_SIZE], ids=["tiny_chunks", "default_chunks"])
+def chunk_size(request, monkeypatch):
+    """Feed the streaming parser in chunks that split the tags, and in the default chunks."""
+    monkeypatch.setattr(streaming_detector, "CHUNK_SIZE", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_streaming_detection_finds_the_same_error(case, chunk_size):
+    finding = detect_silent_error_streaming(case["code"])
+    assert (finding.error_name if finding else None) == tree_error_name(case["code"])
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_streamed_finding_gives_the_same_hint_without_parsing(case, monkeypatch):
+    expected = run_hint_pipeline(case["code"], "", "", "0", "Python")
+    monkeypatch.setattr(config, "STREAMING_DETECTION_MIN_LENGTH", 1)
+    workspace = Workspace(case["code"])
+    assert run_hint_pipeline(case["code"], "", "", "0", "Python", workspace=workspace) == expected
+    assert not workspace.is_parsed
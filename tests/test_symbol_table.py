@@ -0,0 +1,43 @@
+"""Tests of the type inference of variables in the symbol table of a workspace."""
+from app.handlers.utils.workspace import Workspace
+from tests.workspaces import assign, get, number, stack, workspace
+
+
+def symbol_table(*statements: str):
+    """Returns the symbol table of a workspace with a single stack of statements."""
+    return Workspace(workspace(stack(*statements))).symbol_table
+
+
+def test_type_of_the_first_assigned_value():
+    table = symbol_table(assign("a", number(1)), assign("a", get("b")))
+    assert table.resolve_type("a") == "math_number"
+    assert table.resolve_type("never_assigned") == "none_type"
+
+
+def test_chain_of_assignments_resolves_to_the_value_at_its_end():
+    table = symbol_table(assign("c", get("b")), assign("b", get("a")), assign("a", number(1)))
+    assert table.resolve_type("c") == "math_number"
+    # Every variable of the chain was resolved on the way
+    assert table._resolved_types == {"c": "math_number", "b": "math_number", "a": "math_number"}
+    assert table.resolve_type("b") == "math_number"
+
+
+def test_chain_to_an_unassigned_variable_is_none_type():
+    table = symbol_table(assign("b", get("a")))
+    assert table.resolve_type("b") == "none_type"
+
+
+def test_self_assignment_is_none_type():
+    table = symbol_table(assign("a", get("a")))
+    assert table.resolve_type("a") == "none_type"
+
+
+def test_cycle_of_two_variables_is_none_type():
+    table = symbol_table(assign("a", get("b")), assign("b", get("a")))
+    assert table.resolve_type("a") == "none_type"
+    assert table.resolve_type("b") == "none_type"
+
+
+def test_chain_into_a_cycle_is_none_type():
+    table = symbol_table(assign("c", get("a")), assign("a", get("b")), assign("b", get("a")))
+    assert table.resolve_type("c") == "none_type"
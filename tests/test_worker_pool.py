@@ -0,0 +1,82 @@
+"""Tests of the bounded queue in front of the worker processes."""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import config
+from app.handlers import hint_batch, hint_service
+from app.handlers.utils import worker_pool
+from app.handlers.utils.worker_pool import WorkerPoolBusyError, run_in_worker_pool, submit_to_worker_pool
+from tests.workspaces import ZERO_DIVISION_ERROR, assign, hint_request, number, stack, workspace
+
+
+@pytest.fixture
+def single_place(monkeypatch):
+    """Stand in threads for a single worker process without a queue in front of it."""
+    monkeypatch.setattr(config, "HINT_WORKER_PROCESSES", 1)
+    monkeypatch.setattr(config, "HINT_WORKER_QUEUE_SIZE", 0)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        monkeypatch.setattr(worker_pool, "get_process_pool", lambda: executor)
+        monkeypatch.setattr(hint_batch, "get_process_pool", lambda: executor)
+        yield
+
+
+def wait_for_free_places():
+    """Wait until the finished jobs gave up their places, which happens right after their futures are done."""
+    with worker_pool._queued_jobs_changed:
+        assert worker_pool._queued_jobs_changed.wait_for(lambda: worker_pool._queued_jobs == 0, timeout=5)
+
+
+def test_jobs_of_threads_and_of_the_event_loop_share_the_places(single_place):
+    release = threading.Event()
+    held = submit_to_worker_pool(release.wait)
+    with pytest.raises(WorkerPoolBusyError):
+        submit_to_worker_pool(lambda: None)
+    with pytest.raises(WorkerPoolBusyError):
+        asyncio.run(run_in_worker_pool(lambda: None))
+    release.set()
+    held.result()
+    wait_for_free_places()
+    assert asyncio.run(run_in_worker_pool(lambda: "done")) == "done"
+
+
+def test_waiting_submit_takes_the_place_of_a_finished_job(single_place):
+    release = threading.Event()
+    held = submit_to_worker_pool(release.wait)
+    waiting = []
+    submitter = threading.Thread(target=lambda: waiting.append(submit_to_worker_pool(lambda: "done",
+                                                                                       wait_for_place=True)))
+    submitter.start()
+    submitter.join(0.05)
+    assert not waiting
+    release.set()
+    submitter.join(5)
+    assert held.result() and waiting[0].result() == "done"
+
+
+def test_batch_jobs_stay_within_the_places(single_place, monkeypatch):
+    queued_jobs = []
+
+    def pipeline(**kwargs):
+        queued_jobs.append(worker_pool._queued_jobs)
+        return hint_service.run_fingerprinted_hint_pipeline(**kwargs)
+
+    monkeypatch.setattr(hint_batch, "run_fingerprinted_hint_pipeline", pipeline)
+    requests = [hint_request(workspace(stack(assign("a", number(index)))), error=ZERO_DIVISION_ERROR, status="1")
+                for index in range(5)]
+    results = hint_batch.generate_hints_batch(requests)
+    assert [status_code for _, status_code in results] == [200] * 5
+    assert queued_jobs == [1] * 5
+
+
+def test_real_errors_are_not_sent_to_the_worker_processes(monkeypatch):
+    async def no_worker(*args, **kwargs):
+        raise AssertionError("The request was sent to a worker.")
+
+    monkeypatch.setattr(hint_service, "run_in_worker_pool", no_worker)
+    request = hint_request(workspace(), error=ZERO_DIVISION_ERROR, status="1")
+    hint_text, status_code = asyncio.run(hint_service.get_hint_async(request))
+    assert status_code == 200
+    assert "ZeroDivison" in hint_text
@@ -0,0 +1,66 @@
+"""Tests of the limits on the size of the workspaces that are analysed."""
+import pytest
+
+from app import config
+from app.handlers.error_identifier.streaming_detector import detect_silent_error_streaming
+from app.handlers.utils.cancellation import WorkspaceTooComplexError
+from app.handlers.utils.workspace import Workspace, parse_workspace
+from tests.workspaces import NONE_TYPE_ERROR, ZERO_DIVISION_ERROR, assign, get, hint_request, number, stack, workspace
+
+
+def nested(depth: int) -> str:
+    """Returns a workspace whose elements are nested depth levels deep, counting the root element."""
+    return "<xml>" + "<a>" * (depth - 1) + "</a>" * (depth - 1) + "</xml>"
+
+
+@pytest.mark.parametrize("detect", [parse_workspace, detect_silent_error_streaming], ids=["tree", "streaming"])
+def test_depth_is_counted_from_the_elements(detect, monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_DEPTH", 5)
+    detect(nested(5))
+    with pytest.raises(WorkspaceTooComplexError, match="5 levels"):
+        detect(nested(6))
+
+
+@pytest.mark.parametrize("detect", [parse_workspace, detect_silent_error_streaming], ids=["tree", "streaming"])
+def test_markup_in_comments_and_text_does_not_count_as_nesting(detect, monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_DEPTH", 5)
+    detect("<xml><!--" + "<a>" * 20 + "--><a><![CDATA[" + "<b>" * 20 + "]]></a><a/></xml>")
+
+
+def test_workspace_over_the_limits_is_rejected_when_it_is_parsed(monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_BLOCKS", 1)
+    workspace_over_limits = Workspace(workspace(stack(assign("a", number(1)), assign("b", get("a")))))
+    # Requests that only need the fingerprint fall back to the fingerprint of the text
+    assert workspace_over_limits.fingerprint.startswith("raw:")
+    with pytest.raises(WorkspaceTooComplexError, match="blocks"):
+        workspace_over_limits.root
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+@pytest.mark.parametrize("error, hint", [(ZERO_DIVISION_ERROR, "ZeroDivison"), (NONE_TYPE_ERROR, "none type error")],
+                         ids=["zero_division", "none_type"])
+def test_real_error_on_a_large_workspace_gets_its_hint(client, monkeypatch, endpoint, error, hint):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_LENGTH", 200)
+    monkeypatch.setattr(config, "WORKSPACE_MAX_BLOCKS", 50)
+    code = workspace(stack(*[assign("a", number(index)) for index in range(100)]))
+    response = client.post(endpoint, json=hint_request(code, error=error, status="1").model_dump())
+    assert response.status_code == 200
+    assert hint in response.json()["hint_text"]
+
+
+@pytest.mark.parametrize("endpoint", ["/get_debugging_hint", "/get_debugging_hint_async"])
+def test_silent_error_analysis_of_a_large_workspace_is_rejected(client, monkeypatch, endpoint):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_BLOCKS", 50)
+    code = workspace(stack(*[assign("a", number(index)) for index in range(100)]))
+    response = client.post(endpoint, json=hint_request(code).model_dump())
+    assert response.status_code == 422
+    assert "more than 50 blocks" in response.json()["hint_text"]
+
+
+def test_too_complex_item_does_not_fail_the_batch(client, monkeypatch):
+    monkeypatch.setattr(config, "WORKSPACE_MAX_DEPTH", 20)
+    deep = workspace(stack(*[assign("a", get("a")) for _ in range(20)]))
+    items = [hint_request(deep).model_dump(), hint_request(deep, error=ZERO_DIVISION_ERROR, status="1").model_dump()]
+    hints = client.post("/get_debugging_hints", json=items).json()["hints"]
+    assert [hint["status_code"] for hint in hints] == [422, 200]
+    assert "levels deep" in hints[0]["hint_text"]
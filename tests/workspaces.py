@@ -0,0 +1,71 @@
+"""Builders of small Blockly workspaces and hint requests for the tests."""
+from app.schemas.hint_request import HintRequest
+
+NS = "http://www.w3.org/1999/xhtml"
+ZERO_DIVISION_ERROR = ('Traceback (most recent call last):\n  File "main.py", line 3, in <module>\n    print(a / b)\n'
+                       "ZeroDivisionError: division by zero\n")
+NONE_TYPE_ERROR = ('Traceback (most recent call last):\n  File "main.py", line 2, in <module>\n    a.append(1)\n'
+                   "AttributeError: 'NoneType' object has no attribute 'append'\n")
+
+
+def workspace(*stacks: str) -> str:
+    """Returns the XML of a workspace with the given stacks of blocks."""
+    positioned = "".join(stack.replace("<block ", f'<block x="{index * 20}" y="{index * 40}" ', 1)
+                         for index, stack in enumerate(stacks))
+    return f'<xml xmlns="{NS}">{positioned}</xml>'
+
+
+def stack(*statements: str) -> str:
+    """Returns the statements connected into a single stack."""
+    result = ""
+    for statement in reversed(statements):
+        result = statement[:-len("</block>")] + (f"<next>{result}</next>" if result else "") + "</block>"
+    return result
+
+
+def number(value: int) -> str:
+    """Returns a number block."""
+    return f'<block type="math_number"><field name="NUM">{value}</field></block>'
+
+
+def get(variable: str) -> str:
+    """Returns a block that reads a variable."""
+    return f'<block type="variables_get"><field name="VAR">{variable}</field></block>'
+
+
+def assign(variable: str, value: str) -> str:
+    """Returns a block that assigns a value to a variable."""
+    return f'<block type="variables_set"><field name="VAR">{variable}</field><value name="VALUE">{value}</value></block>'
+
+
+def compare(value_a: str, value_b: str, operator: str = "EQ") -> str:
+    """Returns a comparison of two values."""
+    return (f'<block type="logic_compare"><field name="OP">{operator}</field><value name="A">{value_a}</value>'
+            f'<value name="B">{value_b}</value></block>')
+
+
+def if_block(condition: str = None, body: str = None) -> str:
+    """Returns an if block, without a condition it is an incomplete block sequence."""
+    condition = f'<value name="IF0">{condition}</value>' if condition is not None else ""
+    body = f'<statement name="DO0">{body}</statement>' if body is not None else ""
+    return f'<block type="controls_if">{condition}{body}</block>'
+
+
+def print_block(value: str) -> str:
+    """Returns a block that prints a value."""
+    return f'<block type="text_print"><value name="TEXT">{value}</value></block>'
+
+
+def procedure(name: str, parameters: list, body: str = None) -> str:
+    """Returns a procedure definition with the given parameters."""
+    arguments = "".join(f'<arg name="{parameter}"></arg>' for parameter in parameters)
+    body = f'<statement name="STACK">{body}</statement>' if body is not None else ""
+    return (f'<block type="procedures_defnoreturn"><mutation>{arguments}</mutation><field name="NAME">{name}</field>'
+            f'{body}</block>')
+
+
+def hint_request(code: str, error: str = "", status: str = "0", code_language: str = "Python",
+                 session_id: str = None) -> HintRequest:
+    """Returns a hint request for a workspace."""
+    return HintRequest(code=code, output="", error=error, status=status, code_language=code_language,
+                       session_id=session_id)